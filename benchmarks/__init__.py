@@ -0,0 +1 @@
+# performance benchmarks (run with: python -m benchmarks.<name>)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+benchmark GutterBot's discord paths against an in-process fake guild
+
+    python -m benchmarks.bench_discord_publish [events] [latency_ms] [bucket_limit/bucket_seconds]
+
+seeds the guild with `events` existing scheduled events (a tenth of them fuzzy
+duplicates), then times loading them, creating and posting `events` new matches,
+and cleaning the duplicates. every fake API call waits latency_ms and, when a
+bucket is given (e.g. 5/5), the per-route rate limit. defaults: 1000 events,
+no latency, no rate limits.
+"""
+
+import asyncio
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from src.discord.bot import GutterBot
+from tests.fake_guild import FakeGuild
+from src.lastfm.models import Event
+
+GUILD_ID = 1
+CHANNEL_ID = 2
+
+
+SYLLABLES = ['ka', 'vo', 're', 'lin', 'dus', 'tor', 'mi', 'zan', 'pel', 'quo', 'ash', 'bri', 'gon', 'hux', 'yel', 'fen']
+
+
+def make_events(count: int, start: datetime, seed: int):
+    """Events with distinct made-up artist names, spaced 7 hours apart"""
+    rng = random.Random(seed)
+    events = []
+    for i in range(count):
+        name = ' '.join(''.join(rng.choice(SYLLABLES) for _ in range(3)).title() for _ in range(2))
+        events.append(Event(title=name, venue=f"Venue {i % 37}", city="Atlanta", country="US",
+                            date=(start + timedelta(hours=7 * i)).isoformat(), artists=[name]))
+    return events
+
+
+async def run(events: int, latency: float, buckets):
+    bot = GutterBot()
+    guild = FakeGuild(GUILD_ID, latency=latency, buckets=buckets)
+    guild.install(bot, [CHANNEL_ID])
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    
+    # Existing events, every tenth one duplicated a few minutes later under a near-identical name
+    for event in make_events(events, start, seed=1):
+        event_time = datetime.fromisoformat(event.date)
+        guild.add_scheduled_event(f"🎵 {event.title}", event_time, location=event.venue)
+    for scheduled_event in list(guild.scheduled_events.values())[::10]:
+        guild.add_scheduled_event(f"{scheduled_event.name}!", scheduled_event.start_time + timedelta(minutes=5),
+                                  location=scheduled_event.location)
+    
+    new_events = make_events(events, start, seed=2)
+    matches = {"bench": [(event, event.artists[0], 1.0) for event in new_events]}
+    timings = {}
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        began = time.perf_counter()
+        await bot.load_existing_events()
+        timings['load_existing_events'] = time.perf_counter() - began
+        
+        began = time.perf_counter()
+        await bot._publish_matches(guild.channel(CHANNEL_ID), matches)
+        timings['publish (create + post)'] = time.perf_counter() - began
+        
+        began = time.perf_counter()
+        deleted = await bot.clean_scheduled_events()
+        timings['clean_scheduled_events'] = time.perf_counter() - began
+    
+    await bot.close()
+    return timings, deleted, guild
+
+
+def main():
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.0
+    buckets = None
+    if len(sys.argv) > 3:
+        limit, per = sys.argv[3].split('/')
+        buckets = {route: (int(limit), float(per)) for route in
+                   ('create_scheduled_event', 'edit_scheduled_event', 'delete_scheduled_event', 'send_message')}
+    
+    with tempfile.TemporaryDirectory() as state_dir:
+        os.environ['GUTTERBOT_STATE_DIR'] = state_dir
+        os.environ['GUTTERBOT_GUILDS'] = f"{GUILD_ID}:{CHANNEL_ID}:bench"
+        timings, deleted, guild = asyncio.run(run(events, latency, buckets))
+    
+    print(f"📊 {events} existing + {events} new events, {latency * 1000:.0f}ms latency, "
+          f"buckets: {sys.argv[3] if buckets else 'none'}")
+    for name, seconds in timings.items():
+        print(f"  {name:<26} {seconds:8.2f}s")
+    created = guild.api.calls['create_scheduled_event']
+    print(f"  created {created} events ({created / timings['publish (create + post)']:.1f}/s), "
+          f"removed {deleted} duplicates")
+    print(f"  {guild.api.summary()}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
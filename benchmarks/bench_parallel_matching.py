@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+benchmark serial vs process-pool event matching on synthetic data
+
+usage: python -m benchmarks.bench_parallel_matching [users] [artists_per_user] [events] [workers]
+"""
+
+import os
+import random
+import string
+import sys
+import time
+from src.lastfm.models import Artist, Event, UserListeningData
+from src.lastfm.parallel_matcher import ParallelMatcher
+from src.lastfm.scraper import EventScraper
+
+
+def _random_name(rng: random.Random) -> str:
+    words = rng.randint(1, 3)
+    return ' '.join(
+        ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+        for _ in range(words)
+    ).title()
+
+
+def build_workload(users: int, artists_per_user: int, events: int, seed: int = 7):
+    """Build synthetic user data and events, with some real overlaps and near-misses"""
+    rng = random.Random(seed)
+    pool = [_random_name(rng) for _ in range(artists_per_user * 3)]
+    
+    user_data = {}
+    for i in range(users):
+        names = rng.sample(pool, artists_per_user)
+        user_data[f"user{i}"] = UserListeningData(
+            username=f"user{i}",
+            artists=[Artist(name=name, playcount=rng.randint(1, 500)) for name in names],
+            total_artists=len(names),
+            period='1month'
+        )
+    
+    event_list = []
+    for i in range(events):
+        artists = []
+        for _ in range(rng.randint(1, 4)):
+            name = rng.choice(pool) if rng.random() < 0.3 else _random_name(rng)
+            if rng.random() < 0.1:
+                name = name + ' band'  # near-miss that exercises is_valid_match
+            artists.append(name)
+        event_list.append(Event(
+            title=f"{artists[0]} live",
+            venue=f"Venue {rng.randint(1, 40)}",
+            city='Atlanta',
+            country='US',
+            date=f"2030-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T20:00:00",
+            artists=artists
+        ))
+    
+    return user_data, event_list
+
+
+def main():
+    args = [int(a) for a in sys.argv[1:]]
+    users, artists_per_user, events, workers = (args + [10, 50, 500, os.cpu_count() or 2][len(args):])[:4]
+    
+    user_data, event_list = build_workload(users, artists_per_user, events)
+    scraper = EventScraper('', '')
+    
+    print(f"📊 {users} users x {artists_per_user} artists vs {events} events")
+    
+    start = time.perf_counter()
+    serial = scraper.find_matching_events(user_data, event_list)
+    serial_time = time.perf_counter() - start
+    print(f"  serial:   {serial_time:.2f}s")
+    print(f"  pruning:  {scraper.match_stats_summary()}")
+    
+    start = time.perf_counter()
+    parallel = ParallelMatcher(scraper, max_workers=workers).find_matching_events(user_data, event_list, min_events=0)
+    parallel_time = time.perf_counter() - start
+    print(f"  parallel: {parallel_time:.2f}s ({workers} workers)")
+    
+    identical = serial == parallel
+    print(f"  speedup:  {serial_time / parallel_time:.2f}x")
+    print(f"  identical output: {'✓' if identical else '✗'}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    exit(main())
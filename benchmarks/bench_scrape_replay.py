@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+benchmark a full scrape_and_match run against recorded provider traffic
+
+record a fixture first with a live run:
+    GUTTERBOT_HTTP_RECORD=scrape.json.gz python main.py
+
+then replay it (optionally scaling the recorded latencies, 0 = no delay):
+    python -m benchmarks.bench_scrape_replay scrape.json.gz [speed]
+
+users come from LASTFM_USERS, as in the recorded run. State (caches, quota
+counts) goes to a throwaway directory so every replay does the same work.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from dotenv import load_dotenv
+from src.lastfm.scraper import EventScraper
+from src.utils.config import Config
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return 1
+    load_dotenv()
+    path = sys.argv[1]
+    speed = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    usernames = Config.get_users()
+    
+    with tempfile.TemporaryDirectory() as state_dir:
+        os.environ['GUTTERBOT_STATE_DIR'] = state_dir
+        scraper = EventScraper('replay', 'replay', Config.get_bandsintown_app_id() or 'replay')
+        scraper.use_http_fixture('replay', path, speed)
+        session = scraper.lastfm_client.session
+        
+        start = time.perf_counter()
+        matches = asyncio.run(scraper.scrape_and_match(usernames))
+        elapsed = time.perf_counter() - start
+    
+    total_matches = sum(len(user_matches) for user_matches in matches.values())
+    print(f"\n📊 replayed {session.served} requests ({session.missed} unrecorded) at speed {speed}")
+    print(f"  wall time:  {elapsed:.2f}s")
+    print(f"  throughput: {session.served / elapsed:.1f} requests/s")
+    print(f"  matches:    {total_matches}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
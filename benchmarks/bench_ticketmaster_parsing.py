@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+benchmark Ticketmaster payload parsing, with and without eager enrichment
+
+usage: python -m benchmarks.bench_ticketmaster_parsing [events | payload.json] [rounds]
+
+a recorded events.json response can be passed instead of an event count;
+otherwise a synthetic payload shaped like the Discovery API's is generated
+"""
+
+import json
+import random
+import sys
+import time
+from src.lastfm.ticketmaster_client import TicketmasterClient
+
+
+def build_payload(events: int, seed: int = 7) -> dict:
+    """Build a synthetic events.json response with realistic nesting and image lists"""
+    rng = random.Random(seed)
+    event_list = []
+    for i in range(events):
+        artist = f"Artist {i}"
+        event_list.append({
+            'name': f"{artist} Live",
+            'type': 'event',
+            'id': f"vv{i:08d}",
+            'url': f"https://www.ticketmaster.com/event/{i:08d}",
+            'info': "Doors at 7pm. All ages. " * rng.randint(1, 20),
+            'images': [
+                {'ratio': ratio, 'url': f"https://s1.ticketm.net/img/{i}_{ratio}_{width}.jpg",
+                 'width': width, 'height': width * 9 // 16, 'fallback': False}
+                for ratio in ('16_9', '3_2', '4_3') for width in (205, 305, 640, 1024, 2048)
+            ],
+            'dates': {'start': {'localDate': '2030-05-01', 'localTime': '20:00:00',
+                                'dateTime': '2030-05-02T00:00:00Z'},
+                      'timezone': 'America/New_York', 'status': {'code': 'onsale'}},
+            'classifications': [{'primary': True, 'segment': {'id': 'KZFzniwnSyZfZ7v7nJ', 'name': 'Music'},
+                                 'genre': {'id': 'KnvZfZ7vAeA', 'name': 'Rock'}}],
+            'priceRanges': [{'type': 'standard', 'currency': 'USD', 'min': 25.0, 'max': 75.0}],
+            '_embedded': {
+                'venues': [{'name': f"Venue {rng.randint(1, 40)}", 'id': f"KovZpZA{i % 40}",
+                            'city': {'name': 'Atlanta'}, 'state': {'name': 'Georgia', 'stateCode': 'GA'},
+                            'country': {'name': 'United States Of America', 'countryCode': 'US'},
+                            'location': {'longitude': '-84.39', 'latitude': '33.75'}}],
+                'attractions': [{'name': artist, 'id': f"K8vZ9{i:05d}",
+                                 'externalLinks': {'musicbrainz': [{'id': f"mbid-{i}"}]}}]
+            }
+        })
+    return {'_embedded': {'events': event_list}}
+
+
+def main():
+    source = sys.argv[1] if len(sys.argv) > 1 else '5000'
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    
+    if source.isdigit():
+        payload = build_payload(int(source))
+    else:
+        with open(source) as f:
+            payload = json.load(f)
+    events_data = payload.get('_embedded', {}).get('events', [])
+    client = TicketmasterClient('')
+    
+    print(f"📊 parsing {len(events_data)} events x {rounds} rounds")
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        events = client._convert_events_data(events_data)
+    lazy_time = (time.perf_counter() - start) / rounds
+    print(f"  deferred enrichment: {len(events_data) / lazy_time:,.0f} events/s")
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        events = [client.enrich_event(event) for event in client._convert_events_data(events_data)]
+    eager_time = (time.perf_counter() - start) / rounds
+    print(f"  eager enrichment:    {len(events_data) / eager_time:,.0f} events/s")
+    print(f"  speedup:             {eager_time / lazy_time:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
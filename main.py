@@ -4,6 +4,7 @@ gutterbot - proof of concept for last.fm event scraping
 """
 
 import os
+import sys
 from dotenv import load_dotenv
 from src.lastfm.scraper import EventScraper
 from src.utils.config import Config
@@ -37,8 +38,23 @@ def main():
             Config.get_bandsintown_app_id()
         )
         
+        # Dry run: report the request plan, cache coverage and wall time without calling the providers
+        if '--plan' in sys.argv:
+            estimate = scraper.plan_run(usernames)
+            if estimate:
+                print(estimate.report())
+            return 0
+        
+        # Optionally record provider traffic, or replay a recording instead of the live APIs
+        fixture_mode, fixture_path = Config.get_http_fixture()
+        if fixture_mode:
+            scraper.use_http_fixture(fixture_mode, fixture_path)
+        
         # Scrape and match (async)
-        matches = asyncio.run(scraper.scrape_and_match(usernames))
+        try:
+            matches = asyncio.run(scraper.scrape_and_match(usernames))
+        finally:
+            scraper.save_http_fixture()
         
         # Display results
         print("\n" + "="*60)
@@ -3,9 +3,10 @@
 gutterbot discord bot runner
 """
 
+import asyncio
 import os
+import sys
 from dotenv import load_dotenv
-from src.discord.bot import run_bot
 from src.utils.config import Config
 
 # Load environment variables
@@ -17,6 +18,19 @@ def main():
         # Validate configuration
         Config.validate()
         
+        # Webhook mode only posts embeds, so it skips the gateway login entirely
+        if '--webhook' in sys.argv or os.getenv('GUTTERBOT_MODE') == 'webhook':
+            webhook_url = Config.get_discord_webhook_url()
+            if not webhook_url:
+                print("❌ DISCORD_WEBHOOK_URL environment variable is required for webhook mode")
+                return 1
+            
+            from src.discord.webhook import publish_recommendations
+            print("🚀 Starting gutterbot webhook publisher...")
+            print(f"📊 Tracking users: {', '.join(Config.get_users())}")
+            asyncio.run(publish_recommendations(webhook_url))
+            return 0
+        
         # Check discord-specific config
         if not Config.get_discord_bot_token():
             print("❌ DISCORD_BOT_TOKEN environment variable is required")
@@ -33,6 +47,7 @@ def main():
         print()
         
         # Run the bot
+        from src.discord.bot import run_bot
         run_bot()
         
     except Exception as e:
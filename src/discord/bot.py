@@ -3,12 +3,21 @@ from discord.ext import commands
 import asyncio
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple, Optional
-from difflib import SequenceMatcher
 import os
+import time
 
 from ..lastfm.scraper import EventScraper
 from ..utils.config import Config
 from ..utils.date_utils import DateValidator
+from ..utils.time_index import TimeIndex
+from .ledger import EventLedger
+from .sync import ScheduledEventSync
+from .embeds import build_event_embed
+from .guilds import GuildState, current_guild, use_guild
+from ..utils.log import get_logger
+
+
+log = get_logger('bot')
 
 
 class GutterBot(commands.Bot):
@@ -33,33 +42,74 @@ class GutterBot(commands.Bot):
         )
         
         # Bot configuration
-        self.channel_id = int(os.getenv('DISCORD_CHANNEL_ID', '0'))
-        self.guild_id = int(os.getenv('DISCORD_GUILD_ID', '0'))
-        self.created_events = set()  # Track created events to prevent duplicates
-        self.existing_events = set()  # Track existing events from previous runs
         self.mode = os.getenv('GUTTERBOT_MODE', 'default')  # default | cleanup
-        self.existing_event_titles = set()  # Normalized titles from scheduled events
+        # Per-guild channel, users, ledger and duplicate tracking (see guild_state)
+        self.guild_states = [GuildState(target) for target in Config.get_guilds()]
+    
+    @property
+    def guild_state(self) -> GuildState:
+        """State of the guild the current task serves (the first guild outside a fan-out)"""
+        return current_guild() or self.guild_states[0]
+    
+    @property
+    def guild_id(self) -> int:
+        return self.guild_state.guild_id
+    
+    @property
+    def channel_id(self) -> int:
+        return self.guild_state.channel_id
+    
+    @property
+    def ledger(self) -> EventLedger:
+        return self.guild_state.ledger
+    
+    @property
+    def created_events(self) -> set:
+        return self.guild_state.created_events
+    
+    @property
+    def existing_events(self) -> set:
+        return self.guild_state.existing_events
+    
+    @property
+    def existing_event_titles(self) -> set:
+        return self.guild_state.existing_event_titles
+    
+    @property
+    def known_scheduled_events(self) -> TimeIndex:
+        return self.guild_state.known_scheduled_events
+    
+    async def for_each_guild(self, coroutine_fn, *args) -> list:
+        """Run coroutine_fn(*args) once per guild, concurrently, each with its own guild_state"""
+        async def run(state):
+            use_guild(state)
+            return await coroutine_fn(*args)
+        return await asyncio.gather(*(run(state) for state in self.guild_states))
         
     async def on_ready(self):
         """Called when bot is ready"""
-        print(f'🎵 {self.user} is online!')
-        print(f'📊 Monitoring channel: {self.channel_id}')
-        print(f'🏠 Guild: {self.guild_id}')
+        log.info('bot.ready', "🎵 {user} is online!", user=self.user)
+        for state in self.guild_states:
+            log.info('bot.guild', "🏠 Guild: {guild} (channel {channel}, {users} users)", guild=state.guild_id,
+                     channel=state.channel_id, users=len(state.users))
         
         # Load existing events to prevent duplicates
-        await self.load_existing_events()
+        await self.for_each_guild(self.load_existing_events)
         
         # Mode-based single-run behavior
         try:
             if self.mode == 'cleanup':
-                print("🧹 Running cleanup mode...")
-                deleted = await self.clean_scheduled_events()
-                print(f"🧹 Cleanup complete. Removed {deleted} duplicate scheduled event(s).")
+                log.info('cleanup.start', "🧹 Running cleanup mode...")
+                deleted = sum(await self.for_each_guild(self.clean_scheduled_events))
+                log.info('cleanup.done', "🧹 Cleanup complete. Removed {deleted} duplicate scheduled event(s).", deleted=deleted)
+            elif len(self.guild_states) > 1:
+                await self.post_guild_recommendations()
+                log.info('bot.done', "✅ Event processing complete. Bot will exit.")
             else:
                 await self.post_event_recommendations()
-                print("✅ Event processing complete. Bot will exit.")
+                log.info('bot.done', "✅ Event processing complete. Bot will exit.")
         except Exception as e:
-            print(f"❌ Error during bot run: {e}")
+            log.error('bot.failed', "❌ Error during bot run: {error}", error=e)
         finally:
             await self.close()
     
@@ -74,7 +124,7 @@ class GutterBot(commands.Bot):
         """Check if two event titles are fuzzy matches."""
         norm1 = self._normalize_title_for_artist_match(title1)
         norm2 = self._normalize_title_for_artist_match(title2)
-        return SequenceMatcher(None, norm1, norm2).ratio() >= threshold
+        return self.scraper.similarity.ratio(norm1, norm2) >= threshold
 
     def _is_time_close(self, time1: datetime, time2: datetime, delta_hours: int = 24) -> bool:
         """Check if two datetimes are within delta hours."""
@@ -98,24 +148,29 @@ class GutterBot(commands.Bot):
     
     async def post_event_recommendations(self):
         """Post event recommendations to discord channel"""
+        regions = Config.get_regions()
+        if len(regions) > 1:
+            await self.post_region_recommendations(regions)
+            return
+        
         channel = self.get_channel(self.channel_id)
         if not channel:
-            print(f"❌ Channel {self.channel_id} not found")
+            log.error('bot.no_channel', "❌ Channel {channel} not found", channel=self.channel_id)
             return
         
-        print("🎵 Fetching event recommendations...")
+        log.info('bot.fetch', "🎵 Fetching event recommendations...")
         
         # Get usernames to track
-        usernames = Config.get_users()
+        usernames = self.guild_state.users
         if not usernames:
             await channel.send("❌ No usernames configured for tracking")
             return
         
-        # Scrape and match events with batch callback, excluding artists that already have scheduled events
-        exclude_artists = list(self.existing_event_titles) if self.existing_event_titles else None
+        # Scrape and match events, publishing each batch as it is matched, excluding artists that already have scheduled events
+        exclude_artists = self._artists_to_exclude()
         matches = await self.scraper.scrape_and_match(
             usernames,
-            batch_callback=self.process_batch_results,
+            publish_callback=self.publish_batch_matches,
             exclude_artists=exclude_artists
         )
         
@@ -123,17 +178,19 @@ class GutterBot(commands.Bot):
             await channel.send("🎵 No event matches found today")
             return
         
+        await self._publish_matches(channel, matches)
+    
+    async def _publish_matches(self, channel, matches: Dict[str, List[Tuple]]):
+        """Sync the current guild's scheduled events with matches and post each user's embed"""
+        # Bring scheduled events in line with the matches (create, edit or cancel)
+        synced = await self.sync_scheduled_events(matches, self.scraper.queried_artists)
+        
         # Create embed for each user's matches and discord events
         for username, user_matches in matches.items():
             if not user_matches:
                 continue
-                
-            # Create discord scheduled events for each match
-            created_events = []
-            for event, matched_artist, similarity in user_matches:
-                discord_event = await self.create_discord_event(event, matched_artist, similarity)
-                if discord_event:
-                    created_events.append(discord_event)
+            
+            created_events = self._synced_events_for(synced, user_matches)
             
             # Create and send embed
             embed = self.create_event_embed(username, user_matches)
@@ -146,179 +203,214 @@ class GutterBot(commands.Bot):
             
             await channel.send(embed=embed)
     
-    async def process_batch_results(self, batch_events, batch_num, total_batches):
-        """Process and post results from a single batch"""
-        print(f"🔍 Processing batch {batch_num} results: {len(batch_events)} events")
-        
-        if not batch_events:
-            print(f"❌ No events in batch {batch_num}")
+    async def post_guild_recommendations(self):
+        """Discover and match once for every guild's users, then publish to all guilds concurrently"""
+        usernames = list(dict.fromkeys(user for state in self.guild_states for user in state.users))
+        if not usernames:
+            log.error('bot.no_users', "❌ No usernames configured for tracking")
             return
         
+        # Only skip an artist if no guild needs it re-queried
+        excluded = [set(self._artists_to_exclude(state) or []) for state in self.guild_states]
+        exclude_artists = list(set.intersection(*excluded))
+        
+        regions = Config.get_regions()
+        if len(regions) > 1:
+            region_matches = await self.scraper.scrape_and_match_regions(
+                usernames, regions=regions, exclude_artists=exclude_artists or None)
+            matches = {}
+            for region_result in region_matches.values():
+                for username, user_matches in region_result.items():
+                    matches.setdefault(username, []).extend(user_matches)
+        else:
+            matches = await self.scraper.scrape_and_match(usernames, exclude_artists=exclude_artists or None)
+        
+        await self.for_each_guild(self._publish_guild_matches, matches or {})
+    
+    async def _publish_guild_matches(self, matches: Dict[str, List[Tuple]]):
+        """Publish the shared matches for the current guild's own users"""
         channel = self.get_channel(self.channel_id)
         if not channel:
-            print(f"❌ Channel {self.channel_id} not found")
+            log.error('bot.no_channel', "❌ Channel {channel} not found for guild {guild}", channel=self.channel_id, guild=self.guild_id)
+            return
+        
+        guild_matches = {username: matches.get(username, []) for username in self.guild_state.users}
+        if not any(guild_matches.values()):
+            await channel.send("🎵 No event matches found today")
+            return
+        await self._publish_matches(channel, guild_matches)
+    
+    async def post_region_recommendations(self, regions):
+        """Post recommendations for several regions, each to its own channel, from a single discovery run"""
+        usernames = self.guild_state.users
+        if not usernames:
+            log.error('bot.no_users', "❌ No usernames configured for tracking")
+            return
+        
+        exclude_artists = self._artists_to_exclude()
+        region_matches = await self.scraper.scrape_and_match_regions(
+            usernames,
+            regions=regions,
+            exclude_artists=exclude_artists
+        )
+        
+        all_matches = {}
+        for matches in region_matches.values():
+            for username, user_matches in matches.items():
+                all_matches.setdefault(username, []).extend(user_matches)
+        synced = await self.sync_scheduled_events(all_matches, self.scraper.queried_artists)
+        
+        for region in regions:
+            channel = self.get_channel(region.channel_id or self.channel_id)
+            if not channel:
+                log.error('bot.no_channel', "❌ Channel for {region} not found", region=region.name)
+                continue
+            
+            matches = region_matches.get(region.name)
+            if not matches or not any(matches.values()):
+                await channel.send(f"🎵 No event matches found today in {region.name}")
+                continue
+            
+            for username, user_matches in matches.items():
+                if not user_matches:
+                    continue
+                
+                created_events = self._synced_events_for(synced, user_matches)
+                
+                embed = self.create_event_embed(username, user_matches)
+                embed.title = f"🎵 {region.name} Event Recommendations for {username}"
+                if created_events:
+                    embed.add_field(
+                        name="📅 Discord Events Created",
+                        value=f"Created {len(created_events)} scheduled events! Check the Events tab in your server.",
+                        inline=False
+                    )
+                
+                await channel.send(embed=embed)
+    
+    async def process_batch_results(self, batch_events, batch_num, total_batches):
+        """Process and post results from a single batch"""
+        log.info('batch.results', "🔍 Processing batch {batch} results: {events} events", batch=batch_num, events=len(batch_events))
+        
+        if not batch_events:
+            log.info('batch.no_events', "❌ No events in batch {batch}", batch=batch_num)
             return
         
         # Get usernames to track
-        usernames = Config.get_users()
+        usernames = self.guild_state.users
         if not usernames:
-            print("❌ No usernames configured")
+            log.error('bot.no_users', "❌ No usernames configured")
             return
         
         # Get user listening data for matching
         user_data = self.scraper.get_user_artists(usernames)
         if not user_data:
-            print("❌ No user data available")
+            log.error('bot.no_user_data', "❌ No user data available")
             return
+        self.scraper.expand_similar_artists(user_data)
         
         # Match events with user data
-        matches = self.scraper.match_events_with_users(batch_events, user_data)
-        print(f"🎯 Found matches: {matches}")
+        _, upcoming = self.scraper.upcoming_events(batch_events)
+        matches = self.scraper.find_matching_events(user_data, upcoming)
+        log.info('batch.matches', "🎯 Found {matches} matches for {users} user(s)", batch=batch_num,
+                 matches=sum(len(user_matches) for user_matches in matches.values()), users=len(matches))
         
         if not matches:
-            print(f"❌ No matches found in batch {batch_num}")
+            log.info('batch.no_matches', "❌ No matches found in batch {batch}", batch=batch_num)
+            return
+        
+        await self.publish_batch_matches(matches, batch_num, total_batches)
+    
+    async def publish_batch_matches(self, matches: Dict[str, List[Tuple]], batch_num: int, total_batches: int):
+        """Post embeds for one batch's matches as soon as they are found.
+        
+        Scheduled events are left to the sync after the run, which can tell a new
+        show from a rescheduled or cancelled one; so no discord events are created here.
+        """
+        channel = self.get_channel(self.channel_id)
+        if not channel:
+            log.error('bot.no_channel', "❌ Channel {channel} not found", channel=self.channel_id)
             return
         
-        # Process each user's matches
         for username, user_matches in matches.items():
             if not user_matches:
                 continue
             
-            print(f"🎵 Processing {len(user_matches)} matches for {username}")
-            
-            # Create discord scheduled events for each match
-            created_events = []
-            for event, matched_artist, similarity in user_matches:
-                print(f"🎫 Creating discord event for: {event.title} (matched: {matched_artist})")
-                discord_event = await self.create_discord_event(event, matched_artist, similarity)
-                if discord_event:
-                    created_events.append(discord_event)
-                    print(f"✅ Successfully created discord event: {discord_event.name}")
-                else:
-                    print(f"❌ Failed to create discord event for: {event.title}")
-            
-            # Create and send embed
+            log.info('publish.user', "🎵 Posting {matches} matches for {username}", matches=len(user_matches), username=username)
             embed = self.create_event_embed(username, user_matches)
             embed.title = f"🎵 New Events Found (Batch {batch_num}/{total_batches})"
-            if created_events:
-                embed.add_field(
-                    name="📅 Discord Events Created",
-                    value=f"Created {len(created_events)} scheduled events! Check the Events tab in your server.",
-                    inline=False
-                )
-            
             await channel.send(embed=embed)
-            print(f"📤 Sent embed to discord channel")
+            log.info('publish.embed', "📤 Sent embed to discord channel", username=username)
     
     def create_event_embed(self, username: str, matches: List[Tuple]) -> discord.Embed:
         """Create a discord embed for event matches"""
-        embed = discord.Embed(
-            title=f"🎵 Event Recommendations for {username}",
-            description=f"Found {len(matches)} events you might be interested in:",
-            color=0x1db954,  # Spotify green
-            timestamp=datetime.utcnow()
-        )
-        
-        embed.set_footer(text="gutterbot • powered by last.fm & ticketmaster")
-        
-        for i, (event, matched_artist, similarity) in enumerate(matches[:5], 1):  # Limit to 5 events
-            # Format date using proper validation
-            event_date = DateValidator.format_discord_date(event.date)
-            
-            # Create field value
-            field_value = f"**Venue:** {event.venue}\n"
-            field_value += f"**Date:** {event_date}\n"
-            field_value += f"**Matched Artist:** {matched_artist} ({similarity:.0%} match)\n"
-            
-            if event.artists:
-                artists_str = ", ".join(event.artists[:3])  # Limit to 3 artists
-                if len(event.artists) > 3:
-                    artists_str += f" +{len(event.artists) - 3} more"
-                field_value += f"**Artists:** {artists_str}\n"
-            
-            if event.url:
-                field_value += f"**Tickets:** [Get Tickets]({event.url})"
-            
-            embed.add_field(
-                name=f"{i}. {event.title}",
-                value=field_value,
-                inline=False
-            )
-        
-        return embed
+        return discord.Embed.from_dict(build_event_embed(username, matches))
     
     async def load_existing_events(self):
-        """Load existing scheduled events to prevent duplicates from previous runs"""
+        """Load existing scheduled events to prevent duplicates from previous runs.
+        
+        Uses the local ledger when it was reconciled recently; otherwise fetches the
+        guild's scheduled events and reconciles the ledger against them.
+        """
+        if not self.ledger.needs_reconcile():
+            # Ours and the ones created elsewhere, as of the last reconcile
+            for entry in list(self.ledger.entries.values()) + list(self.ledger.external.values()):
+                start_time = datetime.fromisoformat(entry['start_time'])
+                self._track_existing_event(entry['name'], start_time, entry['location'])
+            log.info('ledger.loaded', "📒 Loaded {events} existing events from local ledger ({external} created elsewhere)",
+                     events=len(self.ledger), external=len(self.ledger.external))
+            return
+        
         try:
             guild = self.get_guild(self.guild_id)
             if not guild:
-                print(f"❌ Could not find guild {self.guild_id}")
+                log.error('bot.no_guild', "❌ Could not find guild {guild}", guild=self.guild_id)
                 return
             
             # Fetch all scheduled events
             scheduled_events = await guild.fetch_scheduled_events()
-            print(f"📋 Found {len(scheduled_events)} existing scheduled events")
+            log.info('guild.events', "📋 Found {events} existing scheduled events", events=len(scheduled_events))
             
             # Add them to our tracking set
             for scheduled_event in scheduled_events:
-                # Extract event info from the scheduled event
-                # We'll use name, start_time, and location as the key
                 # discord.py exposes location directly for external events
                 location = getattr(scheduled_event, 'location', None) or 'Unknown'
-                event_key = self._build_existing_event_key(scheduled_event.name, scheduled_event.start_time, location)
-                self.existing_events.add(event_key)
-                print(f"📝 Loaded existing event: {scheduled_event.name}")
-                # Track normalized title for artist exclusion during scraping
-                self.existing_event_titles.add(self._normalize_title_for_artist_match(scheduled_event.name))
+                self._track_existing_event(scheduled_event.name, scheduled_event.start_time, location)
+                log.debug('guild.event', "📝 Loaded existing event: {name}", name=scheduled_event.name)
+            
+            untracked = self.ledger.reconcile(scheduled_events)
+            self.ledger.save()
+            log.info('ledger.reconciled', "📒 Reconciled ledger: {tracked} tracked, {untracked} created elsewhere",
+                     tracked=len(self.ledger), untracked=len(untracked))
                 
         except Exception as e:
-            print(f"❌ Error loading existing events: {e}")
+            log.error('guild.load_failed', "❌ Error loading existing events: {error}", error=e)
+    
+    def _track_existing_event(self, name: str, start_time: datetime, location: str):
+        """Remember a scheduled event for duplicate checks"""
+        # We use name, start_time, and location as the key
+        self.existing_events.add(self._build_existing_event_key(name, start_time, location))
+        self.known_scheduled_events.add(start_time, name)
+        # Track normalized title for artist exclusion during scraping
+        self.existing_event_titles.add(self._normalize_title_for_artist_match(name))
     
     async def create_discord_event(self, event, matched_artist: str, similarity: float) -> Optional[discord.ScheduledEvent]:
         """Create a discord scheduled event for a music event"""
         try:
-            # Check for duplicate events (same title + date + venue)
-            event_key = f"{event.title}|{event.date}|{event.venue}"
+            # Check for duplicate events (same venue + date + headliner)
+            event_key = self.scraper.deduplicator.ledger_key(event)
             if event_key in self.created_events:
-                print(f"⏭️  Skipping duplicate event (this run): {event.title}")
+                log.info('publish.duplicate', "⏭️  Skipping duplicate event (this run): {title}", sampled=True, title=event.title, reason='run')
                 return None
-
-            # Pre-creation fuzzy validation against existing Discord events
-            guild = self.get_guild(self.guild_id)
-            if guild:
-                scheduled_events = await guild.fetch_scheduled_events()
-                event_date = DateValidator.parse_event_date(event.date)
-                if event_date and event_date.tzinfo is None:
-                    from datetime import timezone
-                    event_date = event_date.replace(tzinfo=timezone.utc)
-
-                proposed_name = self._normalize_event_name(event.title)
-                for scheduled_event in scheduled_events:
-                    if (self._fuzzy_match_titles(proposed_name, scheduled_event.name) and
-                        self._is_time_close(event_date, scheduled_event.start_time)):
-                        print(f"⏭️  Skipping fuzzy duplicate: {event.title} matches existing {scheduled_event.name}")
-                        return None
-
-            # Check against existing events from previous runs
-            # We need to format the key to match how we store existing events
-            event_date = DateValidator.parse_event_date(event.date)
-            if event_date and event_date.tzinfo is None:
-                from datetime import timezone
-                event_date = event_date.replace(tzinfo=timezone.utc)
             
-            if event_date:
-                normalized_name = self._normalize_event_name(event.title)
-                existing_key = self._build_existing_event_key(normalized_name, event_date, event.venue)
-                if existing_key in self.existing_events:
-                    print(f"⏭️  Skipping duplicate event (previous run): {event.title}")
-                    return None
+            if event_key in self.ledger:
+                log.info('publish.duplicate', "⏭️  Skipping duplicate event (ledger): {title}", sampled=True, title=event.title, reason='ledger')
+                return None
             
-            # Mark as created
-            self.created_events.add(event_key)
             # Parse the event date
             event_date = DateValidator.parse_event_date(event.date)
             if not event_date:
-                print(f"❌ Could not parse date for event: {event.title}")
+                log.warning('publish.bad_date', "❌ Could not parse date for event: {title}", title=event.title, date=event.date)
                 return None
             
             # Ensure timezone-aware
@@ -326,31 +418,37 @@ class GutterBot(commands.Bot):
                 from datetime import timezone
                 event_date = event_date.replace(tzinfo=timezone.utc)
             
+            # Pre-creation fuzzy validation against known scheduled events
+            proposed_name = self._normalize_event_name(event.title)
+            for name in self.known_scheduled_events.near(event_date, timedelta(hours=24)):
+                if self._fuzzy_match_titles(proposed_name, name):
+                    log.info('publish.duplicate', "⏭️  Skipping fuzzy duplicate: {title} matches existing {existing}", sampled=True,
+                             title=event.title, existing=name, reason='fuzzy')
+                    return None
+            
+            # Check against existing events from previous runs
+            # We need to format the key to match how we store existing events
+            existing_key = self._build_existing_event_key(proposed_name, event_date, event.venue)
+            if existing_key in self.existing_events:
+                log.info('publish.duplicate', "⏭️  Skipping duplicate event (previous run): {title}", sampled=True,
+                         title=event.title, reason='previous_run')
+                return None
+            
+            # Mark as created
+            self.created_events.add(event_key)
+            
             # Calculate end time (assume 3 hours duration for concerts)
             end_time = event_date + timedelta(hours=3)
             
             # Create event name (limit to 100 chars)
             event_name = self._normalize_event_name(event.title)
             
-            # Create description (limit to 1000 chars)
-            description = f"**Artist:** {matched_artist}\n"
-            description += f"**Venue:** {event.venue}\n"
-            if event.artists:
-                artists_str = ", ".join(event.artists[:5])  # Limit to 5 artists
-                if len(event.artists) > 5:
-                    artists_str += f" +{len(event.artists) - 5} more"
-                description += f"**Artists:** {artists_str}\n"
-            if event.url:
-                description += f"**Tickets:** {event.url}\n"
-            description += f"\n*Found by gutterbot based on your last.fm listening history*"
-            
-            if len(description) > 1000:
-                description = description[:997] + "..."
+            description = self._build_event_description(event, matched_artist)
             
             # Get the guild from the channel
             guild = self.get_guild(self.guild_id)
             if not guild:
-                print(f"❌ Could not find guild {self.guild_id}")
+                log.error('bot.no_guild', "❌ Could not find guild {guild}", guild=self.guild_id)
                 return None
             
             # Create the scheduled event
@@ -364,16 +462,133 @@ class GutterBot(commands.Bot):
                 privacy_level=discord.PrivacyLevel.guild_only
             )
             
-            print(f"✅ Created discord event: {event_name}")
-            # Track the newly created event in existing_events to avoid duplicates later in the same run
-            created_key = self._build_existing_event_key(event_name, event_date, event.venue)
-            self.existing_events.add(created_key)
+            log.info('publish.scheduled', "✅ Created discord event: {name}", sampled=True, name=event_name)
+            # Track the newly created event to avoid duplicates later in the same run
+            self._track_existing_event(event_name, event_date, event.venue)
+            self.ledger.record(event_key, scheduled_event.id, event_name, event_date, event.venue,
+                               source=event.source, artist=matched_artist, url=event.url)
+            self.ledger.save()
             return scheduled_event
             
         except Exception as e:
-            print(f"❌ Failed to create discord event for {event.title}: {e}")
+            log.warning('publish.failed', "❌ Failed to create discord event for {title}: {error}", title=event.title, error=e)
             return None
     
+    def _build_event_description(self, event, matched_artist: str) -> str:
+        """Build a scheduled event description (limited to 1000 chars)"""
+        description = f"**Artist:** {matched_artist}\n"
+        description += f"**Venue:** {event.venue}\n"
+        if event.artists:
+            artists_str = ", ".join(event.artists[:5])  # Limit to 5 artists
+            if len(event.artists) > 5:
+                artists_str += f" +{len(event.artists) - 5} more"
+            description += f"**Artists:** {artists_str}\n"
+        if event.url:
+            description += f"**Tickets:** {event.url}\n"
+        description += f"\n*Found by gutterbot based on your last.fm listening history*"
+        
+        if len(description) > 1000:
+            description = description[:997] + "..."
+        return description
+    
+    def _artists_to_exclude(self, state: GuildState = None) -> Optional[List[str]]:
+        """Artists with scheduled events we don't track; ledger-tracked artists are re-queried so changes sync"""
+        state = state or self.guild_state
+        tracked_titles = {self._normalize_title_for_artist_match(entry['name']) for entry in state.ledger.entries.values()}
+        exclude = state.existing_event_titles - tracked_titles
+        return list(exclude) if exclude else None
+    
+    def _synced_events_for(self, synced: Dict[str, discord.ScheduledEvent], user_matches: List[Tuple]) -> List[discord.ScheduledEvent]:
+        """Scheduled events created or edited this sync for one user's matches"""
+        events = []
+        for event, _, _ in user_matches:
+            scheduled_event = synced.get(self.scraper.deduplicator.ledger_key(event))
+            if scheduled_event and scheduled_event not in events:
+                events.append(scheduled_event)
+        return events
+    
+    async def _get_scheduled_event(self, guild, discord_id: str) -> Optional[discord.ScheduledEvent]:
+        """Get a scheduled event from the gateway cache, falling back to the API"""
+        scheduled_event = guild.get_scheduled_event(int(discord_id))
+        if scheduled_event is None:
+            try:
+                scheduled_event = await guild.fetch_scheduled_event(int(discord_id))
+            except discord.NotFound:
+                return None
+        return scheduled_event
+    
+    async def sync_scheduled_events(self, matches: Dict[str, List[Tuple]], queried_artists=None) -> Dict[str, discord.ScheduledEvent]:
+        """Diff matches against our scheduled events and apply only the needed creates, edits and cancels.
+        
+        Returns a dict of ledger key -> scheduled event for everything created or edited.
+        """
+        started = time.time()
+        plan = ScheduledEventSync(self.ledger, self.scraper.deduplicator).plan(matches, queried_artists)
+        log.info('sync.plan', "🔄 Scheduled event sync: {summary}", summary=plan.summary(), creates=len(plan.creates),
+                 updates=len(plan.updates), cancels=len(plan.cancels), unchanged=len(plan.unchanged))
+        
+        synced = {}
+        guild = self.get_guild(self.guild_id)
+        if not guild:
+            log.error('bot.no_guild', "❌ Could not find guild {guild}", guild=self.guild_id)
+            return synced
+        
+        for key, event, matched_artist, similarity in plan.creates:
+            scheduled_event = await self.create_discord_event(event, matched_artist, similarity)
+            if scheduled_event:
+                synced[key] = scheduled_event
+        
+        for old_key, new_key, event, matched_artist, changes in plan.updates:
+            entry = self.ledger.get(old_key)
+            try:
+                scheduled_event = await self._get_scheduled_event(guild, entry['discord_id'])
+                if scheduled_event is None:
+                    # Deleted on the Discord side; forget it and create it fresh
+                    self.ledger.remove(entry['discord_id'])
+                    scheduled_event = await self.create_discord_event(event, matched_artist, 1.0)
+                    if scheduled_event:
+                        synced[new_key] = scheduled_event
+                    continue
+                
+                edit_kwargs = {'description': self._build_event_description(event, matched_artist)}
+                if 'start_time' in changes:
+                    edit_kwargs['start_time'] = changes['start_time']
+                    edit_kwargs['end_time'] = changes['start_time'] + timedelta(hours=3)
+                if 'location' in changes:
+                    edit_kwargs['location'] = changes['location']
+                    edit_kwargs['name'] = self._normalize_event_name(event.title)
+                if changes:
+                    scheduled_event = await scheduled_event.edit(**edit_kwargs) or scheduled_event
+                
+                self.ledger.remove(entry['discord_id'])
+                start_time = changes.get('start_time') or datetime.fromisoformat(entry['start_time'])
+                self.ledger.record(new_key, scheduled_event.id, edit_kwargs.get('name', entry['name']), start_time,
+                                   changes.get('location', entry['location']), source=event.source,
+                                   artist=matched_artist, url=event.url or entry.get('url'))
+                self.created_events.add(new_key)
+                synced[new_key] = scheduled_event
+                log.info('sync.updated', "✏️  Updated discord event: {name} ({changes})", sampled=True, name=entry['name'],
+                         changes=', '.join(changes) or 'rekeyed')
+            except Exception as e:
+                log.warning('sync.update_failed', "❌ Failed to update discord event {name}: {error}", name=entry['name'], error=e)
+        
+        for key in plan.cancels:
+            entry = self.ledger.get(key)
+            try:
+                scheduled_event = await self._get_scheduled_event(guild, entry['discord_id'])
+                if scheduled_event is not None:
+                    await scheduled_event.cancel()
+                self.ledger.remove(entry['discord_id'])
+                log.info('sync.cancelled', "🚫 Cancelled discord event: {name}", sampled=True, name=entry['name'])
+            except Exception as e:
+                log.warning('sync.cancel_failed', "❌ Failed to cancel discord event {name}: {error}", name=entry['name'], error=e)
+        
+        changed = self.ledger.changed_since(started)
+        if changed:
+            log.info('ledger.changed', "📒 Ledger: {changed} entries created or edited this sync", changed=len(changed))
+        self.ledger.save()
+        return synced
+    
     @commands.command(name='events')
     async def manual_events(self, ctx):
         """Manual command to fetch and post events"""
@@ -401,11 +616,11 @@ class GutterBot(commands.Bot):
         """Remove duplicate scheduled events, keeping the oldest per unique key. Returns count deleted."""
         guild = self.get_guild(self.guild_id)
         if not guild:
-            print(f"❌ Could not find guild {self.guild_id}")
+            log.error('bot.no_guild', "❌ Could not find guild {guild}", guild=self.guild_id)
             return 0
         try:
             scheduled_events = await guild.fetch_scheduled_events()
-            print(f"🧹 scanning {len(scheduled_events)} scheduled events for duplicates...")
+            log.info('cleanup.scan', "🧹 scanning {events} scheduled events for duplicates...", events=len(scheduled_events))
             
             # Fuzzy grouping
             fuzzy_groups = {}
@@ -415,18 +630,21 @@ class GutterBot(commands.Bot):
                 fuzzy_key = f"{self._normalize_title_for_artist_match(ev.name)}|{ev.start_time.isoformat()}|{location}"
                 fuzzy_groups.setdefault(fuzzy_key, []).append(ev)
             
-            # Also check cross-group fuzzy matches
+            # Also check cross-group fuzzy matches; only events within 24h of each other can match
+            by_start = TimeIndex()
+            for j, ev in enumerate(scheduled_events):
+                by_start.add(ev.start_time, (j, ev))
+            
             to_delete = []
             processed = set()
             for i, ev1 in enumerate(scheduled_events):
                 if ev1.id in processed:
                     continue
                 group = []
-                for j, ev2 in enumerate(scheduled_events):
+                for j, ev2 in sorted(by_start.near(ev1.start_time, timedelta(hours=24)), key=lambda item: item[0]):
                     if i == j or ev2.id in processed:
                         continue
-                    if (self._fuzzy_match_titles(ev1.name, ev2.name) and
-                        self._is_time_close(ev1.start_time, ev2.start_time)):
+                    if self._fuzzy_match_titles(ev1.name, ev2.name):
                         group.append(ev2)
                         processed.add(ev2.id)
                 if group:
@@ -451,19 +669,21 @@ class GutterBot(commands.Bot):
                     to_delete.extend(evs_sorted[1:])
             
             if not to_delete:
-                print("✅ no duplicates found")
+                log.info('cleanup.clean', "✅ no duplicates found")
                 return 0
             deleted = 0
             for ev in to_delete:
                 try:
                     await ev.delete()
+                    self.ledger.remove(ev.id)
                     deleted += 1
                 except Exception as e:
-                    print(f"❌ failed to delete duplicate event {ev.name}: {e}")
-            print(f"🧹 removed {deleted} duplicate scheduled event(s)")
+                    log.warning('cleanup.delete_failed', "❌ failed to delete duplicate event {name}: {error}", name=ev.name, error=e)
+            self.ledger.save()
+            log.info('cleanup.removed', "🧹 removed {deleted} duplicate scheduled event(s)", deleted=deleted)
             return deleted
         except Exception as e:
-            print(f"❌ error during cleanup: {e}")
+            log.error('cleanup.failed', "❌ error during cleanup: {error}", error=e)
             return 0
     
     @commands.command(name='help')
@@ -497,13 +717,13 @@ def run_bot():
     # Get discord token
     token = os.getenv('DISCORD_BOT_TOKEN')
     if not token:
-        print("❌ DISCORD_BOT_TOKEN environment variable is required")
+        log.error('bot.no_token', "❌ DISCORD_BOT_TOKEN environment variable is required")
         return
     
     try:
         bot.run(token)
     except Exception as e:
-        print(f"❌ Error running bot: {e}")
+        log.error('bot.failed', "❌ Error running bot: {error}", error=e)
 
 
 if __name__ == "__main__":
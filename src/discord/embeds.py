@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+from ..utils.date_utils import DateValidator
+
+
+EMBED_COLOR = 0x1db954  # Spotify green
+EMBED_FOOTER = "gutterbot • powered by last.fm & ticketmaster"
+MAX_EVENTS_PER_EMBED = 5
+
+
+def build_event_embed(username: str, matches: List[Tuple], title: str = None) -> Dict[str, Any]:
+    """Build a recommendations embed as a Discord API dict (used by the bot and the webhook publisher)"""
+    embed = {
+        'title': title or f"🎵 Event Recommendations for {username}",
+        'description': f"Found {len(matches)} events you might be interested in:",
+        'color': EMBED_COLOR,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'footer': {'text': EMBED_FOOTER},
+        'fields': []
+    }
+    
+    for i, (event, matched_artist, similarity) in enumerate(matches[:MAX_EVENTS_PER_EMBED], 1):
+        # Format date using proper validation
+        event_date = DateValidator.format_discord_date(event.date)
+        
+        # Create field value
+        field_value = f"**Venue:** {event.venue}\n"
+        field_value += f"**Date:** {event_date}\n"
+        field_value += f"**Matched Artist:** {matched_artist} ({similarity:.0%} match)\n"
+        
+        if event.artists:
+            artists_str = ", ".join(event.artists[:3])  # Limit to 3 artists
+            if len(event.artists) > 3:
+                artists_str += f" +{len(event.artists) - 3} more"
+            field_value += f"**Artists:** {artists_str}\n"
+        
+        if event.url:
+            field_value += f"**Tickets:** [Get Tickets]({event.url})"
+        
+        embed['fields'].append({
+            'name': f"{i}. {event.title}",
+            'value': field_value,
+            'inline': False
+        })
+    
+    return embed
+
+
+def embed_length(embed: Dict[str, Any]) -> int:
+    """Characters an embed counts against Discord's 6000-per-message limit"""
+    length = len(embed.get('title', '')) + len(embed.get('description', ''))
+    length += len(embed.get('footer', {}).get('text', ''))
+    for field in embed.get('fields', []):
+        length += len(field['name']) + len(field['value'])
+    return length
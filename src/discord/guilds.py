@@ -0,0 +1,34 @@
+from contextvars import ContextVar
+from typing import Optional
+from ..lastfm.models import GuildTarget
+from ..utils.time_index import TimeIndex
+from .ledger import EventLedger
+
+
+class GuildState:
+    """Per-guild runtime state: where to post, whose matches, and what we already scheduled there"""
+    
+    def __init__(self, target: GuildTarget, ledger: EventLedger = None):
+        self.target = target
+        self.guild_id = target.guild_id
+        self.channel_id = target.channel_id or 0
+        self.users = target.users
+        self.ledger = ledger or EventLedger(target.guild_id)  # Events we created, keyed by ledger key
+        self.created_events = set()  # Track created events to prevent duplicates
+        self.existing_events = set()  # Track existing events from previous runs
+        self.existing_event_titles = set()  # Normalized titles from scheduled events
+        self.known_scheduled_events = TimeIndex()  # names by start time, for fuzzy checks
+
+
+# The guild the running task is serving. Each task of a fan-out (asyncio.gather)
+# gets its own copy of the context, so guilds can be published to concurrently.
+_current_guild: ContextVar[Optional[GuildState]] = ContextVar('gutterbot_current_guild', default=None)
+
+
+def current_guild() -> Optional[GuildState]:
+    return _current_guild.get()
+
+
+def use_guild(state: GuildState):
+    """Serve state for the rest of the current task"""
+    _current_guild.set(state)
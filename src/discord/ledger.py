@@ -0,0 +1,121 @@
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+from ..utils.config import Config
+from ..utils.state import state_path, load_json, save_json
+from ..utils.time_index import TimeIndex
+
+
+class EventLedger:
+    """Persistent record of the Discord scheduled events gutterbot has created.
+    
+    Maps our event key (EventDeduplicator.ledger_key) to the Discord
+    scheduled-event ID along with creation time and source, so startup dedup
+    is a local lookup. The ledger is
+    reconciled against the guild only every LEDGER_RECONCILE_HOURS. Keys are also
+    indexed by start time and by when they were last recorded, so upcoming-event
+    and changed-since queries are range scans. Scheduled events in the guild
+    that we didn't create are kept separately as `external`, so duplicate checks
+    see them between reconciles too.
+    """
+    
+    def __init__(self, guild_id: int, path: str = None):
+        self.guild_id = guild_id
+        self.path = path or state_path(f'discord_ledger_{guild_id}.json')
+        data = load_json(self.path, {})
+        self.entries: Dict[str, Dict[str, Any]] = data.get('events', {})
+        self.last_reconciled: float = data.get('last_reconciled', 0)
+        self.external: Dict[str, Dict[str, Any]] = data.get('external', {})  # discord id -> name, start_time, location
+        self._keys_by_id = {entry['discord_id']: key for key, entry in self.entries.items()}
+        self._by_start = TimeIndex()
+        self._by_recorded = TimeIndex()
+        for key, entry in self.entries.items():
+            self._index(key, entry)
+    
+    def _index(self, key: str, entry: Dict[str, Any]):
+        self._by_start.add(datetime.fromisoformat(entry['start_time']), key)
+        self._by_recorded.add(entry.get('created_at', 0), key)
+    
+    def _unindex(self, key: str, entry: Dict[str, Any]):
+        self._by_start.remove(datetime.fromisoformat(entry['start_time']), key)
+        self._by_recorded.remove(entry.get('created_at', 0), key)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(key)
+    
+    def key_for_id(self, discord_id: int) -> Optional[str]:
+        return self._keys_by_id.get(str(discord_id))
+    
+    def record(self, key: str, discord_id: int, name: str, start_time: datetime, location: str,
+               source: str = None, artist: str = None, url: str = None):
+        """Record a scheduled event we created"""
+        if key in self.entries:
+            self._unindex(key, self.entries[key])
+        self.entries[key] = {
+            'discord_id': str(discord_id),
+            'name': name,
+            'start_time': start_time.isoformat(),
+            'location': location,
+            'source': source,
+            'artist': artist,
+            'url': url,
+            'created_at': time.time()
+        }
+        self._keys_by_id[str(discord_id)] = key
+        self._index(key, self.entries[key])
+    
+    def remove(self, discord_id: int) -> Optional[Dict[str, Any]]:
+        """Forget a scheduled event (e.g. after deleting it)"""
+        self.external.pop(str(discord_id), None)
+        key = self._keys_by_id.pop(str(discord_id), None)
+        entry = self.entries.pop(key, None) if key else None
+        if entry:
+            self._unindex(key, entry)
+        return entry
+    
+    def upcoming(self, after: datetime) -> List[str]:
+        """Keys of events starting after `after`, soonest first"""
+        return self._by_start.after(after)
+    
+    def changed_since(self, timestamp: float) -> List[str]:
+        """Keys recorded (created or edited) at or after timestamp, oldest first"""
+        return self._by_recorded.since(timestamp)
+    
+    def needs_reconcile(self, max_age_hours: float = None) -> bool:
+        if max_age_hours is None:
+            max_age_hours = Config.LEDGER_RECONCILE_HOURS
+        return not (self.entries or self.external) or time.time() - self.last_reconciled > max_age_hours * 3600
+    
+    def reconcile(self, scheduled_events: List[Any]) -> List[Any]:
+        """Sync with the guild's scheduled events.
+        
+        Drops entries whose events no longer exist and returns the scheduled
+        events the ledger doesn't know about (created by people or older runs),
+        which replace the `external` records.
+        """
+        live_ids = {str(scheduled_event.id) for scheduled_event in scheduled_events}
+        for discord_id in list(self._keys_by_id):
+            if discord_id not in live_ids:
+                self.remove(discord_id)
+        
+        self.last_reconciled = time.time()
+        untracked = [scheduled_event for scheduled_event in scheduled_events
+                     if str(scheduled_event.id) not in self._keys_by_id]
+        self.external = {
+            str(scheduled_event.id): {
+                'name': scheduled_event.name,
+                'start_time': scheduled_event.start_time.isoformat(),
+                'location': getattr(scheduled_event, 'location', None) or 'Unknown'
+            }
+            for scheduled_event in untracked
+        }
+        return untracked
+    
+    def save(self):
+        save_json(self.path, {'last_reconciled': self.last_reconciled, 'events': self.entries, 'external': self.external})
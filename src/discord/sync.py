@@ -0,0 +1,117 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from ..lastfm.models import Event
+from ..utils.date_utils import DateValidator
+from .ledger import EventLedger
+
+
+@dataclass
+class SyncPlan:
+    """Minimal set of Discord writes needed to match the current discovery results"""
+    creates: List[Tuple[str, Event, str, float]] = field(default_factory=list)  # (key, event, matched artist, similarity)
+    updates: List[Tuple[str, str, Event, str, Dict[str, Any]]] = field(default_factory=list)  # (old key, new key, event, matched artist, changes)
+    cancels: List[str] = field(default_factory=list)  # ledger keys
+    unchanged: List[str] = field(default_factory=list)
+    
+    def summary(self) -> str:
+        return (f"{len(self.creates)} create, {len(self.updates)} update, "
+                f"{len(self.cancels)} cancel, {len(self.unchanged)} unchanged")
+
+
+class ScheduledEventSync:
+    """Diffs discovery results against the ledger of scheduled events we created.
+    
+    Ledger keys are EventDeduplicator.ledger_key (`venue/city|date|headliner
+    name`), which doesn't move when identities are learned. A discovered show
+    whose key is already in the ledger is unchanged or needs an in-place edit
+    (time, venue name or ticket URL changed). A new key with the same headliner
+    as an unmatched upcoming ledger entry at the same venue or on the same date
+    is the same show rescheduled or moved, so it is edited rather than
+    recreated. Leftover upcoming ledger entries are cancelled, but only for
+    artists that were actually queried this run - otherwise we can't tell a
+    cancelled show from one we simply didn't look for.
+    """
+    
+    def __init__(self, ledger: EventLedger, deduplicator):
+        self.ledger = ledger
+        self.deduplicator = deduplicator
+    
+    @staticmethod
+    def split_key(key: str) -> Tuple[str, str, str]:
+        venue, date, headliner = (key.split('|', 2) + ['', ''])[:3]
+        return venue, date, headliner
+    
+    @staticmethod
+    def _start_time(event: Event) -> Optional[datetime]:
+        start_time = DateValidator.parse_event_date(event.date)
+        if start_time and start_time.tzinfo is None:
+            start_time = start_time.replace(tzinfo=timezone.utc)
+        return start_time
+    
+    def _changes(self, entry: Dict[str, Any], event: Event) -> Dict[str, Any]:
+        """Fields of a ledger entry that differ from the discovered event"""
+        changes = {}
+        start_time = self._start_time(event)
+        if start_time and entry.get('start_time') != start_time.isoformat():
+            changes['start_time'] = start_time
+        if event.venue and entry.get('location') != event.venue:
+            changes['location'] = event.venue
+        if event.url and entry.get('url') != event.url:
+            changes['url'] = event.url
+        return changes
+    
+    def plan(self, matches: Dict[str, List[Tuple[Event, str, float]]],
+             queried_artists: Optional[Iterable[str]] = None) -> SyncPlan:
+        """Build the sync plan for all users' matches"""
+        plan = SyncPlan()
+        
+        desired: Dict[str, Tuple[Event, str, float]] = {}
+        for user_matches in matches.values():
+            for event, matched_artist, similarity in user_matches:
+                desired.setdefault(self.deduplicator.ledger_key(event), (event, matched_artist, similarity))
+        
+        # Exact key matches: unchanged or edited in place. Entries recorded under the
+        # identity-based canonical key by older versions are rekeyed on the way.
+        unmatched_desired = {}
+        matched_keys = set()
+        for key, (event, matched_artist, similarity) in desired.items():
+            old_key = key if key in self.ledger else self.deduplicator.canonical_key(event)
+            entry = self.ledger.get(old_key)
+            if entry is None or old_key in matched_keys:
+                unmatched_desired[key] = (event, matched_artist, similarity)
+                continue
+            matched_keys.add(old_key)
+            changes = self._changes(entry, event)
+            if changes or old_key != key:
+                plan.updates.append((old_key, key, event, matched_artist, changes))
+            else:
+                plan.unchanged.append(key)
+        
+        # Same headliner at the same venue (rescheduled) or on the same date (moved).
+        # Finished events are never candidates: a return visit is a new show.
+        unmatched_ledger: Dict[str, List[str]] = {}
+        for key in self.ledger.upcoming(datetime.now(timezone.utc)):
+            if key not in desired and key not in matched_keys:
+                unmatched_ledger.setdefault(self.split_key(key)[2], []).append(key)
+        
+        for key, (event, matched_artist, similarity) in unmatched_desired.items():
+            venue, date, headliner = self.split_key(key)
+            candidates = unmatched_ledger.get(headliner, [])
+            previous = next((old_key for old_key in candidates
+                             if self.split_key(old_key)[0] == venue or self.split_key(old_key)[1] == date), None)
+            if previous:
+                candidates.remove(previous)
+                plan.updates.append((previous, key, event, matched_artist, self._changes(self.ledger.get(previous), event)))
+            else:
+                plan.creates.append((key, event, matched_artist, similarity))
+        
+        # Shows that disappeared upstream
+        if queried_artists is not None:
+            queried = {artist.lower() for artist in queried_artists}
+            for keys in unmatched_ledger.values():
+                for key in keys:
+                    if (self.ledger.get(key).get('artist') or '').lower() in queried:
+                        plan.cancels.append(key)
+        
+        return plan
@@ -0,0 +1,158 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Tuple
+
+import requests
+
+from ..lastfm.scraper import EventScraper
+from ..utils.config import Config
+from .embeds import build_event_embed, embed_length
+from ..utils.log import get_logger
+
+
+log = get_logger('webhook')
+
+
+class WebhookPublisher:
+    """Posts recommendation embeds through a Discord webhook, without a gateway connection.
+    
+    Embeds are batched into as few messages as Discord allows (10 embeds and
+    6000 characters per message). The bucket headers on each response are
+    honoured before the next post, and 429s are retried after retry_after.
+    """
+    
+    MAX_EMBEDS_PER_MESSAGE = 10
+    MAX_CHARS_PER_MESSAGE = 6000
+    
+    def __init__(self, url: str, session: requests.Session = None, max_retries: int = 3):
+        self.url = url
+        self.session = session or requests.Session()
+        self.max_retries = max_retries
+        self.pending: List[Dict[str, Any]] = []
+        self.messages_sent = 0
+        self.embeds_sent = 0
+        self.rate_limited = 0
+        self._wait_until = 0.0
+    
+    def add(self, embed: Dict[str, Any]):
+        self.pending.append(embed)
+    
+    def add_matches(self, matches: Dict[str, List[Tuple]], title_prefix: str = None):
+        """Queue one embed per user with matches"""
+        for username, user_matches in matches.items():
+            if not user_matches:
+                continue
+            title = f"🎵 {title_prefix} Event Recommendations for {username}" if title_prefix else None
+            self.add(build_event_embed(username, user_matches, title))
+    
+    def batches(self) -> List[List[Dict[str, Any]]]:
+        """Split pending embeds into messages within Discord's per-message limits"""
+        batches, batch, batch_chars = [], [], 0
+        for embed in self.pending:
+            length = embed_length(embed)
+            if batch and (len(batch) >= self.MAX_EMBEDS_PER_MESSAGE or batch_chars + length > self.MAX_CHARS_PER_MESSAGE):
+                batches.append(batch)
+                batch, batch_chars = [], 0
+            batch.append(embed)
+            batch_chars += length
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    def flush(self) -> int:
+        """Post all pending embeds, returning how many were delivered"""
+        delivered = 0
+        for batch in self.batches():
+            if self._post({'embeds': batch}):
+                delivered += len(batch)
+        self.pending = []
+        return delivered
+    
+    def _post(self, payload: Dict[str, Any]) -> bool:
+        for _ in range(self.max_retries + 1):
+            delay = self._wait_until - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            
+            try:
+                response = self.session.post(self.url, json=payload)
+            except requests.exceptions.RequestException as e:
+                log.warning('webhook.failed', "❌ Webhook post failed: {error}", error=e)
+                return False
+            self._track_bucket(response)
+            
+            if response.status_code == 429:
+                self.rate_limited += 1
+                retry_after = self._retry_after(response)
+                log.info('webhook.rate_limited', "⏳ Webhook rate limited, retrying in {retry_after:.1f}s", retry_after=retry_after)
+                self._wait_until = time.monotonic() + retry_after
+                continue
+            
+            if response.status_code in (200, 204):
+                self.messages_sent += 1
+                self.embeds_sent += len(payload.get('embeds', []))
+                return True
+            
+            log.warning('webhook.failed', "❌ Webhook post failed: {status} {body}", status=response.status_code,
+                        body=response.text[:200])
+            return False
+        
+        log.warning('webhook.gave_up', "❌ Webhook post gave up after {retries} retries", retries=self.max_retries)
+        return False
+    
+    def _track_bucket(self, response: requests.Response):
+        """Wait out the bucket before the next post once it is exhausted"""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset_after = response.headers.get('X-RateLimit-Reset-After')
+        if remaining == '0' and reset_after:
+            try:
+                self._wait_until = max(self._wait_until, time.monotonic() + float(reset_after))
+            except ValueError:
+                pass
+    
+    @staticmethod
+    def _retry_after(response: requests.Response) -> float:
+        try:
+            return float(response.json().get('retry_after', 1.0))
+        except (ValueError, AttributeError):
+            try:
+                return float(response.headers.get('Retry-After', 1.0))
+            except ValueError:
+                return 1.0
+
+
+async def publish_recommendations(webhook_url: str) -> int:
+    """
+    Scrape, match and post recommendations through a webhook (no gateway login)
+    
+    Webhooks can't create scheduled events, so this only posts embeds; a run
+    without matches posts nothing. Returns the number of embeds delivered.
+    """
+    usernames = Config.get_users()
+    if not usernames:
+        log.error('webhook.no_users', "❌ No usernames configured for tracking")
+        return 0
+    
+    scraper = EventScraper(
+        Config.get_api_key(),
+        Config.get_ticketmaster_api_key(),
+        Config.get_bandsintown_app_id()
+    )
+    publisher = WebhookPublisher(webhook_url)
+    
+    regions = Config.get_regions()
+    if len(regions) > 1:
+        region_matches = await scraper.scrape_and_match_regions(usernames, regions=regions)
+        for region in regions:
+            publisher.add_matches(region_matches.get(region.name, {}), title_prefix=region.name)
+    else:
+        publisher.add_matches(await scraper.scrape_and_match(usernames))
+    
+    if not publisher.pending:
+        log.info('webhook.no_matches', "🎵 No matches found, nothing to post")
+        return 0
+    
+    delivered = await asyncio.to_thread(publisher.flush)
+    log.info('webhook.posted', "✅ Posted {delivered} embeds in {messages} webhook messages ({rate_limited} rate-limited retries)",
+             delivered=delivered, messages=publisher.messages_sent, rate_limited=publisher.rate_limited)
+    return delivered
@@ -1,8 +1,17 @@
 import requests
 import time
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timezone
+from typing import List, Optional, Dict, Any, Tuple
 from .models import Event
 from ..utils.config import Config
+from ..utils.date_utils import DateValidator
+from ..utils.singleflight import SingleFlight
+from ..utils.http import conditional_headers, response_validators
+from ..utils.geo import VenueIndex, haversine_miles, parse_coordinates
+from ..utils.log import get_logger
+
+
+log = get_logger('bandsintown')
 
 
 class BandsintownClient:
@@ -12,38 +21,77 @@ class BandsintownClient:
         self.app_id = app_id
         self.base_url = 'https://rest.bandsintown.com'
         self.session = requests.Session()
+        self._tours: Dict[str, Tuple[float, List[Event]]] = {}  # artist -> (fetched_at, full tour)
+        self.venue_index = VenueIndex()
+        self.single_flight = SingleFlight()
     
     def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Make a request to the Bandsintown API"""
+        """Make a request to the Bandsintown API, coalescing identical in-flight requests"""
+        key = SingleFlight.make_key(endpoint, params, ignore=('app_id',))
         params['app_id'] = self.app_id
+        return self.single_flight.do(key, lambda: self._send_request(endpoint, params))
+    
+    def _make_conditional_request(self, endpoint: str, params: Dict[str, Any],
+                                  validators: Dict[str, str] = None) -> Tuple[Optional[Any], Dict[str, str]]:
+        """
+        Revalidate a cached payload with its stored validators
         
+        Returns:
+            Tuple of (data, validators); data is None when the server answered 304 Not Modified
+        """
+        key = ('conditional', SingleFlight.make_key(endpoint, params, ignore=('app_id',)),
+               tuple(sorted((validators or {}).items())))
+        params['app_id'] = self.app_id
+        return self.single_flight.do(key, lambda: self._send_conditional_request(endpoint, params, validators))
+    
+    def _send_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self._send_conditional_request(endpoint, params)[0]
+    
+    def _send_conditional_request(self, endpoint: str, params: Dict[str, Any],
+                                  validators: Dict[str, str] = None) -> Tuple[Optional[Any], Dict[str, str]]:
         url = f"{self.base_url}/{endpoint}"
         
         try:
-            response = self.session.get(url, params=params)
+            started = time.perf_counter()
+            response = self.session.get(url, params=params, headers=conditional_headers(validators))
+            log.debug('http.request', "  → {provider} {endpoint}: {status} in {seconds:.2f}s", provider='bandsintown',
+                      endpoint=endpoint, status=response.status_code, seconds=time.perf_counter() - started)
+            if response.status_code == 304:
+                return None, response_validators(response) or validators
             response.raise_for_status()
             data = response.json()
             
             if isinstance(data, dict) and 'error' in data:
                 raise Exception(f"Bandsintown API error: {data['error']}")
             
-            return data
+            return data, response_validators(response)
         except requests.exceptions.RequestException as e:
             raise Exception(f"Request failed: {e}")
     
-    def get_artist_events(self, artist_name: str, location: str = None) -> List[Event]:
-        """Get events for a specific artist"""
+    def get_artist_tour(self, artist_name: str) -> List[Event]:
+        """Get an artist's full, unfiltered tour (fetched once per TTL and cached)"""
+        cache_key = artist_name.strip().lower()
+        cached = self._tours.get(cache_key)
+        if cached and time.time() - cached[0] < Config.ARTIST_CACHE_TTL_HOURS * 3600:
+            return cached[1]
+        return self.fetch_artist_tour(artist_name)[0]
+    
+    def fetch_artist_tour(self, artist_name: str,
+                          validators: Dict[str, str] = None) -> Tuple[Optional[List[Event]], Dict[str, str]]:
+        """
+        Fetch an artist's tour, revalidating a cached copy when validators are given
+        
+        Returns:
+            Tuple of (events, validators); events is None if the cached tour is still current
+        """
         # URL encode the artist name
         import urllib.parse
         encoded_artist = urllib.parse.quote(artist_name)
         
         endpoint = f"artists/{encoded_artist}/events"
-        params = {}
-        
-        if location:
-            params['location'] = location
-        
-        data = self._make_request(endpoint, params)
+        data, validators = self._make_conditional_request(endpoint, {}, validators)
+        if data is None:
+            return None, validators
         
         # Handle single event case
         if isinstance(data, dict):
@@ -63,13 +111,23 @@ class BandsintownClient:
             # Extract venue info
             venue_name = 'Unknown Venue'
             venue_city = 'Unknown City'
+            venue_state = None
             venue_country = 'US'
+            latitude = longitude = None
             
             if 'venue' in event_data:
                 venue = event_data['venue']
                 venue_name = venue.get('name', 'Unknown Venue')
                 venue_city = venue.get('city', 'Unknown City')
+                venue_state = venue.get('region') or None
                 venue_country = venue.get('country', 'US')
+                try:
+                    latitude = float(venue['latitude'])
+                    longitude = float(venue['longitude'])
+                    self.venue_index.add(self._venue_key(venue_name, venue_city, venue_state),
+                                         latitude, longitude, venue_city, venue_state)
+                except (KeyError, TypeError, ValueError):
+                    latitude = longitude = None
             
             # Get event name
             event_name = event_data.get('title', 'Unknown Event')
@@ -87,8 +145,11 @@ class BandsintownClient:
             
             # Extract artists (usually just the main artist for Bandsintown)
             artists = [artist_name]
+            artist_mbids = {}
             if 'artist' in event_data and 'name' in event_data['artist']:
                 artists = [event_data['artist']['name']]
+                if event_data['artist'].get('mbid'):
+                    artist_mbids[artists[0]] = event_data['artist']['mbid']
             
             event = Event(
                 title=event_name,
@@ -99,17 +160,108 @@ class BandsintownClient:
                 url=event_url,
                 description=description,
                 image_url=image_url,
-                artists=artists
+                artists=artists,
+                state=venue_state,
+                latitude=latitude,
+                longitude=longitude,
+                artist_mbids=artist_mbids,
+                source='bandsintown'
             )
             events.append(event)
         
+        self._tours[artist_name.strip().lower()] = (time.time(), events)
+        return events, validators
+    
+    def remember_tour(self, artist_name: str, events: List[Event], fetched_at: float = None):
+        """Seed the tour cache (and venue index) with a tour loaded from elsewhere, e.g. a persistent cache"""
+        for event in events:
+            if event.latitude is not None and event.longitude is not None:
+                self.venue_index.add(self._venue_key(event.venue, event.city, event.state),
+                                     event.latitude, event.longitude, event.city, event.state)
+        self._tours[artist_name.strip().lower()] = (fetched_at or time.time(), events)
+    
+    def get_artist_events(self, artist_name: str, location: str = None, radius: float = None,
+                          start_date: datetime = None, end_date: datetime = None) -> List[Event]:
+        """Get events for a specific artist, filtered locally from the cached tour"""
+        return self.filter_events(self.get_artist_tour(artist_name), location, radius, start_date, end_date)
+    
+    def filter_events(self, events: List[Event], location: str = None, radius: float = None,
+                      start_date: datetime = None, end_date: datetime = None) -> List[Event]:
+        """
+        Filter events by location and date window without making any requests
+        
+        location may be "lat,lon" (e.g. Region.location) or "City, ST". Around a
+        "lat,lon" centre events are kept by venue distance within radius (miles,
+        defaults to Config.BANDSINTOWN_RADIUS_MILES); a "City, ST" location, and
+        events without coordinates, fall back to a city/state comparison.
+        """
+        if location:
+            events = self._filter_by_location(events, location, radius)
+        
+        if start_date or end_date:
+            events = [event for event in events if self._in_window(event, start_date, end_date)]
+        
         return events
     
     def search_events_by_location(self, location: str, radius: int = 25) -> List[Event]:
-        """Search for events by location (this is a workaround since Bandsintown doesn't have direct location search)"""
-        # Bandsintown doesn't have a direct location search API
-        # This would require searching by known artists, which we'll do in the scraper
-        return []
+        """Search every cached tour for events near a location (no requests are made)"""
+        # Bandsintown doesn't have a direct location search API, so this only
+        # covers artists whose tours we've already fetched
+        center = self._resolve_location(location)
+        if not center:
+            all_events = [event for _, tour in self._tours.values() for event in tour]
+            return self._filter_by_location(all_events, location, radius)
+        
+        nearby_venues = set(self.venue_index.within(center[0], center[1], radius))
+        return [
+            event for _, tour in self._tours.values() for event in tour
+            if self._venue_key(event.venue, event.city, event.state) in nearby_venues
+        ]
+    
+    def _filter_by_location(self, events: List[Event], location: str, radius: float = None) -> List[Event]:
+        if radius is None:
+            radius = Config.BANDSINTOWN_RADIUS_MILES
+        
+        city, state = self._split_location(location)
+        center = self._resolve_location(location)
+        
+        filtered = []
+        for event in events:
+            if center and event.latitude is not None and event.longitude is not None:
+                if haversine_miles(center[0], center[1], event.latitude, event.longitude) <= radius:
+                    filtered.append(event)
+            elif city and (event.city or '').strip().lower() == city:
+                if not state or not event.state or event.state.strip().lower() == state:
+                    filtered.append(event)
+        return filtered
+    
+    def _resolve_location(self, location: str) -> Optional[Tuple[float, float]]:
+        """Get the centre of a "lat,lon" location ("City, ST" has none and is matched by city)"""
+        return parse_coordinates(location)
+    
+    @staticmethod
+    def _split_location(location: str) -> Tuple[Optional[str], Optional[str]]:
+        if parse_coordinates(location):
+            return None, None
+        parts = [part.strip().lower() for part in location.split(',')]
+        return parts[0] or None, parts[1] if len(parts) > 1 and parts[1] else None
+    
+    @staticmethod
+    def _venue_key(name: str, city: str, state: Optional[str]) -> str:
+        return f"{name}|{city}|{state or ''}".lower()
+    
+    @staticmethod
+    def _in_window(event: Event, start_date: datetime = None, end_date: datetime = None) -> bool:
+        event_date = DateValidator.parse_event_date(event.date)
+        if not event_date:
+            return False
+        if event_date.tzinfo is None:
+            event_date = event_date.replace(tzinfo=timezone.utc)
+        if start_date and event_date < (start_date if start_date.tzinfo else start_date.replace(tzinfo=timezone.utc)):
+            return False
+        if end_date and event_date > (end_date if end_date.tzinfo else end_date.replace(tzinfo=timezone.utc)):
+            return False
+        return True
     
     def get_artist_info(self, artist_name: str) -> Optional[Dict[str, Any]]:
         """Get artist information"""
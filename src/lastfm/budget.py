@@ -0,0 +1,199 @@
+import time
+from dataclasses import dataclass, field
+from typing import List, Dict, Iterable, Optional, Set
+from .event_cache import ArtistEventCache
+from ..utils.config import Config
+from ..utils.state import state_path, load_json, save_json
+
+
+class QueryUsage:
+    """Persistent per-day count of requests made to each provider"""
+    
+    def __init__(self, path: str = None):
+        self.path = path or state_path('query_usage.json')
+        self.days: Dict[str, Dict[str, int]] = load_json(self.path, {})
+    
+    @staticmethod
+    def today() -> str:
+        # Provider quotas reset on UTC days
+        return time.strftime('%Y-%m-%d', time.gmtime())
+    
+    def used(self, provider: str) -> int:
+        return self.days.get(self.today(), {}).get(provider, 0)
+    
+    def record(self, provider: str, count: int = 1):
+        day = self.days.setdefault(self.today(), {})
+        day[provider] = day.get(provider, 0) + count
+    
+    def save(self):
+        # Only today's counts matter
+        self.days = {day: counts for day, counts in self.days.items() if day == self.today()}
+        save_json(self.path, self.days)
+
+
+@dataclass
+class PlannedQuery:
+    """One provider lookup for one artist"""
+    artist: str
+    provider: str
+    cached: bool  # served from the artist cache, costs no quota
+
+
+@dataclass
+class QueryPlan:
+    """Execution plan for a scrape: which artists to query on which providers, in order"""
+    steps: List[PlannedQuery] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)  # artists left out (artist cap or quota)
+    remaining: Dict[str, int] = field(default_factory=dict)  # quota left per provider after the plan
+    _allowed: Optional[set] = field(default=None, repr=False, compare=False)
+    
+    def artists(self) -> List[str]:
+        """Planned artists in priority order"""
+        seen = []
+        for step in self.steps:
+            if not seen or seen[-1] != step.artist:
+                seen.append(step.artist)
+        return seen
+    
+    def allows(self, artist: str, provider: str) -> bool:
+        if self._allowed is None:
+            self._allowed = {(step.artist, step.provider) for step in self.steps}
+        return (artist, provider) in self._allowed
+    
+    def requests_for(self, provider: str) -> int:
+        return sum(1 for step in self.steps if step.provider == provider and not step.cached)
+    
+    def summary(self) -> str:
+        providers = sorted({step.provider for step in self.steps})
+        parts = [f"{provider}: {self.requests_for(provider)} requests" for provider in providers]
+        cached = sum(1 for step in self.steps if step.cached)
+        return f"{len(self.artists())} artists ({', '.join(parts) or 'no requests'}, {cached} cached), {len(self.skipped)} skipped"
+
+
+@dataclass
+class RunEstimate:
+    """Dry-run forecast for a plan: provider requests, cache coverage and wall time"""
+    plan: QueryPlan
+    batches: int
+    pending_batches: int  # batches left after any checkpointed ones
+    requests: Dict[str, int] = field(default_factory=dict)  # provider requests still to make
+    cached: Dict[str, int] = field(default_factory=dict)  # lookups served from a fresh cache entry
+    revalidatable: Dict[str, int] = field(default_factory=dict)  # requests that can send stored validators (likely 304s)
+    wall_seconds: float = 0.0
+    
+    def coverage(self, provider: str) -> float:
+        """Fraction of the provider's planned lookups served from cache"""
+        total = self.requests.get(provider, 0) + self.cached.get(provider, 0)
+        return self.cached.get(provider, 0) / total if total else 1.0
+    
+    def report(self) -> str:
+        lines = [f"📋 {self.plan.summary()}",
+                 f"📦 {self.pending_batches}/{self.batches} batches to run"]
+        for provider in sorted(set(self.requests) | set(self.cached)):
+            lines.append(f"  {provider}: {self.requests.get(provider, 0)} requests "
+                         f"({self.revalidatable.get(provider, 0)} revalidatable), "
+                         f"{self.coverage(provider):.0%} cache coverage, "
+                         f"{self.plan.remaining.get(provider, 0)} quota left after the run")
+        minutes, seconds = divmod(int(round(self.wall_seconds)), 60)
+        lines.append(f"⏱️  Estimated wall time: {minutes}m {seconds:02d}s (excluding matching and publishing)")
+        return '\n'.join(lines)
+
+
+class QueryBudgetPlanner:
+    """Allocates per-provider daily request budget across prioritized artists.
+    
+    Fresh cache entries cost nothing and are always planned. Artists that need
+    a request are planned in priority order until MAX_ARTISTS_TO_SEARCH is
+    reached or a provider's remaining daily quota runs out; a provider without
+    quota is dropped for that artist while the others are still used.
+    """
+    
+    def __init__(self, cache: ArtistEventCache, usage: QueryUsage = None,
+                 daily_limits: Dict[str, int] = None, max_artists: int = None):
+        self.cache = cache
+        self.usage = usage or QueryUsage()
+        self.daily_limits = daily_limits or Config.get_daily_limits()
+        self.max_artists = max_artists if max_artists is not None else Config.MAX_ARTISTS_TO_SEARCH
+    
+    def plan(self, artists: Iterable[str], providers: Dict[str, str]) -> QueryPlan:
+        """
+        Build a plan for artists (already in priority order)
+        
+        Args:
+            providers: provider name -> artist cache namespace used for its lookups
+        """
+        plan = QueryPlan(remaining={
+            provider: max(0, self.daily_limits.get(provider, 0) - self.usage.used(provider))
+            for provider in providers
+        })
+        searched = 0
+        
+        for artist in artists:
+            needs_request = [provider for provider, namespace in providers.items()
+                             if not self.cache.is_fresh(namespace, artist)]
+            if needs_request and searched >= self.max_artists:
+                needs_request = []
+            
+            steps = []
+            for provider, namespace in providers.items():
+                if provider not in needs_request:
+                    if self.cache.is_fresh(namespace, artist):
+                        steps.append(PlannedQuery(artist, provider, cached=True))
+                elif plan.remaining[provider] > 0:
+                    plan.remaining[provider] -= 1
+                    steps.append(PlannedQuery(artist, provider, cached=False))
+            
+            if not steps:
+                plan.skipped.append(artist)
+                continue
+            if any(not step.cached for step in steps):
+                searched += 1
+            plan.steps.extend(steps)
+        
+        return plan
+    
+    def estimate(self, plan: QueryPlan, phases: Dict[str, List[str]], providers: Dict[str, str],
+                 batch_size: int = 10, batch_delay: float = None, request_seconds: float = None,
+                 completed: Dict[str, Set[int]] = None) -> RunEstimate:
+        """
+        Forecast running plan the way the scraper batches it, without making any request
+        
+        Args:
+            phases: checkpoint phase name -> providers it queries, run one after another
+                (e.g. ticketmaster then bandsintown, or one nationwide phase for both)
+            providers: provider name -> artist cache namespace used for its lookups
+            completed: phase name -> batch numbers a resumable checkpoint already has
+        """
+        batch_delay = batch_delay if batch_delay is not None else Config.BATCH_DELAY_SECONDS
+        request_seconds = request_seconds if request_seconds is not None else Config.ESTIMATED_REQUEST_SECONDS
+        completed = completed or {}
+        artists = plan.artists()
+        batches = [artists[start:start + batch_size] for start in range(0, len(artists), batch_size)]
+        
+        steps_by_artist: Dict[str, List[PlannedQuery]] = {}
+        for step in plan.steps:
+            steps_by_artist.setdefault(step.artist, []).append(step)
+        
+        estimate = RunEstimate(plan, batches=len(batches) * len(phases), pending_batches=0)
+        for phase, phase_providers in phases.items():
+            pending = [batch for batch_num, batch in enumerate(batches) if batch_num not in completed.get(phase, set())]
+            estimate.pending_batches += len(pending)
+            for index, batch in enumerate(pending):
+                batch_requests = 0
+                for step in (step for artist in batch for step in steps_by_artist[artist]):
+                    if step.provider not in phase_providers:
+                        continue
+                    if step.cached:
+                        estimate.cached[step.provider] = estimate.cached.get(step.provider, 0) + 1
+                        continue
+                    batch_requests += 1
+                    estimate.requests[step.provider] = estimate.requests.get(step.provider, 0) + 1
+                    if self.cache.validators(providers[step.provider], step.artist):
+                        estimate.revalidatable[step.provider] = estimate.revalidatable.get(step.provider, 0) + 1
+                
+                # The scraper pauses after every batch that made requests, except the last
+                estimate.wall_seconds += batch_requests * request_seconds
+                if batch_requests and index < len(pending) - 1:
+                    estimate.wall_seconds += batch_delay
+        
+        return estimate
@@ -0,0 +1,90 @@
+import os
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Set
+from .models import Event
+from .budget import PlannedQuery, QueryPlan
+from ..utils.config import Config
+from ..utils.state import state_path, load_json, save_json
+
+
+class ScrapeCheckpoint:
+    """Per-batch progress of a scrape run, so a restarted run resumes after the last completed batch.
+    
+    Holds the query plan, the events found by each completed batch (per phase,
+    e.g. ticketmaster or bandsintown) and the artists whose lookups failed (so a
+    resumed run still won't cancel their events). Scheduled events need no
+    record here: the Discord ledger already keeps a resumed run from creating
+    them twice. A checkpoint only resumes a run with the same signature (mode,
+    users, period weights, excluded artists) that was updated within
+    CHECKPOINT_MAX_AGE_HOURS; it is cleared once the run's scraping finishes.
+    """
+    
+    def __init__(self, path: str = None, max_age_hours: float = None):
+        self.path = path or state_path('scrape_checkpoint.json')
+        self.max_age_seconds = (max_age_hours if max_age_hours is not None else Config.CHECKPOINT_MAX_AGE_HOURS) * 3600
+        self.data: Dict[str, Any] = {}
+    
+    @staticmethod
+    def signature(mode: str, usernames: List[str], periods: Dict[str, float], exclude_artists: List[str] = None) -> str:
+        """Identity of a run: a plan built for other users, periods or exclusions must not be reused"""
+        weights = ','.join(f"{period}:{weight:g}" for period, weight in sorted(periods.items()))
+        excluded = ','.join(sorted({artist.lower() for artist in exclude_artists or ()}))
+        return f"{mode}|{','.join(sorted(usernames))}|{weights}|{excluded}"
+    
+    def resume(self, signature: str) -> bool:
+        """Load the saved checkpoint if it belongs to this run, otherwise start a fresh one"""
+        data = load_json(self.path, None)
+        if (data and data.get('signature') == signature and
+                time.time() - data.get('updated_at', 0) < self.max_age_seconds):
+            self.data = data
+            return True
+        
+        self.data = {'signature': signature, 'plan': None, 'phases': {}, 'failed': []}
+        return False
+    
+    @property
+    def plan(self) -> Optional[QueryPlan]:
+        saved = self.data.get('plan')
+        if saved is None:
+            return None
+        return QueryPlan(steps=[PlannedQuery(**step) for step in saved['steps']],
+                         skipped=saved['skipped'], remaining=saved['remaining'])
+    
+    def set_plan(self, plan: QueryPlan):
+        self.data['plan'] = {
+            'steps': [asdict(step) for step in plan.steps],
+            'skipped': plan.skipped,
+            'remaining': plan.remaining
+        }
+        self.save()
+    
+    def completed_batches(self, phase: str) -> Set[int]:
+        """0-based numbers of the phase's completed batches (not necessarily contiguous)"""
+        return {int(batch_num) for batch_num in self.data.get('phases', {}).get(phase, {})}
+    
+    def events(self, phase: str) -> List[Event]:
+        """Events found by the completed batches of a phase, in batch order"""
+        batches = self.data.get('phases', {}).get(phase, {})
+        return [Event(**event_data) for batch_num in sorted(batches, key=int) for event_data in batches[batch_num]]
+    
+    @property
+    def failed_lookups(self) -> Set[str]:
+        return set(self.data.get('failed', []))
+    
+    def complete_batch(self, phase: str, batch_num: int, events: List[Event], failed: Set[str] = None):
+        """Record a finished batch (0-based batch_num) and the run's failed lookups so far, and write the checkpoint"""
+        self.data['phases'].setdefault(phase, {})[str(batch_num)] = [event.to_state() for event in events]
+        self.data['failed'] = sorted(self.failed_lookups | set(failed or ()))
+        self.save()
+    
+    def save(self):
+        self.data['updated_at'] = time.time()
+        save_json(self.path, self.data)
+    
+    def clear(self):
+        self.data = {}
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
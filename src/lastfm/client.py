@@ -1,8 +1,13 @@
 import requests
 import time
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from .models import Artist, Event, UserListeningData
 from ..utils.config import Config
+from ..utils.singleflight import SingleFlight
+from ..utils.log import get_logger
+
+
+log = get_logger('lastfm')
 
 
 class LastFMClient:
@@ -12,9 +17,17 @@ class LastFMClient:
         self.api_key = api_key
         self.base_url = Config.LASTFM_API_URL
         self.session = requests.Session()
+        # Keep one keep-alive connection per concurrent user fetch
+        self.session.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=Config.get_lastfm_workers()))
+        self.session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=Config.get_lastfm_workers()))
+        self.single_flight = SingleFlight()
     
     def _make_request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Make a request to the Last.fm API"""
+        """Make a request to the Last.fm API, coalescing identical in-flight requests"""
+        key = SingleFlight.make_key(method, params, ignore=('api_key',))
+        return self.single_flight.do(key, lambda: self._send_request(method, params))
+    
+    def _send_request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
         params.update({
             'api_key': self.api_key,
             'format': 'json',
@@ -22,7 +35,10 @@ class LastFMClient:
         })
         
         try:
+            started = time.perf_counter()
             response = self.session.get(self.base_url, params=params)
+            log.debug('http.request', "  → {provider} {method}: {status} in {seconds:.2f}s", provider='lastfm',
+                      method=method, status=response.status_code, seconds=time.perf_counter() - started)
             response.raise_for_status()
             data = response.json()
             
@@ -111,12 +127,45 @@ class LastFMClient:
                 date=event_date,
                 url=event_data.get('url'),
                 description=event_data.get('description'),
-                artists=artists
+                artists=artists,
+                source='lastfm'
             )
             events.append(event)
         
         return events
     
+    def get_similar_artists(self, artist_name: str, limit: int = 10) -> List[Tuple[Artist, float]]:
+        """Get artists similar to artist_name with Last.fm's match score (0-1), best first"""
+        params = {
+            'artist': artist_name,
+            'limit': limit,
+            'autocorrect': 1
+        }
+        
+        data = self._make_request('artist.getsimilar', params)
+        artists_data = data.get('similarartists', {}).get('artist', [])
+        
+        # Handle single artist case
+        if isinstance(artists_data, dict):
+            artists_data = [artists_data]
+        
+        similar = []
+        for artist_data in artists_data:
+            if not artist_data.get('name'):
+                continue
+            try:
+                match = float(artist_data.get('match', 0))
+            except (TypeError, ValueError):
+                match = 0.0
+            artist = Artist(
+                name=artist_data['name'],
+                mbid=artist_data.get('mbid') or None,
+                url=artist_data.get('url')
+            )
+            similar.append((artist, match))
+        
+        return similar
+    
     def search_artist(self, artist_name: str) -> Optional[Artist]:
         """Search for a specific artist"""
         params = {
@@ -0,0 +1,139 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Dict, Tuple
+from .models import Event
+from .similarity import SimilarityBackend, get_backend
+from ..utils.config import Config
+from ..utils.date_utils import DateValidator
+
+
+class EventDeduplicator:
+    """Canonical cross-source event deduplication.
+    
+    Events are blocked by (normalized venue and city, local date). Two events in the same
+    or an adjacent-day block are the same show when their start times are close
+    and either their headliners resolve to the same identity or their titles are
+    fuzzy matches. Fuzzy comparisons therefore only run inside a block.
+    """
+    
+    def __init__(self, identity=None, title_threshold: float = None, time_window_hours: float = None,
+                 similarity: SimilarityBackend = None):
+        self.identity = identity
+        self.similarity = similarity or get_backend()
+        self.title_threshold = title_threshold if title_threshold is not None else Config.SIMILARITY_THRESHOLD
+        self.time_window = timedelta(hours=time_window_hours if time_window_hours is not None else Config.DEDUP_TIME_WINDOW_HOURS)
+        self._local_tz = None
+    
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Lowercase, strip punctuation and drop a leading/standalone 'the'"""
+        words = re.sub(r'[^\w]+', ' ', (text or '').casefold()).split()
+        return ' '.join(word for word in words if word != 'the')
+    
+    def _local_timezone(self):
+        if self._local_tz is None:
+            try:
+                from zoneinfo import ZoneInfo
+                self._local_tz = ZoneInfo(Config.LOCAL_TIMEZONE)
+            except Exception:
+                self._local_tz = timezone.utc
+        return self._local_tz
+    
+    def start_time(self, event: Event) -> Optional[datetime]:
+        """Parsed, timezone-aware start time (naive times are treated as UTC, as elsewhere)"""
+        parsed = DateValidator.parse_event_date(event.date) if isinstance(event.date, str) else event.date
+        if parsed and parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed
+    
+    def date_bucket(self, event: Event) -> str:
+        """Calendar date of the show (UTC timestamps are converted to local time first)"""
+        if isinstance(event.date, str) and event.date:
+            parsed = DateValidator.parse_event_date(event.date)
+            if parsed is None:
+                return event.date[:10]
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone(self._local_timezone())
+            return parsed.date().isoformat()
+        if isinstance(event.date, datetime):
+            return event.date.date().isoformat()
+        return ''
+    
+    def headliner_id(self, event: Event) -> str:
+        """Canonical identity of the headliner, falling back to the normalized title"""
+        if event.artists and self.identity:
+            headliner = event.artists[0]
+            canonical = self.identity.resolve(headliner, event.artist_mbids.get(headliner))
+            if canonical:
+                return canonical
+        return self.headliner_name(event)
+    
+    def headliner_name(self, event: Event) -> str:
+        """The headliner's normalized name (or the normalized title), independent of identity resolution"""
+        if event.artists:
+            return f"name:{' '.join(event.artists[0].casefold().split())}"
+        return f"title:{self.normalize_text(event.title)}"
+    
+    def block_key(self, event: Event) -> Tuple[str, str]:
+        """(normalized venue and city, local date) - venue names like "House of Blues" repeat across cities"""
+        return f"{self.normalize_text(event.venue)}/{self.normalize_text(event.city)}", self.date_bucket(event)
+    
+    def canonical_key(self, event: Event) -> str:
+        """Key for an event: normalized venue/city, local date and headliner identity"""
+        venue, date = self.block_key(event)
+        return f"{venue}|{date}|{self.headliner_id(event)}"
+    
+    def ledger_key(self, event: Event) -> str:
+        """Persistent key for an event: normalized venue/city, local date and headliner name.
+        
+        Unlike canonical_key it doesn't change when an MBID or alias is learned for
+        the headliner, so it is what the Discord ledger stores.
+        """
+        venue, date = self.block_key(event)
+        return f"{venue}|{date}|{self.headliner_name(event)}"
+    
+    def is_duplicate(self, event1: Event, event2: Event) -> bool:
+        """Check whether two events (already known to share a block) are the same show"""
+        time1, time2 = self.start_time(event1), self.start_time(event2)
+        if time1 and time2 and abs(time1 - time2) > self.time_window:
+            return False
+        if self.headliner_id(event1) == self.headliner_id(event2):
+            return True
+        title1, title2 = self.normalize_text(event1.title), self.normalize_text(event2.title)
+        return self.similarity.ratio(title1, title2) >= self.title_threshold
+    
+    def cluster(self, events: List[Event]) -> List[int]:
+        """Assign each event the index of the first event it duplicates (itself if unique)"""
+        blocks: Dict[Tuple[str, str], List[int]] = {}
+        representatives = []
+        
+        for idx, event in enumerate(events):
+            venue, date = self.block_key(event)
+            representative = idx
+            for neighbor_date in self._neighbor_dates(date):
+                for candidate in blocks.get((venue, neighbor_date), ()):
+                    if self.is_duplicate(events[candidate], event):
+                        representative = candidate
+                        break
+                if representative != idx:
+                    break
+            
+            if representative == idx:
+                blocks.setdefault((venue, date), []).append(idx)
+            representatives.append(representative)
+        
+        return representatives
+    
+    def dedupe(self, events: List[Event]) -> List[Event]:
+        """Keep the first occurrence of every show"""
+        return [event for idx, (event, representative) in enumerate(zip(events, self.cluster(events)))
+                if idx == representative]
+    
+    @staticmethod
+    def _neighbor_dates(date: str) -> List[str]:
+        """The block's own date first, then the adjacent days (timezone slop)"""
+        try:
+            day = datetime.strptime(date, "%Y-%m-%d")
+        except ValueError:
+            return [date]
+        return [date, (day - timedelta(days=1)).strftime("%Y-%m-%d"), (day + timedelta(days=1)).strftime("%Y-%m-%d")]
@@ -0,0 +1,78 @@
+import time
+from typing import List, Optional, Dict, Any
+from .models import Event
+from ..utils.config import Config
+from ..utils.state import state_path, load_json, save_json
+
+
+class ArtistEventCache:
+    """Persistent per-artist, per-provider cache of unfiltered event lookups.
+    
+    One nationwide lookup per artist is stored here and filtered locally for
+    every configured region, so adding a city doesn't add provider calls.
+    """
+    
+    def __init__(self, path: str = None, ttl_hours: float = None):
+        self.path = path or state_path('artist_events.json')
+        self.ttl_seconds = (ttl_hours if ttl_hours is not None else Config.ARTIST_CACHE_TTL_HOURS) * 3600
+        self.entries: Dict[str, Dict[str, Any]] = load_json(self.path, {})
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0  # stale entries confirmed current by a 304
+    
+    @staticmethod
+    def _key(provider: str, artist: str) -> str:
+        return f"{provider}:{artist.strip().lower()}"
+    
+    def age(self, provider: str, artist: str) -> Optional[float]:
+        """Seconds since the artist was last fetched from provider, or None if never"""
+        entry = self.entries.get(self._key(provider, artist))
+        if not entry:
+            return None
+        return time.time() - entry['fetched_at']
+    
+    def is_fresh(self, provider: str, artist: str) -> bool:
+        age = self.age(provider, artist)
+        return age is not None and age < self.ttl_seconds
+    
+    def get(self, provider: str, artist: str) -> Optional[List[Event]]:
+        """Get cached events if the entry is still fresh"""
+        if not self.is_fresh(provider, artist):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [Event(**event_data) for event_data in self.entries[self._key(provider, artist)]['events']]
+    
+    def put(self, provider: str, artist: str, events: List[Event], validators: Dict[str, str] = None):
+        entry = {
+            'fetched_at': time.time(),
+            'events': [event.to_state() for event in events]
+        }
+        if validators:
+            entry['validators'] = validators
+        self.entries[self._key(provider, artist)] = entry
+    
+    def validators(self, provider: str, artist: str) -> Dict[str, str]:
+        """ETag/Last-Modified stored with an entry (fresh or stale), for conditional requests"""
+        entry = self.entries.get(self._key(provider, artist))
+        return dict(entry.get('validators', {})) if entry else {}
+    
+    def refresh(self, provider: str, artist: str, validators: Dict[str, str] = None) -> Optional[List[Event]]:
+        """Mark a stale entry current again after a 304 and return its events"""
+        entry = self.entries.get(self._key(provider, artist))
+        if not entry:
+            return None
+        entry['fetched_at'] = time.time()
+        if validators:
+            entry['validators'] = validators
+        self.revalidated += 1
+        return [Event(**event_data) for event_data in entry['events']]
+    
+    def prune(self):
+        """Drop entries that are long past their TTL"""
+        cutoff = time.time() - self.ttl_seconds * 4
+        self.entries = {key: entry for key, entry in self.entries.items() if entry['fetched_at'] >= cutoff}
+    
+    def save(self):
+        self.prune()
+        save_json(self.path, self.entries)
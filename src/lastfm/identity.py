@@ -0,0 +1,68 @@
+import threading
+from typing import Dict, Optional
+from ..utils.state import state_path, load_json, save_json
+
+
+class ArtistIdentityResolver:
+    """Resolves artist names and MusicBrainz IDs to canonical artist IDs.
+    
+    Canonical IDs are `mbid:<mbid>` when an MBID is known, otherwise
+    `name:<normalized name>`. The MBID and alias tables persist between runs,
+    so names learned from confident matches resolve exactly next time. Writes
+    and saves hold a lock, so concurrent matching threads can share one resolver.
+    """
+    
+    def __init__(self, path: str = None, tables: Dict[str, Dict[str, str]] = None):
+        self.path = path or state_path('artist_aliases.json')
+        if tables is None:
+            tables = load_json(self.path, {})
+        self.mbids: Dict[str, str] = dict(tables.get('mbids', {}))  # mbid -> canonical id
+        self.aliases: Dict[str, str] = dict(tables.get('aliases', {}))  # normalized name -> canonical id
+        self._dirty = False
+        self._lock = threading.RLock()
+    
+    @staticmethod
+    def normalize(name: str) -> str:
+        return ' '.join(name.casefold().split())
+    
+    def tables(self) -> Dict[str, Dict[str, str]]:
+        """Snapshot of the lookup tables (e.g. for shipping to worker processes)"""
+        with self._lock:
+            return {'mbids': dict(self.mbids), 'aliases': dict(self.aliases)}
+    
+    def resolve(self, name: str, mbid: str = None) -> Optional[str]:
+        """Get the canonical ID for an artist, or None if it is unknown"""
+        if mbid and mbid in self.mbids:
+            return self.mbids[mbid]
+        
+        canonical = self.aliases.get(self.normalize(name))
+        # A name that belongs to a different MBID is a namesake, not the same artist
+        if canonical and mbid and canonical.startswith('mbid:') and canonical != f"mbid:{mbid}":
+            return None
+        return canonical
+    
+    def register(self, name: str, mbid: str = None) -> str:
+        """Register a known artist (e.g. from Last.fm) and return its canonical ID"""
+        with self._lock:
+            canonical = self.resolve(name, mbid)
+            if not canonical:
+                canonical = f"mbid:{mbid}" if mbid else f"name:{self.normalize(name)}"
+            self.learn_alias(name, canonical, mbid)
+            return canonical
+    
+    def learn_alias(self, name: str, canonical_id: str, mbid: str = None):
+        """Record that a name (and optionally an MBID) refers to canonical_id"""
+        normalized = self.normalize(name)
+        with self._lock:
+            if normalized and normalized not in self.aliases:
+                self.aliases[normalized] = canonical_id
+                self._dirty = True
+            if mbid and mbid not in self.mbids:
+                self.mbids[mbid] = canonical_id
+                self._dirty = True
+    
+    def save(self):
+        with self._lock:
+            if self._dirty:
+                save_json(self.path, self.tables())
+                self._dirty = False
@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
 
 
@@ -29,13 +29,41 @@ class Event:
     description: Optional[str] = None
     image_url: Optional[str] = None
     artists: List[str] = None
+    state: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    artist_mbids: Dict[str, str] = None  # artist name -> musicbrainz id, when the provider has one
+    source: Optional[str] = None  # provider the event came from (ticketmaster, bandsintown, ...)
+    raw: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)  # provider fields for deferred enrichment
     
     def __post_init__(self):
         if self.artists is None:
             self.artists = []
+        if self.artist_mbids is None:
+            self.artist_mbids = {}
     
     def __str__(self) -> str:
         return f"{self.title} at {self.venue} on {self.date.strftime('%Y-%m-%d')}"
+    
+    @staticmethod
+    def display_fields(raw: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """The image URL (largest image) and info text deferred enrichment reads from raw"""
+        if not raw:
+            return {}
+        display = {}
+        images = raw.get('images')
+        image_url = max(images, key=lambda image: image.get('width', 0)).get('url') if images else raw.get('image_url')
+        if image_url:
+            display['image_url'] = image_url
+        if raw.get('info'):
+            display['info'] = raw['info']
+        return display
+    
+    def to_state(self) -> Dict[str, Any]:
+        """Fields for the artist cache and scrape checkpoint, with raw cut down to its display fields"""
+        state = asdict(replace(self, raw=None))
+        state['raw'] = self.display_fields(self.raw) or None
+        return state
 
 
 @dataclass
@@ -49,3 +77,45 @@ class UserListeningData:
     def get_artist_names(self) -> List[str]:
         """Get list of artist names for easy matching"""
         return [artist.name for artist in self.artists]
+
+
+@dataclass
+class Region:
+    """Represents a city we discover events for"""
+    city: str
+    state: Optional[str] = None
+    country: str = 'US'
+    channel_id: Optional[int] = None
+    latitude: Optional[float] = None  # fixed centre for radius filtering
+    longitude: Optional[float] = None
+    
+    @property
+    def name(self) -> str:
+        return f"{self.city}, {self.state}" if self.state else self.city
+    
+    @property
+    def location(self) -> str:
+        """Provider location filter: the configured "lat,lon" centre, else "City, ST" """
+        if self.latitude is not None and self.longitude is not None:
+            return f"{self.latitude},{self.longitude}"
+        return self.name
+    
+    def contains(self, event: Event) -> bool:
+        """Check whether an event takes place in this region"""
+        if not event.city or event.city.strip().lower() != self.city.lower():
+            return False
+        if self.state and event.state and event.state.strip().upper() != self.state.upper():
+            return False
+        return True
+
+
+@dataclass
+class GuildTarget:
+    """A Discord server that recommendations are published to"""
+    guild_id: int
+    channel_id: Optional[int] = None
+    users: List[str] = None  # last.fm usernames tracked for this guild
+    
+    def __post_init__(self):
+        if self.users is None:
+            self.users = []
@@ -0,0 +1,85 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import List, Dict, Tuple
+from .models import Artist, Event, UserListeningData
+from ..utils.config import Config
+
+
+# Per-process state, populated once by _init_worker so that each task only
+# has to carry its shard of events
+_worker_scraper = None
+_worker_user_artists: Dict[str, List[Artist]] = {}
+
+
+def _init_worker(similarity_threshold: float, user_artists: Dict[str, List[Artist]],
+                 identity_tables: Dict[str, Dict[str, str]]):
+    """Prepare a matching-only scraper and the user artist lists in a worker process"""
+    global _worker_scraper, _worker_user_artists
+    from .scraper import EventScraper
+    from .identity import ArtistIdentityResolver
+    
+    _worker_scraper = EventScraper('', '')
+    _worker_scraper.similarity_threshold = similarity_threshold
+    _worker_scraper._identity = ArtistIdentityResolver(tables=identity_tables)
+    _worker_user_artists = user_artists
+
+
+def _match_shard(shard_start: int, shard: List[Event]) -> Tuple[Dict[str, List[Tuple[int, str, str, float]]], Dict[str, int]]:
+    """Match one shard of events against every user, returning global event indexes and pruning stats"""
+    _worker_scraper.match_stats.clear()
+    results = {}
+    for username, user_artists in _worker_user_artists.items():
+        results[username] = [
+            (shard_start + event_idx, event_artist, user_artist, similarity)
+            for event_idx, event_artist, user_artist, similarity
+            in _worker_scraper._match_user_events(user_artists, shard)
+        ]
+    return results, dict(_worker_scraper.match_stats)
+
+
+class ParallelMatcher:
+    """Shards event matching across a process pool, producing the same output as the serial path"""
+    
+    def __init__(self, scraper, max_workers: int = None, shards_per_worker: int = 4):
+        self.scraper = scraper
+        self.max_workers = max_workers or Config.get_match_workers()
+        self.shards_per_worker = shards_per_worker
+    
+    def find_matching_events(self, user_data: Dict[str, UserListeningData], events: List[Event],
+                             min_events: int = None, shared_identity: bool = False) -> Dict[str, List[Tuple[Event, str, float]]]:
+        """Drop-in replacement for EventScraper.find_matching_events"""
+        if min_events is None:
+            min_events = Config.PARALLEL_MATCH_MIN_EVENTS
+        
+        if self.max_workers <= 1 or len(events) < min_events or not user_data:
+            return self.scraper.find_matching_events(user_data, events, shared_identity)
+        
+        if not shared_identity:
+            self.scraper.register_user_artists(user_data)
+        user_artists = {username: data.artists for username, data in user_data.items()}
+        
+        # Small shards keep workers busy when some events have many more artists than others
+        shard_count = min(len(events), self.max_workers * self.shards_per_worker)
+        shard_size = (len(events) + shard_count - 1) // shard_count
+        
+        raw_matches = {username: [] for username in user_data}
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self.scraper.similarity_threshold, user_artists, self.scraper.identity.tables())
+        ) as pool:
+            # Workers only match on names, so leave deferred enrichment payloads behind
+            slim_events = [replace(event, raw=None) if event.raw else event for event in events]
+            futures = [
+                pool.submit(_match_shard, start, slim_events[start:start + shard_size])
+                for start in range(0, len(events), shard_size)
+            ]
+            
+            # Merge in shard order so ties resolve exactly as in the serial path
+            for future in futures:
+                shard_results, shard_stats = future.result()
+                for username, shard_matches in shard_results.items():
+                    raw_matches[username].extend(shard_matches)
+                self.scraper.add_match_stats(shard_stats)
+        
+        return self.scraper._finalize_matches(user_data, events, raw_matches, save_identity=not shared_identity)
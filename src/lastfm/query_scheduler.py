@@ -0,0 +1,70 @@
+from typing import List, Dict, Iterable, Optional
+from .event_cache import ArtistEventCache
+from .models import UserListeningData
+from ..utils.config import Config
+
+
+class QueryScheduler:
+    """Orders artist lookups so the most valuable ones run first.
+    
+    An artist's priority combines how much each user plays it (normalized per
+    user so one heavy scrobbler doesn't dominate), how many tracked users share
+    it, and how stale our cached lookups for it are. If a run stops early on
+    quota or a timeout, what's left unsearched is the least valuable tail.
+    """
+    
+    def __init__(self, cache: Optional[ArtistEventCache] = None, providers: Iterable[str] = (),
+                 overlap_weight: float = None, staleness_floor: float = None):
+        self.cache = cache
+        self.providers = list(providers)
+        self.overlap_weight = overlap_weight if overlap_weight is not None else Config.QUERY_OVERLAP_WEIGHT
+        self.staleness_floor = staleness_floor if staleness_floor is not None else Config.QUERY_STALENESS_FLOOR
+    
+    def staleness(self, artist: str) -> float:
+        """0.0 for freshly cached, 1.0 for never fetched or expired (worst provider wins)"""
+        if not self.cache or not self.providers:
+            return 1.0
+        worst = 0.0
+        for provider in self.providers:
+            age = self.cache.age(provider, artist)
+            if age is None:
+                return 1.0
+            worst = max(worst, min(age / self.cache.ttl_seconds, 1.0) if self.cache.ttl_seconds else 1.0)
+        return worst
+    
+    def scores(self, user_data: Dict[str, UserListeningData]) -> Dict[str, float]:
+        """Priority score for every artist across all users, under the first spelling seen"""
+        playcount_scores: Dict[str, float] = {}
+        overlap: Dict[str, int] = {}
+        names: Dict[str, str] = {}
+        
+        for data in user_data.values():
+            max_playcount = max((artist.playcount or 0 for artist in data.artists), default=0)
+            for rank, artist in enumerate(data.artists):
+                key = artist.name.lower()
+                names.setdefault(key, artist.name)
+                if max_playcount:
+                    weight = (artist.playcount or 0) / max_playcount
+                else:
+                    # No playcounts: fall back to the chart position
+                    weight = 1.0 - rank / max(len(data.artists), 1)
+                playcount_scores[key] = playcount_scores.get(key, 0.0) + weight
+                overlap[key] = overlap.get(key, 0) + 1
+        
+        scores = {}
+        for key, playcount_score in playcount_scores.items():
+            staleness = self.staleness(names[key])
+            scores[names[key]] = (
+                playcount_score
+                * (1.0 + self.overlap_weight * (overlap[key] - 1))
+                * (self.staleness_floor + (1.0 - self.staleness_floor) * staleness)
+            )
+        return scores
+    
+    def prioritize(self, user_data: Dict[str, UserListeningData], artists: Iterable[str] = None) -> List[str]:
+        """Order artists (all users' artists by default) by descending priority; names match case-insensitively"""
+        scores = self.scores(user_data)
+        if artists is None:
+            artists = scores.keys()
+        by_key = {artist.lower(): score for artist, score in scores.items()}
+        return sorted(artists, key=lambda artist: (-by_key.get(artist.lower(), 0.0), artist.lower()))
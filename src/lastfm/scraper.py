@@ -1,12 +1,31 @@
-from difflib import SequenceMatcher
-from typing import List, Dict, Tuple
+import threading
+from collections import Counter
+from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Iterable, Optional, Set, Tuple
 from .client import LastFMClient
 from .ticketmaster_client import TicketmasterClient
 from .bandsintown_client import BandsintownClient
-from .models import Artist, Event, UserListeningData
+from .models import Artist, Event, UserListeningData, Region
 from .mock_events import get_mock_atlanta_events
+from .parallel_matcher import ParallelMatcher
+from .event_cache import ArtistEventCache
+from .identity import ArtistIdentityResolver
+from .dedup import EventDeduplicator
+from .query_scheduler import QueryScheduler
+from .similarity import get_backend
+from .budget import QueryBudgetPlanner, QueryPlan, QueryUsage, RunEstimate
+from .checkpoint import ScrapeCheckpoint
+from .similar_artists import SimilarArtistGraph
 from ..utils.config import Config
 from ..utils.date_utils import DateValidator
+from ..utils.http_fixtures import RecordingSession, ReplaySession
+from ..utils.time_index import TimeIndex
+from ..utils.pipeline import Pipeline, Stage
+from ..utils.log import get_logger
+
+
+log = get_logger('scraper')
 
 
 class EventScraper:
@@ -17,83 +36,397 @@ class EventScraper:
         self.ticketmaster_client = TicketmasterClient(ticketmaster_api_key)
         self.bandsintown_client = BandsintownClient(bandsintown_app_id) if bandsintown_app_id else None
         self.similarity_threshold = Config.SIMILARITY_THRESHOLD
+        self.similarity = get_backend()
+        self._artist_cache = None
+        self._identity = None
+        self._deduplicator = None
+        self.queried_artists = set()  # artists every provider lookup succeeded for in the last scrape
+        self.failed_lookups = set()  # lowercased artists with a failed provider lookup this run
+        self._usage = None
+        self._checkpoint = None
+        self._similar_graph = None
+        self.batch_delay = Config.BATCH_DELAY_SECONDS
+        self.match_stats = Counter()  # fuzzy scoring pairs per pruning tier
+        self._match_stats_lock = threading.Lock()  # regions are matched in concurrent threads
+        self._http_fixture = None  # (mode, path, session) while recording or replaying
+        self.event_index = TimeIndex()  # last finalized events by start time, as (position, event)
+        self.pipeline_stats = []  # per-stage throughput and queue depth of the last batch pipeline
     
-    def get_user_artists(self, usernames: List[str], period: str = '1month') -> Dict[str, UserListeningData]:
-        """Get listening data for multiple users"""
-        user_data = {}
+    @property
+    def artist_cache(self) -> ArtistEventCache:
+        """Shared per-artist event cache (loaded on first use)"""
+        if self._artist_cache is None:
+            self._artist_cache = ArtistEventCache()
+        return self._artist_cache
+    
+    @property
+    def identity(self) -> ArtistIdentityResolver:
+        """Persistent artist identity/alias table (loaded on first use)"""
+        if self._identity is None:
+            self._identity = ArtistIdentityResolver()
+        return self._identity
+    
+    @property
+    def usage(self) -> QueryUsage:
+        """Today's provider request counts (loaded on first use)"""
+        if self._usage is None:
+            self._usage = QueryUsage()
+        return self._usage
+    
+    @property
+    def checkpoint(self) -> ScrapeCheckpoint:
+        """Batch progress of the current scrape run (resumed by the next run if interrupted)"""
+        if self._checkpoint is None:
+            self._checkpoint = ScrapeCheckpoint()
+        return self._checkpoint
+    
+    @property
+    def similar_graph(self) -> SimilarArtistGraph:
+        """Persistent Last.fm similar-artist graph (loaded on first use)"""
+        if self._similar_graph is None:
+            self._similar_graph = SimilarArtistGraph()
+        return self._similar_graph
+    
+    @property
+    def deduplicator(self) -> EventDeduplicator:
+        """Cross-source event deduplicator keyed on venue, date and headliner identity"""
+        if self._deduplicator is None:
+            self._deduplicator = EventDeduplicator(self.identity, similarity=self.similarity)
+        return self._deduplicator
+    
+    def use_http_fixture(self, mode: str, path: str, speed: float = 1.0):
+        """
+        Record provider traffic to, or replay it from, a compressed fixture file
+        
+        In replay mode nothing touches the network and the between-batch rate-limit
+        delay is skipped, so runs against the same fixture are directly comparable.
+        """
+        if mode == 'record':
+            session = RecordingSession()
+        elif mode == 'replay':
+            session = ReplaySession(path, speed)
+            self.batch_delay = 0
+        else:
+            raise ValueError(f"Unknown HTTP fixture mode: {mode}")
+        
+        for client in (self.lastfm_client, self.ticketmaster_client, self.bandsintown_client):
+            if client:
+                client.session = session
+        self._http_fixture = (mode, path, session)
+        log.info('fixture.open', "📼 HTTP fixture: {mode} {path}", mode=mode, path=path)
+    
+    def save_http_fixture(self):
+        """Write recorded traffic out (no-op unless recording)"""
+        if self._http_fixture and self._http_fixture[0] == 'record':
+            mode, path, session = self._http_fixture
+            session.save(path)
+            log.info('fixture.saved', "📼 Recorded {requests} requests to {path}", requests=len(session.exchanges), path=path)
+    
+    def coalesced_requests(self) -> int:
+        """Provider requests saved by sharing identical in-flight calls"""
+        clients = [self.lastfm_client, self.ticketmaster_client, self.bandsintown_client]
+        return sum(client.single_flight.saved for client in clients if client)
+    
+    def get_user_artists(self, usernames: List[str], period: str = None,
+                         periods: Dict[str, float] = None, max_workers: int = None) -> Dict[str, UserListeningData]:
+        """
+        Get listening data for multiple users, fetched concurrently
         
+        periods maps Last.fm periods to weights (e.g. {'1month': 1.0, '6month': 0.5});
+        each user's periods are merged into one weighted profile. See
+        resolve_periods for how periods, period and GUTTERBOT_PERIODS take
+        precedence. A user is only dropped if every one of their fetches fails.
+        """
+        periods = self.resolve_periods(period, periods)
+        tasks = [(username, p) for username in usernames for p in periods]
+        if not tasks:
+            return {}
+        workers = max(1, min(max_workers or Config.get_lastfm_workers(), len(tasks)))
+        
+        fetched: Dict[str, Dict[str, UserListeningData]] = {username: {} for username in usernames}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Get more artists for better coverage
+            futures = {
+                pool.submit(self.lastfm_client.get_user_top_artists, username, p, 100): (username, p)
+                for username, p in tasks
+            }
+            for future in as_completed(futures):
+                username, p = futures[future]
+                try:
+                    fetched[username][p] = future.result()
+                except Exception as e:
+                    log.warning('lastfm.user_failed', "✗ Failed to load {period} data for {username}: {error}", period=p, username=username, error=e)
+        
+        user_data = {}
         for username in usernames:
-            try:
-                # Get more artists for better coverage
-                user_data[username] = self.lastfm_client.get_user_top_artists(username, period, limit=100)
-                print(f"✓ Loaded {len(user_data[username].artists)} artists for {username}")
-            except Exception as e:
-                print(f"✗ Failed to load data for {username}: {e}")
+            profiles = fetched[username]
+            if not profiles:
+                continue
+            if len(periods) == 1:
+                user_data[username] = next(iter(profiles.values()))
+            else:
+                user_data[username] = self.merge_listening_data(username, profiles, periods)
+            log.info('lastfm.user_loaded', "✓ Loaded {artists} artists for {username}", artists=len(user_data[username].artists), username=username)
         
         return user_data
     
+    @staticmethod
+    def resolve_periods(period: str = None, periods: Dict[str, float] = None) -> Dict[str, float]:
+        """
+        Last.fm periods to load, with weights
+        
+        An explicit periods dict wins, then an explicit period (weight 1), then
+        GUTTERBOT_PERIODS, then '1month'. A caller that passes a period gets
+        exactly that period, whatever is configured.
+        """
+        return periods or ({period: 1.0} if period else Config.get_period_weights()) or {'1month': 1.0}
+    
+    def expand_similar_artists(self, user_data: Dict[str, UserListeningData], depth: int = None,
+                               weight: float = None, fetch: bool = True) -> int:
+        """
+        Add artists similar to each user's top artists to their profile, and so to the query set
+        
+        A similar artist's playcount is its seeds' playcounts times weight times the
+        Last.fm match score per hop, so it ranks below the artists the user plays.
+        Edges come from the persistent similar-artist graph, which only calls
+        Last.fm for seeds whose entry expired; with fetch=False only cached edges
+        are used. Defaults to GUTTERBOT_SIMILAR_DEPTH (0 = off) and
+        GUTTERBOT_SIMILAR_WEIGHT. Returns the number of artists added.
+        """
+        depth = depth if depth is not None else Config.get_similar_artists_depth()
+        weight = weight if weight is not None else Config.get_similar_artists_weight()
+        if depth <= 0 or weight <= 0 or not user_data:
+            return 0
+        
+        graph = self.similar_graph
+        fetched_before, hits_before = graph.fetched, graph.hits
+        fetch_similar = None
+        if fetch:
+            fetch_similar = lambda artist: self.lastfm_client.get_similar_artists(artist, Config.SIMILAR_ARTISTS_LIMIT)
+        
+        added = 0
+        for data in user_data.values():
+            seeds = data.artists[:Config.SIMILAR_ARTISTS_SEEDS]
+            has_playcounts = any(artist.playcount for artist in seeds)
+            # Without playcounts the chart position stands in, and similar artists stay unranked (after the user's own)
+            seed_scores = {artist.name: float(artist.playcount or 0) if has_playcounts else float(len(seeds) - rank)
+                           for rank, artist in enumerate(seeds)}
+            own = {artist.name.strip().lower() for artist in data.artists}
+            similar = graph.expand(seed_scores, depth, weight, fetch=fetch_similar, workers=Config.get_lastfm_workers())
+            
+            new_artists = [Artist(name=name, playcount=round(score) if has_playcounts else None)
+                           for name, score in similar.items() if name.strip().lower() not in own]
+            data.artists.extend(new_artists)
+            data.total_artists = len(data.artists)
+            added += len(new_artists)
+        
+        if graph.fetched > fetched_before:
+            graph.save()
+        log.info('similar.expanded', "🕸️  Similar artists: added {added} across {users} user(s) "
+                 "({fetched} graph entries fetched, {cached} cached)", added=added, users=len(user_data),
+                 fetched=graph.fetched - fetched_before, cached=graph.hits - hits_before, failed=graph.failed)
+        return added
+    
+    @staticmethod
+    def merge_listening_data(username: str, profiles: Dict[str, UserListeningData],
+                             weights: Dict[str, float]) -> UserListeningData:
+        """Merge several periods of a user's top artists, weighting each period's playcounts"""
+        merged: Dict[str, Artist] = {}
+        scores: Dict[str, float] = {}
+        for p, data in profiles.items():
+            for artist in data.artists:
+                key = artist.name.strip().lower()
+                if key not in merged:
+                    merged[key] = Artist(name=artist.name, mbid=artist.mbid, url=artist.url, image_url=artist.image_url)
+                elif not merged[key].mbid:
+                    merged[key].mbid = artist.mbid
+                scores[key] = scores.get(key, 0.0) + weights.get(p, 1.0) * (artist.playcount or 0)
+        
+        artists = sorted(merged.values(), key=lambda artist: scores[artist.name.strip().lower()], reverse=True)
+        for artist in artists:
+            artist.playcount = round(scores[artist.name.strip().lower()])
+        
+        return UserListeningData(
+            username=username,
+            artists=artists,
+            total_artists=len(artists),
+            period='+'.join(p for p in weights if p in profiles)
+        )
+    
     def get_atlanta_events(self, limit: int = 100) -> List[Event]:
         """Get events in Atlanta using Ticketmaster API (fallback method)"""
         try:
             events = self.ticketmaster_client.get_events_by_location(
-                city='Atlanta',
-                state='GA',
+                city=Config.ATLANTA_CITY,
+                state=Config.ATLANTA_STATE,
                 country='US',
                 classification='music',
                 size=limit
             )
-            print(f"✓ Found {len(events)} real events in Atlanta")
+            log.info('scrape.location_events', "✓ Found {events} real events in Atlanta", events=len(events))
             return events
         except Exception as e:
-            print(f"✗ Failed to load Atlanta events from Ticketmaster: {e}")
-            print("🔄 Falling back to mock events...")
+            log.warning('scrape.location_failed', "✗ Failed to load Atlanta events from Ticketmaster: {error}", error=e)
+            log.info('scrape.mock_fallback', "🔄 Falling back to mock events...")
             try:
                 events = get_mock_atlanta_events()
-                print(f"✓ Found {len(events)} mock events in Atlanta")
+                log.info('scrape.mock_events', "✓ Found {events} mock events in Atlanta", events=len(events))
                 return events
             except Exception as mock_e:
-                print(f"✗ Failed to load mock events: {mock_e}")
+                log.error('scrape.mock_failed', "✗ Failed to load mock events: {error}", error=mock_e)
                 return []
     
-    def get_events_for_artists_batch(self, artists: List[str]) -> List[Event]:
-        """Get events for a batch of artists with caching"""
+    def _resume_or_plan(self, signature: str, plan_fn) -> QueryPlan:
+        """Reuse an interrupted run's plan if its checkpoint matches, otherwise plan and checkpoint a new one"""
+        checkpoint = self.checkpoint
+        self.queried_artists = set()
+        self.failed_lookups = set()
+        if checkpoint.resume(signature) and checkpoint.plan is not None:
+            self.failed_lookups = checkpoint.failed_lookups
+            done = ', '.join(f"{phase}: {len(checkpoint.completed_batches(phase))}" for phase in checkpoint.data['phases'])
+            log.info('checkpoint.resume', "♻️  Resuming interrupted run (completed batches: {done}; "
+                     "{failed} failed lookups)", done=done or 'none', failed=len(self.failed_lookups))
+            return checkpoint.plan
+        
+        plan = plan_fn()
+        checkpoint.set_plan(plan)
+        return plan
+    
+    def _complete_batch(self, phase: str, batch_num: int, events: List[Event]):
+        """Persist what a finished batch fetched so a restarted run can skip it"""
+        self.artist_cache.save()
+        self.usage.save()
+        self.checkpoint.complete_batch(phase, batch_num, events, self.failed_lookups)
+    
+    def _fully_queried(self, artists: Iterable[str], plan: QueryPlan, providers: Iterable[str]) -> Set[str]:
+        """
+        Artists whose every provider lookup was planned and succeeded
+        
+        Only these can have their scheduled events cancelled by sync: an artist
+        skipped for quota or hit by a 429 or timeout has shows we just didn't see.
+        """
+        providers = list(providers)
+        return {artist for artist in artists if artist.lower() not in self.failed_lookups
+                and all(plan.allows(artist, provider) for provider in providers)}
+    
+    def plan_queries(self, user_data: Dict[str, UserListeningData], artists: List[str], providers: Dict[str, str]) -> QueryPlan:
+        """Prioritize artists and fit their provider lookups into today's remaining quota"""
+        prioritized = QueryScheduler(self.artist_cache, providers.values()).prioritize(user_data, artists)
+        plan = QueryBudgetPlanner(self.artist_cache, self.usage).plan(prioritized, providers)
+        log.info('scrape.plan', "📋 Query plan: {summary}", summary=plan.summary())
+        return plan
+    
+    def plan_run(self, usernames: List[str], period: str = None, regions: List[Region] = None,
+                 exclude_artists: List[str] = None) -> Optional[RunEstimate]:
+        """
+        Dry run: the request plan, cache coverage and wall time a scrape would have
+        
+        Loads Last.fm listening data and the local cache, quota and checkpoint state,
+        but makes no Ticketmaster, Bandsintown or Discord calls and writes no state.
+        Similar artists are expanded from the cached graph only.
+        With more than one region the nationwide multi-region scrape is planned.
+        """
+        user_data = self.get_user_artists(usernames, period)
+        if not user_data:
+            log.error('scrape.no_users', "❌ No user data loaded")
+            return None
+        self.expand_similar_artists(user_data, fetch=False)
+        all_artists = self._collect_artists(user_data, exclude_artists)
+        
+        regions = regions if regions is not None else Config.get_regions()
+        if len(regions) > 1:
+            providers = {'ticketmaster': 'ticketmaster'}
+            if self.bandsintown_client:
+                providers['bandsintown'] = 'bandsintown'
+            phases = {'nationwide': list(providers)}
+            signature = ScrapeCheckpoint.signature(f"regions:{','.join(region.name for region in regions)}", usernames,
+                                                   self.resolve_periods(period), exclude_artists)
+        else:
+            providers = {'ticketmaster': self.local_cache_provider('ticketmaster')}
+            if self.bandsintown_client:
+                providers['bandsintown'] = 'bandsintown'
+            phases = {provider: [provider] for provider in providers}
+            signature = ScrapeCheckpoint.signature('local', usernames, self.resolve_periods(period), exclude_artists)
+        
+        planner = QueryBudgetPlanner(self.artist_cache, self.usage)
+        checkpoint = ScrapeCheckpoint()
+        completed = {}
+        if checkpoint.resume(signature) and checkpoint.plan is not None:
+            log.info('checkpoint.would_resume', "♻️  An interrupted run's checkpoint would be resumed")
+            plan = checkpoint.plan
+            completed = {phase: checkpoint.completed_batches(phase) for phase in phases}
+        else:
+            prioritized = QueryScheduler(self.artist_cache, providers.values()).prioritize(user_data, all_artists)
+            plan = planner.plan(prioritized, providers)
+        
+        return planner.estimate(plan, phases, providers, batch_delay=self.batch_delay, completed=completed)
+    
+    def local_cache_provider(self, provider: str) -> str:
+        """Artist cache namespace for city-filtered lookups (nationwide lookups use the bare provider name)"""
+        return f"{provider}@{Config.ATLANTA_CITY},{Config.ATLANTA_STATE}"
+    
+    def get_events_for_artists_batch(self, artists: List[str], plan: QueryPlan = None) -> List[Event]:
+        """Get events for a batch of artists with caching (only the lookups the plan allows, if given)"""
         all_events = []
+        provider = self.local_cache_provider('ticketmaster')
         
         for artist in artists:
+            if plan and not plan.allows(artist, 'ticketmaster'):
+                continue
             try:
-                events = self.ticketmaster_client.search_events(
-                    keyword=artist,
-                    city='Atlanta',
-                    state='GA',
-                    country='US',
-                    classification='music',
-                    size=10
-                )
+                events = self.artist_cache.get(provider, artist)
+                if events is None:
+                    self.usage.record('ticketmaster')
+                    events = self._fetch_with_revalidation(provider, artist, lambda validators: (
+                        self.ticketmaster_client.search_events_conditional(
+                            keyword=artist,
+                            city=Config.ATLANTA_CITY,
+                            state=Config.ATLANTA_STATE,
+                            country='US',
+                            classification='music',
+                            size=10,
+                            validators=validators
+                        )
+                    ))
                 
                 if events:
                     all_events.extend(events)
-                    print(f"  ✓ {artist}: {len(events)} events")
+                    log.info('lookup.events', "  ✓ {artist}: {events} events", sampled=True, artist=artist, events=len(events))
                 else:
-                    print(f"  - {artist}: no events")
+                    log.info('lookup.empty', "  - {artist}: no events", sampled=True, artist=artist)
                     
             except Exception as e:
-                print(f"  ✗ {artist}: error - {e}")
+                self.failed_lookups.add(artist.lower())
+                log.warning('lookup.failed', "  ✗ {artist}: error - {error}", artist=artist, error=e)
         
         return all_events
 
+    def _fetch_with_revalidation(self, provider: str, artist: str, fetch) -> List[Event]:
+        """
+        Refetch a missing or stale cache entry, sending its stored validators
+        
+        fetch(validators) returns (events, validators) with events None on 304 Not Modified,
+        in which case the cached events are reused without downloading or parsing anything.
+        """
+        events, validators = fetch(self.artist_cache.validators(provider, artist))
+        if events is None:
+            return self.artist_cache.refresh(provider, artist, validators) or []
+        self.artist_cache.put(provider, artist, events, validators)
+        return events
+    
     def get_events_for_artists(self, artists: List[str], max_artists: int = 20) -> List[Event]:
         """Get events for specific artists (more efficient than location-based search)"""
         all_events = []
         searched_artists = 0
         
-        print(f"🔍 Searching for events for {min(len(artists), max_artists)} artists...")
+        log.info('scrape.search', "🔍 Searching for events for {artists} artists...", artists=min(len(artists), max_artists))
         
         for artist in artists[:max_artists]:
             try:
                 events = self.ticketmaster_client.search_events(
                     keyword=artist,
-                    city='Atlanta',
-                    state='GA',
+                    city=Config.ATLANTA_CITY,
+                    state=Config.ATLANTA_STATE,
                     country='US',
                     classification='music',
                     size=10  # smaller size per artist
@@ -101,9 +434,9 @@ class EventScraper:
                 
                 if events:
                     all_events.extend(events)
-                    print(f"  ✓ {artist}: {len(events)} events")
+                    log.info('lookup.events', "  ✓ {artist}: {events} events", sampled=True, artist=artist, events=len(events))
                 else:
-                    print(f"  - {artist}: no events")
+                    log.info('lookup.empty', "  - {artist}: no events", sampled=True, artist=artist)
                 
                 searched_artists += 1
                 
@@ -112,43 +445,45 @@ class EventScraper:
                 time.sleep(Config.ARTIST_SEARCH_DELAY)
                 
             except Exception as e:
-                print(f"  ✗ {artist}: error - {e}")
+                log.warning('lookup.failed', "  ✗ {artist}: error - {error}", artist=artist, error=e)
                 continue
         
-        # Remove duplicates based on event title and date
-        unique_events = {}
-        for event in all_events:
-            key = f"{event.title}_{event.date}"
-            if key not in unique_events:
-                unique_events[key] = event
-        
-        final_events = list(unique_events.values())
-        print(f"✓ Found {len(final_events)} unique events from {searched_artists} artists")
+        # Remove duplicates of the same show
+        final_events = self.deduplicator.dedupe(all_events)
+        log.info('scrape.search_done', "✓ Found {events} unique events from {artists} artists", events=len(final_events), artists=searched_artists)
         
         return final_events
     
-    def get_bandsintown_events_batch(self, artists: List[str]) -> List[Event]:
-        """Get events from Bandsintown for a batch of artists"""
+    def get_bandsintown_events_batch(self, artists: List[str], plan: QueryPlan = None) -> List[Event]:
+        """Get events from Bandsintown for a batch of artists (only the lookups the plan allows, if given)"""
         if not self.bandsintown_client:
             return []
         
         all_events = []
         
         for artist in artists:
+            if plan and not plan.allows(artist, 'bandsintown'):
+                continue
             try:
-                events = self.bandsintown_client.get_artist_events(
-                    artist_name=artist,
-                    location='Atlanta, GA'
-                )
+                # Tours are cached unfiltered, so they also serve the multi-region mode
+                tour = self.artist_cache.get('bandsintown', artist)
+                if tour is None:
+                    self.usage.record('bandsintown')
+                    tour = self._fetch_with_revalidation('bandsintown', artist, lambda validators: (
+                        self.bandsintown_client.fetch_artist_tour(artist, validators)
+                    ))
+                self.bandsintown_client.remember_tour(artist, tour)
+                events = self.bandsintown_client.filter_events(tour, location=Config.get_local_region().location)
                 
                 if events:
                     all_events.extend(events)
-                    print(f"  ✓ {artist}: {len(events)} events")
+                    log.info('lookup.events', "  ✓ {artist}: {events} events", sampled=True, artist=artist, events=len(events))
                 else:
-                    print(f"  - {artist}: no events")
+                    log.info('lookup.empty', "  - {artist}: no events", sampled=True, artist=artist)
                     
             except Exception as e:
-                print(f"  ✗ {artist}: error - {e}")
+                self.failed_lookups.add(artist.lower())
+                log.warning('lookup.failed', "  ✗ {artist}: error - {error}", artist=artist, error=e)
         
         return all_events
 
@@ -160,17 +495,17 @@ class EventScraper:
         all_events = []
         searched_artists = 0
         
-        print(f"🔍 Searching Bandsintown for events for {min(len(artists), max_artists)} artists...")
+        log.info('scrape.search', "🔍 Searching Bandsintown for events for {artists} artists...", provider='bandsintown', artists=min(len(artists), max_artists))
         
         for artist in artists[:max_artists]:
             try:
-                events = self.bandsintown_client.get_artist_events(artist, "Atlanta, GA")
+                events = self.bandsintown_client.get_artist_events(artist, Config.get_local_region().location)
                 
                 if events:
                     all_events.extend(events)
-                    print(f"  ✓ {artist}: {len(events)} events")
+                    log.info('lookup.events', "  ✓ {artist}: {events} events", sampled=True, artist=artist, events=len(events))
                 else:
-                    print(f"  - {artist}: no events")
+                    log.info('lookup.empty', "  - {artist}: no events", sampled=True, artist=artist)
                 
                 searched_artists += 1
                 
@@ -179,25 +514,19 @@ class EventScraper:
                 time.sleep(Config.ARTIST_SEARCH_DELAY)
                 
             except Exception as e:
-                print(f"  ✗ {artist}: error - {e}")
+                log.warning('lookup.failed', "  ✗ {artist}: error - {error}", artist=artist, error=e)
                 continue
         
-        # Remove duplicates based on event title and date
-        unique_events = {}
-        for event in all_events:
-            key = f"{event.title}_{event.date}"
-            if key not in unique_events:
-                unique_events[key] = event
-        
-        final_events = list(unique_events.values())
-        print(f"✓ Found {len(final_events)} unique events from Bandsintown")
+        # Remove duplicates of the same show
+        final_events = self.deduplicator.dedupe(all_events)
+        log.info('scrape.search_done', "✓ Found {events} unique events from Bandsintown", provider='bandsintown', events=len(final_events))
         
         return final_events
     
     
     def calculate_similarity(self, name1: str, name2: str) -> float:
         """Calculate similarity between two strings (0.0 to 1.0)"""
-        return SequenceMatcher(None, name1.lower(), name2.lower()).ratio()
+        return self.similarity.ratio(name1.lower(), name2.lower())
     
     def is_valid_match(self, event_artist: str, user_artist: str, similarity: float) -> bool:
         """Determine if a match is valid based on strict criteria"""
@@ -226,7 +555,7 @@ class EventScraper:
         
         # If cleaned names are very similar, it's likely a valid match
         if len(event_clean) >= 3 and len(user_clean) >= 3:
-            clean_similarity = SequenceMatcher(None, event_clean, user_clean).ratio()
+            clean_similarity = self.similarity.ratio(event_clean, user_clean)
             if clean_similarity >= 0.85:
                 return True
         
@@ -269,46 +598,148 @@ class EventScraper:
         
         return cleaned
     
-    def find_matching_events(self, user_data: Dict[str, UserListeningData], events: List[Event]) -> Dict[str, List[Tuple[Event, str, float]]]:
+    def find_matching_events(self, user_data: Dict[str, UserListeningData], events: List[Event],
+                             shared_identity: bool = False) -> Dict[str, List[Tuple[Event, str, float]]]:
         """
         Find events that match user's listening history
         
+        With shared_identity (several calls running in threads), the caller registers
+        the user artists beforehand and saves the identity tables afterwards.
+        
         Returns:
             Dict mapping username to list of (event, matched_artist, similarity_score) tuples
         """
-        matches = {}
+        if not shared_identity:
+            self.register_user_artists(user_data)
         
-        for username, data in user_data.items():
-            user_matches = []
-            user_artists = data.get_artist_names()
-            
-            for event in events:
-                for event_artist in event.artists:
-                    best_similarity = 0.0
-                    best_user_artist = ""
-                    
-                    # Find best match among user's artists
-                    for user_artist in user_artists:
-                        similarity = self.calculate_similarity(event_artist, user_artist)
-                        if similarity > best_similarity and self.is_valid_match(event_artist, user_artist, similarity):
-                            best_similarity = similarity
-                            best_user_artist = user_artist
-                    
-                    # If we found a valid match, add it
-                    if best_similarity >= self.similarity_threshold and best_user_artist:
-                        user_matches.append((event, best_user_artist, best_similarity))
-            
-            # Remove duplicates and sort by similarity
-            unique_matches = {}
-            for event, artist, similarity in user_matches:
-                key = f"{event.title}_{event.date}"
-                if key not in unique_matches or similarity > unique_matches[key][2]:
-                    unique_matches[key] = (event, artist, similarity)
+        raw_matches = {
+            username: self._match_user_events(data.artists, events)
+            for username, data in user_data.items()
+        }
+        return self._finalize_matches(user_data, events, raw_matches, save_identity=not shared_identity)
+    
+    def register_user_artists(self, user_data: Dict[str, UserListeningData]):
+        """Register every user artist (and its MBID) with the identity resolver"""
+        for data in user_data.values():
+            for artist in data.artists:
+                self.identity.register(artist.name, artist.mbid)
+    
+    def _match_user_events(self, user_artists: List[Artist], events: List[Event]) -> List[Tuple[int, str, str, float]]:
+        """
+        Score events against a single user's artists
+        
+        Event artists whose canonical identity is one of the user's artists match
+        exactly; only unknown names go through fuzzy scoring.
+        
+        Returns:
+            List of (event_index, event_artist, matched_artist, similarity_score) tuples in event order
+        """
+        user_matches = []
+        stats = Counter()
+        user_artist_names = [artist.name for artist in user_artists]
+        scorers = self.similarity.prepare([name.lower() for name in user_artist_names])
+        user_ids = {}
+        for artist in user_artists:
+            canonical = self.identity.resolve(artist.name, artist.mbid)
+            if canonical:
+                user_ids.setdefault(canonical, artist.name)
+        
+        for event_idx, event in enumerate(events):
+            for event_artist in event.artists:
+                canonical = self.identity.resolve(event_artist, event.artist_mbids.get(event_artist))
+                if canonical in user_ids:
+                    user_matches.append((event_idx, event_artist, user_ids[canonical], 1.0))
+                    continue
+                
+                # Find best match among user's artists
+                best_similarity, best_user_artist = self._best_fuzzy_match(event_artist, user_artist_names, scorers, stats)
+                
+                # If we found a valid match, add it
+                if best_similarity >= self.similarity_threshold and best_user_artist:
+                    user_matches.append((event_idx, event_artist, best_user_artist, best_similarity))
+        
+        self.add_match_stats(stats)
+        return user_matches
+    
+    def _best_fuzzy_match(self, event_artist: str, user_artist_names: List[str], scorers,
+                          stats: Counter = None) -> Tuple[float, str]:
+        """
+        Best valid fuzzy match for an event artist among a user's artists
+        
+        scorers is similarity.prepare() of the lowercased names. Scoring all of them
+        in one backend call gives the same pick as checking every pair with
+        calculate_similarity and is_valid_match; stats (match_stats by default) counts
+        pruned pairs.
+        """
+        counted = stats if stats is not None else Counter()
+        similarity, idx = self.similarity.best_match(
+            event_artist.lower(), scorers, self.similarity_threshold,
+            lambda idx, score: self.is_valid_match(event_artist, user_artist_names[idx], score),
+            counted
+        )
+        if stats is None:
+            self.add_match_stats(counted)
+        return similarity, user_artist_names[idx] if idx >= 0 else ""
+    
+    def add_match_stats(self, stats: Dict[str, int]):
+        """Merge pruning counts into match_stats (safe from concurrent matching threads)"""
+        with self._match_stats_lock:
+            self.match_stats.update(stats)
+    
+    def match_stats_summary(self) -> str:
+        """One-line summary of how many fuzzy pairs each pruning tier handled"""
+        stats = self.match_stats
+        return (f"{stats['scored']} fuzzy pairs scored, {stats['length_pruned']} pruned by length, "
+                f"{stats['quick_pruned']} by quick ratio, {stats['perfect_stop']} skipped after exact matches")
+    
+    def _finalize_matches(self, user_data: Dict[str, UserListeningData], events: List[Event],
+                          raw_matches: Dict[str, List[Tuple[int, str, str, float]]],
+                          save_identity: bool = True) -> Dict[str, List[Tuple[Event, str, float]]]:
+        """Learn aliases from confident fuzzy matches, then dedupe and sort each user's matches"""
+        user_mbids = {
+            artist.name: artist.mbid
+            for data in user_data.values() for artist in data.artists
+        }
+        
+        matches = {}
+        for username, user_matches in raw_matches.items():
+            for event_idx, event_artist, user_artist, similarity in user_matches:
+                if Config.ALIAS_LEARN_THRESHOLD <= similarity < 1.0:
+                    canonical = self.identity.register(user_artist, user_mbids.get(user_artist))
+                    self.identity.learn_alias(event_artist, canonical,
+                                              events[event_idx].artist_mbids.get(event_artist))
             
-            matches[username] = sorted(unique_matches.values(), key=lambda x: x[2], reverse=True)
+            matches[username] = self._dedupe_matches([
+                (events[event_idx], user_artist, similarity)
+                for event_idx, _, user_artist, similarity in user_matches
+            ])
+        
+        if save_identity:
+            self.identity.save()
         
+        # Only matched events are worth the image/description lookup
+        for user_matches in matches.values():
+            for event, _, _ in user_matches:
+                self.enrich_event(event)
         return matches
     
+    def enrich_event(self, event: Event) -> Event:
+        """Fill in display fields a provider deferred at parse time"""
+        if event.source == 'ticketmaster':
+            return self.ticketmaster_client.enrich_event(event)
+        return event
+    
+    def _dedupe_matches(self, user_matches: List[Tuple[Event, str, float]]) -> List[Tuple[Event, str, float]]:
+        """Remove duplicate matches (keeping the best score) and sort by similarity"""
+        clusters = self.deduplicator.cluster([event for event, _, _ in user_matches])
+        
+        unique_matches = {}
+        for cluster, (event, artist, similarity) in zip(clusters, user_matches):
+            if cluster not in unique_matches or similarity > unique_matches[cluster][2]:
+                unique_matches[cluster] = (event, artist, similarity)
+        
+        return sorted(unique_matches.values(), key=lambda x: x[2], reverse=True)
+    
     def match_events_with_users(self, events: List[Event], user_data: Dict[str, UserListeningData]) -> Dict[str, List[Tuple[Event, str, float]]]:
         """Match a list of events with user listening data"""
         matches = {}
@@ -340,126 +771,334 @@ class EventScraper:
         
         return matches
     
-    async def scrape_and_match(self, usernames: List[str], period: str = '1month', 
-                        use_optimized_search: bool = True, batch_callback=None, exclude_artists: List[str] = None) -> Dict[str, List[Tuple[Event, str, float]]]:
+    def _collect_artists(self, user_data: Dict[str, UserListeningData], exclude_artists: List[str] = None) -> List[str]:
+        """Collect all unique artists from all users (case variants count once, first spelling wins), minus any excluded ones"""
+        all_artists = {}
+        for data in user_data.values():
+            for name in data.get_artist_names():
+                all_artists.setdefault(name.lower(), name)
+        
+        # Optionally exclude artists that already have scheduled events
+        if exclude_artists:
+            exclude_set = {a.lower() for a in exclude_artists}
+            for key in exclude_set:
+                all_artists.pop(key, None)
+        return list(all_artists.values())
+    
+    def _finalize_events(self, all_events: List[Event]) -> List[Event]:
+        """Combine and deduplicate events across sources, keeping future events only"""
+        self.event_index, events = self.upcoming_events(all_events)
+        return events
+    
+    def upcoming_events(self, events: List[Event]) -> Tuple[TimeIndex, List[Event]]:
+        """Deduplicated events of the next 90 days (in their original order) and the start-time index of all of them"""
+        unique_events = self.deduplicator.dedupe(events)
+        
+        # Index by start time, then keep the next 90 days as one range scan
+        event_index = TimeIndex()
+        for position, event in enumerate(unique_events):
+            start_time = DateValidator.parse_event_date(event.date)
+            if start_time:
+                event_index.add(start_time, (position, event))
+        
+        now, cutoff = DateValidator.future_window(days_ahead=90)
+        return event_index, [event for _, event in sorted(event_index.between(now, cutoff), key=lambda item: item[0])]
+    
+    def get_artist_events_nationwide(self, artist: str, plan: QueryPlan = None) -> Tuple[List[Event], int]:
+        """
+        Get an artist's unfiltered events from every provider, using the shared cache
+        
+        Returns:
+            Tuple of (events, number of provider requests made)
+        """
+        events = []
+        requests_made = 0
+        
+        providers = [('ticketmaster', lambda validators: self.ticketmaster_client.search_events_conditional(
+            keyword=artist,
+            country='US',
+            classification='music',
+            size=Config.REGION_SEARCH_SIZE,
+            validators=validators
+        ))]
+        if self.bandsintown_client:
+            providers.append(('bandsintown', lambda validators: self.bandsintown_client.fetch_artist_tour(artist, validators)))
+        
+        for provider, fetch in providers:
+            if plan and not plan.allows(artist, provider):
+                continue
+            
+            cached = self.artist_cache.get(provider, artist)
+            if cached is not None:
+                events.extend(cached)
+                continue
+            
+            requests_made += 1
+            self.usage.record(provider)
+            try:
+                events.extend(self._fetch_with_revalidation(provider, artist, fetch))
+            except Exception as e:
+                self.failed_lookups.add(artist.lower())
+                log.warning('lookup.failed', "  ✗ {artist} ({provider}): error - {error}", artist=artist, provider=provider, error=e)
+        
+        return events, requests_made
+    
+    async def scrape_and_match_regions(self, usernames: List[str], regions: List[Region] = None,
+                                       period: str = None, exclude_artists: List[str] = None) -> Dict[str, Dict[str, List[Tuple[Event, str, float]]]]:
+        """
+        Multi-region mode: one lookup per artist serves every region
+        
+        Returns:
+            Dict mapping region name to that region's username -> matches dict
+        """
+        import asyncio
+        
+        regions = regions or Config.get_regions()
+        log.info('scrape.start', "🎵 Scraping data for users: {users} across {regions} region(s)", users=', '.join(usernames), regions=len(regions))
+        
+        user_data = self.get_user_artists(usernames, period)
+        if not user_data:
+            log.error('scrape.no_users', "❌ No user data loaded")
+            return {}
+        self.expand_similar_artists(user_data)
+        
+        all_artists = self._collect_artists(user_data, exclude_artists)
+        log.info('scrape.artists', "🎯 Found {artists} unique artists across all users", artists=len(all_artists))
+        
+        providers = {'ticketmaster': 'ticketmaster'}
+        if self.bandsintown_client:
+            providers['bandsintown'] = 'bandsintown'
+        signature = ScrapeCheckpoint.signature(f"regions:{','.join(region.name for region in regions)}", usernames,
+                                               self.resolve_periods(period), exclude_artists)
+        plan = self._resume_or_plan(signature, lambda: self.plan_queries(user_data, all_artists, providers))
+        all_artists = plan.artists()
+        
+        all_events = self.checkpoint.events('nationwide')
+        batch_size = 10
+        total_batches = (len(all_artists) + batch_size - 1) // batch_size
+        
+        done = self.checkpoint.completed_batches('nationwide')
+        for batch_num in range(total_batches):
+            if batch_num in done:
+                continue
+            batch_artists = all_artists[batch_num * batch_size:(batch_num + 1) * batch_size]
+            log.info('batch.start', "🔍 Processing batch {batch}/{total} ({artists} artists)...", batch=batch_num + 1, total=total_batches, artists=len(batch_artists))
+            
+            batch_requests = 0
+            batch_events = []
+            for artist in batch_artists:
+                artist_events, requests_made = self.get_artist_events_nationwide(artist, plan)
+                batch_requests += requests_made
+                batch_events.extend(artist_events)
+            all_events.extend(batch_events)
+            self._complete_batch('nationwide', batch_num, batch_events)
+            
+            # Only rate-limit batches that actually hit the providers
+            if batch_requests and batch_num < total_batches - 1:
+                log.info('batch.delay', "⏳ Waiting {seconds} seconds before next batch...", seconds=self.batch_delay)
+                await asyncio.sleep(self.batch_delay)
+        
+        self.artist_cache.save()
+        self.usage.save()
+        self.queried_artists = self._fully_queried(all_artists, plan, providers)
+        log.info('scrape.cache', "✓ Artist cache: {hits} hits, {misses} misses, {revalidated} revalidated, "
+                 "{coalesced} coalesced requests", hits=self.artist_cache.hits, misses=self.artist_cache.misses,
+                 revalidated=self.artist_cache.revalidated, coalesced=self.coalesced_requests())
+        
+        events = self._finalize_events(all_events)
+        log.info('scrape.combined', "✓ Combined: {events} unique future events nationwide", events=len(events))
+        
+        # Filter locally per region, then match every region concurrently against one shared identity table
+        region_events = {region.name: [event for event in events if region.contains(event)] for region in regions}
+        matcher = ParallelMatcher(self)
+        self.register_user_artists(user_data)
+        results = await asyncio.gather(*(
+            asyncio.to_thread(matcher.find_matching_events, user_data, region_events[region.name], shared_identity=True)
+            for region in regions
+        ))
+        self.identity.save()
+        
+        log.info('match.stats', "⚡ {summary}", summary=self.match_stats_summary(), **self.match_stats)
+        region_matches = {}
+        for region, matches in zip(regions, results):
+            region_matches[region.name] = matches
+            total_matches = sum(len(user_matches) for user_matches in matches.values())
+            log.info('match.region', "  {region}: {events} events, {matches} matches", region=region.name, events=len(region_events[region.name]), matches=total_matches)
+        
+        self.checkpoint.clear()
+        return region_matches
+    
+    async def _run_batch_pipeline(self, all_artists: List[str], batch_size: int, plan: QueryPlan,
+                                  user_data: Dict[str, UserListeningData], batch_callback=None,
+                                  publish_callback=None) -> List[Event]:
+        """
+        Fetch ticketmaster batches through a fetch -> match -> publish pipeline
+        
+        Fetching the next batch overlaps matching and publishing the previous ones,
+        and the bounded queues between stages keep fetching from running far ahead.
+        With publish_callback(matches, batch_num, total_batches) every batch is matched
+        and published; the older batch_callback(events, batch_num, total_batches) gets
+        the raw events instead.
+        
+        Returns:
+            Events from every batch (checkpointed ones included), in batch order
+        """
+        import asyncio
+        
+        total_batches = (len(all_artists) + batch_size - 1) // batch_size
+        done = self.checkpoint.completed_batches('ticketmaster')
+        batches = [(batch_num, all_artists[batch_num * batch_size:(batch_num + 1) * batch_size])
+                   for batch_num in range(total_batches) if batch_num not in done]
+        publishing = publish_callback or batch_callback
+        rate_limited = False
+        
+        async def fetch(batch):
+            nonlocal rate_limited
+            batch_num, batch_artists = batch
+            # Pause between batches that hit the provider (not after cache-only ones)
+            if rate_limited:
+                log.info('batch.delay', "⏳ Waiting {seconds} seconds before next batch...", seconds=self.batch_delay)
+                await asyncio.sleep(self.batch_delay)
+            
+            log.info('batch.start', "🔍 Processing batch {batch}/{total} ({artists} artists)...", batch=batch_num + 1, total=total_batches, artists=len(batch_artists))
+            requests_before = self.usage.used('ticketmaster')
+            batch_events = await asyncio.to_thread(self.get_events_for_artists_batch, batch_artists, plan)
+            rate_limited = self.usage.used('ticketmaster') > requests_before
+            log.info('batch.fetched', "✓ Batch {batch} complete: {events} events found", batch=batch_num + 1, events=len(batch_events))
+            
+            self.artist_cache.save()
+            self.usage.save()
+            if not publishing:
+                self.checkpoint.complete_batch('ticketmaster', batch_num, batch_events, failed=self.failed_lookups)
+            return batch_num, batch_events, None
+        
+        def match(batch):
+            # The same matcher as the final results, so a batch publishes what the sync will keep
+            batch_num, batch_events, _ = batch
+            if not batch_events:
+                return batch_num, batch_events, {}
+            _, upcoming = self.upcoming_events(batch_events)
+            return batch_num, batch_events, self.find_matching_events(user_data, upcoming, shared_identity=True)
+        
+        async def publish(batch):
+            batch_num, batch_events, matches = batch
+            try:
+                if publish_callback and any(matches.values()):
+                    log.info('batch.publish', "🔄 Publishing batch {batch} matches...", batch=batch_num + 1)
+                    await publish_callback(matches, batch_num + 1, total_batches)
+                elif batch_callback and not publish_callback and batch_events:
+                    log.info('batch.callback', "🔄 Calling batch callback for {events} events...", batch=batch_num + 1, events=len(batch_events))
+                    await batch_callback(batch_events, batch_num + 1, total_batches)
+            except Exception as e:
+                log.error('batch.failed', "❌ Error processing batch {batch}: {error}", batch=batch_num + 1, error=e)
+            self.checkpoint.complete_batch('ticketmaster', batch_num, batch_events, self.failed_lookups)
+            return batch_num, batch_events, matches
+        
+        workers = Config.get_pipeline_workers()
+        stages = [Stage('fetch', fetch, workers['fetch'])]
+        if publish_callback:
+            stages.append(Stage('match', match, workers['match']))
+        if publishing:
+            stages.append(Stage('publish', publish, workers['publish']))
+        pipeline = Pipeline(stages, Config.get_pipeline_queue_size())
+        if publish_callback:
+            self.register_user_artists(user_data)
+        await pipeline.run(batches)
+        if publish_callback:
+            self.identity.save()
+        self.pipeline_stats = [stage.stats for stage in stages]
+        log.info('pipeline.stats', "🚰 Pipeline: {summary}", summary=pipeline.summary(),
+                 stages=[asdict(stats) for stats in self.pipeline_stats])
+        
+        # Events in batch order regardless of which batch finished first
+        return self.checkpoint.events('ticketmaster')
+    
+    async def scrape_and_match(self, usernames: List[str], period: str = None, 
+                        use_optimized_search: bool = True, batch_callback=None, exclude_artists: List[str] = None,
+                        publish_callback=None) -> Dict[str, List[Tuple[Event, str, float]]]:
         """Main method: scrape events and match with user data"""
-        print(f"🎵 Scraping data for users: {', '.join(usernames)}")
+        log.info('scrape.start', "🎵 Scraping data for users: {users}", users=', '.join(usernames))
         
         # Get user listening data
         user_data = self.get_user_artists(usernames, period)
         
         if not user_data:
-            print("❌ No user data loaded")
+            log.error('scrape.no_users', "❌ No user data loaded")
             return {}
+        self.expand_similar_artists(user_data)
         
         # Get events from all sources
         if use_optimized_search:
-            # Collect all unique artists from all users
-            all_artists = set()
-            for data in user_data.values():
-                all_artists.update(data.get_artist_names())
+            all_artists = self._collect_artists(user_data, exclude_artists)
+            log.info('scrape.artists', "🎯 Found {artists} unique artists across all users", artists=len(all_artists))
             
-            # Optionally exclude artists that already have scheduled events
-            if exclude_artists:
-                exclude_set = {a.lower() for a in exclude_artists}
-                filtered = []
-                for a in all_artists:
-                    if a.lower() not in exclude_set:
-                        filtered.append(a)
-                all_artists = filtered
-            all_artists = list(all_artists)
-            print(f"🎯 Found {len(all_artists)} unique artists across all users")
+            # Most valuable lookups first, within the providers' daily quotas
+            providers = {'ticketmaster': self.local_cache_provider('ticketmaster')}
+            if self.bandsintown_client:
+                providers['bandsintown'] = 'bandsintown'
+            signature = ScrapeCheckpoint.signature('local', usernames, self.resolve_periods(period), exclude_artists)
+            plan = self._resume_or_plan(signature, lambda: self.plan_queries(user_data, all_artists, providers))
+            all_artists = plan.artists()
             
-            # Get events from all sources using batched approach
-            all_events = []
-            
-            # Process artists in batches of 10 with 2-minute delays
+            # Process artists in batches of 10 with 2-minute delays, skipping batches a checkpoint already has
             batch_size = 10
             total_batches = (len(all_artists) + batch_size - 1) // batch_size
+            all_events = await self._run_batch_pipeline(all_artists, batch_size, plan, user_data,
+                                                        batch_callback, publish_callback)
             
-            for batch_num in range(total_batches):
-                start_idx = batch_num * batch_size
-                end_idx = min(start_idx + batch_size, len(all_artists))
-                batch_artists = all_artists[start_idx:end_idx]
-                
-                print(f"🔍 Processing batch {batch_num + 1}/{total_batches} ({len(batch_artists)} artists)...")
-                
-                # Get events for this batch
-                batch_events = self.get_events_for_artists_batch(batch_artists)
-                all_events.extend(batch_events)
-                
-                print(f"✓ Batch {batch_num + 1} complete: {len(batch_events)} events found")
-                
-                # Process batch results if callback provided
-                if batch_callback and batch_events:
-                    try:
-                        print(f"🔄 Calling batch callback for {len(batch_events)} events...")
-                        await batch_callback(batch_events, batch_num + 1, total_batches)
-                        print(f"✅ Batch callback completed")
-                    except Exception as e:
-                        print(f"❌ Error processing batch {batch_num + 1}: {e}")
-                
-                # Add delay between batches (except for the last one)
-                if batch_num < total_batches - 1:
-                    print(f"⏳ Waiting 120 seconds before next batch...")
-                    import asyncio
-                    await asyncio.sleep(120)
-            
-            print(f"✓ Found {len(all_events)} total events from all batches")
+            log.info('scrape.batches_done', "✓ Found {events} total events from all batches", events=len(all_events))
             
             # Bandsintown events (process in same batches)
-            bandsintown_events = []
+            bandsintown_events = self.checkpoint.events('bandsintown')
+            done = self.checkpoint.completed_batches('bandsintown')
             for batch_num in range(total_batches):
+                if batch_num in done:
+                    continue
                 start_idx = batch_num * batch_size
                 end_idx = min(start_idx + batch_size, len(all_artists))
                 batch_artists = all_artists[start_idx:end_idx]
                 
-                batch_bandsintown = self.get_bandsintown_events_batch(batch_artists)
+                requests_before = self.usage.used('bandsintown')
+                batch_bandsintown = self.get_bandsintown_events_batch(batch_artists, plan)
                 bandsintown_events.extend(batch_bandsintown)
+                self._complete_batch('bandsintown', batch_num, batch_bandsintown)
                 
-                # Add delay between batches (except for the last one)
-                if batch_num < total_batches - 1:
-                    print(f"⏳ Waiting 120 seconds before next bandsintown batch...")
+                # Add delay between batches (except for the last one, or when served from cache)
+                if self.usage.used('bandsintown') > requests_before and batch_num < total_batches - 1:
+                    log.info('batch.delay', "⏳ Waiting {seconds} seconds before next bandsintown batch...", provider='bandsintown', seconds=self.batch_delay)
                     import asyncio
-                    await asyncio.sleep(120)
+                    await asyncio.sleep(self.batch_delay)
             
             all_events.extend(bandsintown_events)
-            print(f"✓ Bandsintown: {len(bandsintown_events)} events")
-            
-            
-            # Combine and deduplicate events
-            unique_events = {}
-            for event in all_events:
-                key = f"{event.title}_{event.date}_{event.venue}"
-                if key not in unique_events:
-                    unique_events[key] = event
+            log.info('scrape.provider_events', "✓ Bandsintown: {events} events", provider='bandsintown', events=len(bandsintown_events))
+            self.artist_cache.save()
+            self.usage.save()
+            self.queried_artists = self._fully_queried(all_artists, plan, providers)
             
-            events = list(unique_events.values())
-            
-            # Filter for future events only
-            future_events = []
-            for event in events:
-                if DateValidator.is_future_event(event.date, days_ahead=90):
-                    future_events.append(event)
             
-            events = future_events
-            print(f"✓ Combined: {len(events)} unique future events from all sources")
+            events = self._finalize_events(all_events)
+            log.info('scrape.combined', "✓ Combined: {events} unique future events from all sources", events=len(events))
+            log.info('scrape.cache', "✓ Revalidated {revalidated} unchanged lookups, coalesced {coalesced} duplicate "
+                     "in-flight requests", revalidated=self.artist_cache.revalidated, coalesced=self.coalesced_requests())
         else:
             # Fallback to location-based search
             events = self.get_atlanta_events()
         
         if not events:
-            print("❌ No events found")
+            log.error('scrape.no_events', "❌ No events found")
+            self.checkpoint.clear()
             return {}
         
-        # Find matches
-        matches = self.find_matching_events(user_data, events)
+        # Find matches (sharded across processes when configured)
+        matches = ParallelMatcher(self).find_matching_events(user_data, events)
         
         # Print summary
         total_matches = sum(len(user_matches) for user_matches in matches.values())
-        print(f"🎯 Found {total_matches} total matches across all users")
+        log.info('match.total', "🎯 Found {matches} total matches across all users", matches=total_matches)
+        log.info('match.stats', "⚡ {summary}", summary=self.match_stats_summary(), **self.match_stats)
         
         for username, user_matches in matches.items():
-            print(f"  {username}: {len(user_matches)} matches")
+            log.info('match.user', "  {username}: {matches} matches", username=username, matches=len(user_matches))
         
+        self.checkpoint.clear()
         return matches
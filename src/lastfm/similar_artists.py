@@ -0,0 +1,117 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from .models import Artist
+from ..utils.config import Config
+from ..utils.state import state_path, load_json, save_json
+
+
+class SimilarArtistGraph:
+    """Persistent cache of Last.fm artist.getSimilar edges, refreshed per artist after a TTL.
+    
+    Expanding a user's profile walks the cached edges; only seeds whose entry is
+    missing or expired cost a Last.fm call, so a warm graph widens the query set
+    without extra requests. A failed refresh keeps using the stale edges.
+    """
+    
+    def __init__(self, path: str = None, ttl_hours: float = None):
+        self.path = path or state_path('similar_artists.json')
+        self.ttl_seconds = (ttl_hours if ttl_hours is not None else Config.SIMILAR_ARTISTS_TTL_HOURS) * 3600
+        self.entries: Dict[str, Dict] = load_json(self.path, {})
+        self.hits = 0
+        self.fetched = 0
+        self.failed = 0
+    
+    @staticmethod
+    def _key(artist: str) -> str:
+        return artist.strip().lower()
+    
+    def is_fresh(self, artist: str) -> bool:
+        entry = self.entries.get(self._key(artist))
+        return entry is not None and time.time() - entry['fetched_at'] < self.ttl_seconds
+    
+    def neighbours(self, artist: str) -> List[Tuple[str, float]]:
+        """Cached (name, match) edges of an artist, fresh or stale, best match first"""
+        entry = self.entries.get(self._key(artist))
+        return [(name, match) for name, match in entry['similar']] if entry else []
+    
+    def put(self, artist: str, similar: List[Tuple[str, float]]):
+        self.entries[self._key(artist)] = {
+            'fetched_at': time.time(),
+            'similar': sorted(([name, match] for name, match in similar), key=lambda edge: -edge[1])
+        }
+    
+    def refresh(self, artists: Iterable[str], fetch: Callable[[str], List[Tuple[Artist, float]]], workers: int = 1) -> int:
+        """Fetch edges for artists without a fresh entry, concurrently; returns how many were fetched"""
+        stale = []
+        for artist in dict.fromkeys(artists):
+            if self.is_fresh(artist):
+                self.hits += 1
+            else:
+                stale.append(artist)
+        if not stale:
+            return 0
+        
+        def load(artist: str) -> Optional[List[Tuple[Artist, float]]]:
+            try:
+                return fetch(artist)
+            except Exception:
+                return None
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(stale)))) as pool:
+            results = list(pool.map(load, stale))
+        for artist, similar in zip(stale, results):
+            if similar is None:
+                self.failed += 1
+                continue
+            self.put(artist, [(similar_artist.name, match) for similar_artist, match in similar])
+            self.fetched += 1
+        return len(stale)
+    
+    def expand(self, seeds: Dict[str, float], depth: int, weight: float, limit: int = None, min_match: float = None,
+               fetch: Callable[[str], List[Tuple[Artist, float]]] = None, workers: int = 1) -> Dict[str, float]:
+        """
+        Artists reachable from the seeds within depth hops, scored for the query set
+        
+        seeds maps artist name -> score (e.g. playcount). Each hop passes on
+        score * weight * match, and an artist reached from several seeds sums
+        them. Seeds themselves are never returned. Without fetch only cached
+        edges are walked (no Last.fm calls).
+        """
+        limit = limit if limit is not None else Config.SIMILAR_ARTISTS_LIMIT
+        min_match = min_match if min_match is not None else Config.SIMILAR_ARTISTS_MIN_MATCH
+        known = {self._key(artist) for artist in seeds}
+        names: Dict[str, str] = {}
+        scores: Dict[str, float] = {}
+        frontier = dict(seeds)
+        
+        for _ in range(depth):
+            if not frontier:
+                break
+            if fetch:
+                self.refresh(frontier, fetch, workers)
+            
+            reached: Dict[str, float] = {}
+            for artist, score in frontier.items():
+                for name, match in self.neighbours(artist)[:limit]:
+                    key = self._key(name)
+                    if match < min_match or key in known:
+                        continue
+                    names.setdefault(key, name)
+                    reached[key] = reached.get(key, 0.0) + score * weight * match
+            
+            for key, score in reached.items():
+                scores[key] = scores.get(key, 0.0) + score
+            known.update(reached)
+            frontier = {names[key]: score for key, score in reached.items()}
+        
+        return {names[key]: score for key, score in sorted(scores.items(), key=lambda item: -item[1])}
+    
+    def prune(self):
+        """Drop entries that are long past their TTL"""
+        cutoff = time.time() - self.ttl_seconds * 4
+        self.entries = {key: entry for key, entry in self.entries.items() if entry['fetched_at'] >= cutoff}
+    
+    def save(self):
+        self.prune()
+        save_json(self.path, self.entries)
@@ -0,0 +1,155 @@
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, List, Tuple
+from ..utils.config import Config
+from ..utils.log import get_logger
+
+
+log = get_logger('similarity')
+
+
+class SimilarityBackend:
+    """String similarity scoring in [0, 1], shared by artist matching, dedup and the bot.
+    
+    prepare() builds whatever per-choice state a backend can reuse across
+    queries; best_match() scores one query against all prepared choices.
+    """
+    
+    name = 'base'
+    
+    def ratio(self, a: str, b: str) -> float:
+        raise NotImplementedError
+    
+    def prepare(self, choices: List[str]) -> Any:
+        return list(choices)
+    
+    def best_match(self, query: str, prepared: Any, threshold: float,
+                   accept: Callable[[int, float], bool], stats: Counter = None) -> Tuple[float, int]:
+        """
+        Find the first highest-scoring choice that clears threshold and accept(index, score)
+        
+        Returns:
+            Tuple of (score, choice index), or (0.0, -1) if nothing qualifies
+        """
+        raise NotImplementedError
+
+
+class DifflibBackend(SimilarityBackend):
+    """Pure-Python difflib.SequenceMatcher backend (the reference ratio)"""
+    
+    name = 'difflib'
+    
+    def ratio(self, a: str, b: str) -> float:
+        return SequenceMatcher(None, a, b).ratio()
+    
+    def prepare(self, choices: List[str]) -> List[SequenceMatcher]:
+        # One matcher per choice keeps its lookup tables across every query
+        return [SequenceMatcher(None, '', choice) for choice in choices]
+    
+    def best_match(self, query: str, prepared: List[SequenceMatcher], threshold: float,
+                   accept: Callable[[int, float], bool], stats: Counter = None) -> Tuple[float, int]:
+        """
+        Same result as scoring every pair with ratio(query, choice)
+        
+        A choice can only win if it beats the current best and clears the threshold,
+        so choices whose length bound (real_quick_ratio) or character-multiset bound
+        (quick_ratio) can't do that are skipped before the full ratio, and scanning
+        stops once a perfect match is found. stats counts each tier.
+        """
+        stats = stats if stats is not None else Counter()
+        best_score, best_idx = 0.0, -1
+        
+        for idx, matcher in enumerate(prepared):
+            if best_score >= 1.0:
+                stats['perfect_stop'] += len(prepared) - idx
+                break
+            
+            matcher.set_seq1(query)
+            bound = matcher.real_quick_ratio()
+            if bound < threshold or bound <= best_score:
+                stats['length_pruned'] += 1
+                continue
+            bound = matcher.quick_ratio()
+            if bound < threshold or bound <= best_score:
+                stats['quick_pruned'] += 1
+                continue
+            
+            stats['scored'] += 1
+            score = matcher.ratio()
+            if score > best_score and accept(idx, score):
+                best_score, best_idx = score, idx
+        
+        return best_score, best_idx
+
+
+class RapidFuzzBackend(SimilarityBackend):
+    """Compiled rapidfuzz backend; scores a query against every choice in one cdist call.
+    
+    rapidfuzz's ratio is the normalized Indel similarity, which is close to but
+    not always equal to difflib's, so match sets can differ slightly at the threshold.
+    """
+    
+    name = 'rapidfuzz'
+    
+    def __init__(self):
+        from rapidfuzz import fuzz, process
+        self._fuzz = fuzz
+        self._process = process
+    
+    def ratio(self, a: str, b: str) -> float:
+        return self._fuzz.ratio(a, b) / 100.0
+    
+    def best_match(self, query: str, prepared: List[str], threshold: float,
+                   accept: Callable[[int, float], bool], stats: Counter = None) -> Tuple[float, int]:
+        stats = stats if stats is not None else Counter()
+        if not prepared:
+            return 0.0, -1
+        
+        # Scores under the cutoff come back as 0
+        row = self._process.cdist([query], prepared, scorer=self._fuzz.ratio, score_cutoff=threshold * 100)[0]
+        stats['scored'] += len(prepared)
+        
+        best_score, best_idx = 0.0, -1
+        for idx, score in enumerate(row):
+            score = float(score) / 100.0
+            if score and score > best_score and accept(idx, score):
+                best_score, best_idx = score, idx
+                if best_score >= 1.0:
+                    break
+        return best_score, best_idx
+
+
+BACKENDS = {
+    DifflibBackend.name: DifflibBackend,
+    RapidFuzzBackend.name: RapidFuzzBackend,
+}
+_instances: Dict[str, SimilarityBackend] = {}
+
+
+def get_backend(name: str = None) -> SimilarityBackend:
+    """
+    Get a similarity backend by name (default: GUTTERBOT_SIMILARITY_BACKEND or difflib)
+    
+    'auto' picks rapidfuzz when it is installed. An optional backend that can't be
+    imported falls back to difflib with a warning.
+    """
+    name = (name or Config.get_similarity_backend()).lower()
+    if name == 'auto':
+        try:
+            return _load(RapidFuzzBackend.name)
+        except ImportError:
+            return _load(DifflibBackend.name)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown similarity backend: {name}")
+    
+    try:
+        return _load(name)
+    except ImportError:
+        log.warning('similarity.fallback', "⚠️  Similarity backend '{backend}' is not installed, falling back to difflib", backend=name)
+        return _load(DifflibBackend.name)
+
+
+def _load(name: str) -> SimilarityBackend:
+    if name not in _instances:
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]
@@ -1,33 +1,68 @@
 import requests
 import time
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from .models import Event
 from ..utils.config import Config
+from ..utils.singleflight import SingleFlight
+from ..utils.http import conditional_headers, response_validators
+from ..utils.log import get_logger
+
+
+log = get_logger('ticketmaster')
 
 
 class TicketmasterClient:
     """Client for interacting with the Ticketmaster Discovery API"""
     
+    # Payload fields only needed for display, kept on Event.raw until an event is matched
+    ENRICHMENT_FIELDS = ('images', 'info')
+    
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = 'https://app.ticketmaster.com/discovery/v2'
         self.session = requests.Session()
+        self.single_flight = SingleFlight()
     
     def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Make a request to the Ticketmaster API"""
+        """Make a request to the Ticketmaster API, coalescing identical in-flight requests"""
+        key = SingleFlight.make_key(endpoint, params, ignore=('apikey',))
         params['apikey'] = self.api_key
+        return self.single_flight.do(key, lambda: self._send_request(endpoint, params))
+    
+    def _make_conditional_request(self, endpoint: str, params: Dict[str, Any],
+                                  validators: Dict[str, str] = None) -> Tuple[Optional[Dict[str, Any]], Dict[str, str]]:
+        """
+        Revalidate a cached payload with its stored validators
         
+        Returns:
+            Tuple of (data, validators); data is None when the server answered 304 Not Modified
+        """
+        key = ('conditional', SingleFlight.make_key(endpoint, params, ignore=('apikey',)),
+               tuple(sorted((validators or {}).items())))
+        params['apikey'] = self.api_key
+        return self.single_flight.do(key, lambda: self._send_conditional_request(endpoint, params, validators))
+    
+    def _send_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self._send_conditional_request(endpoint, params)[0]
+    
+    def _send_conditional_request(self, endpoint: str, params: Dict[str, Any],
+                                  validators: Dict[str, str] = None) -> Tuple[Optional[Dict[str, Any]], Dict[str, str]]:
         url = f"{self.base_url}/{endpoint}"
         
         try:
-            response = self.session.get(url, params=params)
+            started = time.perf_counter()
+            response = self.session.get(url, params=params, headers=conditional_headers(validators))
+            log.debug('http.request', "  → {provider} {endpoint}: {status} in {seconds:.2f}s", provider='ticketmaster',
+                      endpoint=endpoint, status=response.status_code, seconds=time.perf_counter() - started)
+            if response.status_code == 304:
+                return None, response_validators(response) or validators
             response.raise_for_status()
             data = response.json()
             
             if 'errors' in data:
                 raise Exception(f"Ticketmaster API error: {data['errors']}")
             
-            return data
+            return data, response_validators(response)
         except requests.exceptions.RequestException as e:
             raise Exception(f"Request failed: {e}")
     
@@ -47,90 +82,37 @@ class TicketmasterClient:
         
         data = self._make_request('events.json', params)
         events_data = data.get('_embedded', {}).get('events', [])
-        
-        events = []
-        for event_data in events_data:
-            # Parse date
-            event_date = None
-            if 'dates' in event_data and 'start' in event_data['dates']:
-                start_date = event_data['dates']['start']
-                if 'dateTime' in start_date:
-                    # Parse ISO 8601 datetime
-                    try:
-                        event_date = start_date['dateTime']
-                    except ValueError:
-                        pass
-                elif 'localDate' in start_date:
-                    # Fallback to local date
-                    event_date = start_date['localDate']
-            
-            # Extract venue info
-            venue_name = 'Unknown Venue'
-            venue_city = city
-            venue_country = country
-            
-            if 'venues' in event_data.get('_embedded', {}):
-                venues = event_data['_embedded']['venues']
-                if venues:
-                    venue = venues[0]
-                    venue_name = venue.get('name', 'Unknown Venue')
-                    venue_city = venue.get('city', {}).get('name', city)
-                    venue_country = venue.get('country', {}).get('name', country)
-            elif 'venue' in event_data:
-                venue = event_data['venue']
-                venue_name = venue.get('name', 'Unknown Venue')
-                venue_city = venue.get('city', {}).get('name', city)
-                venue_country = venue.get('country', {}).get('name', country)
-            
-            # Extract artists/attractions
-            artists = []
-            if 'attractions' in event_data.get('_embedded', {}):
-                attractions = event_data['_embedded']['attractions']
-                artists = [attraction.get('name', '') for attraction in attractions if attraction.get('name')]
-            elif 'attractions' in event_data:
-                attractions = event_data['attractions']
-                artists = [attraction.get('name', '') for attraction in attractions if attraction.get('name')]
-            
-            # Get event name
-            event_name = event_data.get('name', 'Unknown Event')
-            
-            # Get event URL
-            event_url = None
-            if 'url' in event_data:
-                event_url = event_data['url']
-            
-            # Get event description
-            description = None
-            if 'info' in event_data:
-                description = event_data['info']
-            
-            # Get event image
-            image_url = None
-            if 'images' in event_data and event_data['images']:
-                # Get the largest image
-                images = sorted(event_data['images'], key=lambda x: x.get('width', 0), reverse=True)
-                if images:
-                    image_url = images[0].get('url')
-            
-            event = Event(
-                title=event_name,
-                venue=venue_name,
-                city=venue_city,
-                country=venue_country,
-                date=event_date,
-                url=event_url,
-                description=description,
-                image_url=image_url,
-                artists=artists
-            )
-            events.append(event)
-        
-        return events
+        return self._convert_events_data(events_data, city, state, country)
     
     def search_events(self, keyword: str, city: str = None, state: str = None, 
                      country: str = 'US', classification: str = 'music', 
                      size: int = 50) -> List[Event]:
         """Search for events by keyword"""
+        params = self._search_params(keyword, city, state, country, classification, size)
+        data = self._make_request('events.json', params)
+        events_data = data.get('_embedded', {}).get('events', [])
+        
+        # Convert to Event objects (reuse the same logic as get_events_by_location)
+        return self._convert_events_data(events_data)
+    
+    def search_events_conditional(self, keyword: str, city: str = None, state: str = None,
+                                  country: str = 'US', classification: str = 'music', size: int = 50,
+                                  validators: Dict[str, str] = None) -> Tuple[Optional[List[Event]], Dict[str, str]]:
+        """
+        Search for events by keyword, revalidating a cached result
+        
+        Returns:
+            Tuple of (events, validators); events is None if the cached result is still current
+        """
+        params = self._search_params(keyword, city, state, country, classification, size)
+        data, validators = self._make_conditional_request('events.json', params, validators)
+        if data is None:
+            return None, validators
+        return self._convert_events_data(data.get('_embedded', {}).get('events', [])), validators
+    
+    @staticmethod
+    def _search_params(keyword: str, city: str, state: str, country: str,
+                       classification: str, size: int) -> Dict[str, Any]:
         params = {
             'keyword': keyword,
             'countryCode': country,
@@ -143,55 +125,73 @@ class TicketmasterClient:
             params['city'] = city
         if state:
             params['stateCode'] = state
-        
-        data = self._make_request('events.json', params)
-        events_data = data.get('_embedded', {}).get('events', [])
-        
-        # Convert to Event objects (reuse the same logic as get_events_by_location)
-        return self._convert_events_data(events_data)
+        return params
     
-    def _convert_events_data(self, events_data: List[Dict[str, Any]]) -> List[Event]:
-        """Convert raw events data to Event objects"""
+    def _convert_events_data(self, events_data: List[Dict[str, Any]], city: str = 'Unknown City',
+                             state: str = None, country: str = 'US') -> List[Event]:
+        """
+        Convert raw events data to Event objects
+        
+        Only the fields needed for matching and dedup are read here; images and
+        descriptions stay in Event.raw until enrich_event() is called on a match.
+        city, state and country are the fallbacks for events without venue details.
+        """
         events = []
+        append = events.append
         for event_data in events_data:
-            # Parse date
-            event_date = None
-            if 'dates' in event_data and 'start' in event_data['dates']:
-                start_date = event_data['dates']['start']
-                if 'dateTime' in start_date:
-                    event_date = start_date['dateTime']
-                elif 'localDate' in start_date:
-                    event_date = start_date['localDate']
-            
-            # Extract venue info
-            venue_name = 'Unknown Venue'
-            venue_city = 'Unknown City'
-            venue_country = 'US'
+            # Prefer the exact start time, fall back to the local date
+            start = event_data.get('dates', {}).get('start', {})
+            event_date = start.get('dateTime') or start.get('localDate')
             
-            if 'venues' in event_data.get('_embedded', {}):
-                venues = event_data['_embedded']['venues']
-                if venues:
-                    venue = venues[0]
-                    venue_name = venue.get('name', 'Unknown Venue')
-                    venue_city = venue.get('city', {}).get('name', 'Unknown City')
-                    venue_country = venue.get('country', {}).get('name', 'US')
+            embedded = event_data.get('_embedded', {})
+            venues = embedded.get('venues') or ([event_data['venue']] if 'venue' in event_data else None)
+            if venues:
+                venue = venues[0]
+                venue_name = venue.get('name', 'Unknown Venue')
+                venue_city = venue.get('city', {}).get('name', city)
+                venue_state = venue.get('state', {}).get('stateCode', state)
+                venue_country = venue.get('country', {}).get('name', country)
+            else:
+                venue_name, venue_city, venue_state, venue_country = 'Unknown Venue', city, state, country
             
-            # Extract artists
-            artists = []
-            if 'attractions' in event_data.get('_embedded', {}):
-                attractions = event_data['_embedded']['attractions']
-                artists = [attraction.get('name', '') for attraction in attractions if attraction.get('name')]
+            attractions = embedded.get('attractions') or event_data.get('attractions') or []
             
-            event = Event(
+            append(Event(
                 title=event_data.get('name', 'Unknown Event'),
                 venue=venue_name,
                 city=venue_city,
                 country=venue_country,
                 date=event_date,
                 url=event_data.get('url'),
-                description=event_data.get('info'),
-                artists=artists
-            )
-            events.append(event)
+                artists=[attraction['name'] for attraction in attractions if attraction.get('name')],
+                state=venue_state,
+                artist_mbids=self._attraction_mbids(attractions),
+                source='ticketmaster',
+                raw={field: event_data[field] for field in self.ENRICHMENT_FIELDS if field in event_data}
+            ))
         
         return events
+    
+    def enrich_event(self, event: Event) -> Event:
+        """Fill in the image and description deferred at parse time (call once an event is matched)"""
+        if not event.raw:
+            return event
+        
+        # raw is the payload's images and info, or just the chosen image URL once persisted (Event.to_state)
+        display = Event.display_fields(event.raw)
+        if not event.image_url:
+            event.image_url = display.get('image_url')
+        if event.description is None:
+            event.description = display.get('info')
+        event.raw = None
+        return event
+    
+    @staticmethod
+    def _attraction_mbids(attractions: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Map attraction names to their MusicBrainz IDs (from externalLinks)"""
+        mbids = {}
+        for attraction in attractions:
+            links = attraction.get('externalLinks', {}).get('musicbrainz', [])
+            if attraction.get('name') and links and links[0].get('id'):
+                mbids[attraction['name']] = links[0]['id']
+        return mbids
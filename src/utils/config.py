@@ -1,5 +1,6 @@
 import os
-from typing import List
+from typing import Dict, List, Optional, Tuple
+from ..lastfm.models import GuildTarget, Region
 
 
 class Config:
@@ -10,16 +11,72 @@ class Config:
     
     # atlanta location settings
     ATLANTA_CITY = 'Atlanta'
+    ATLANTA_STATE = 'GA'
     ATLANTA_COUNTRY = 'United States'
+    ATLANTA_LATITUDE = 33.749  # centre for radius filtering of local events
+    ATLANTA_LONGITUDE = -84.388
+    LOCAL_TIMEZONE = 'America/New_York'  # used to bucket UTC start times into local show dates
+    
+    # local state (caches, ledgers) directory
+    STATE_DIR = '.gutterbot'
+    
+    # discord event ledger settings
+    LEDGER_RECONCILE_HOURS = 72  # how often the local ledger is checked against the guild
+    
+    # scrape checkpoint settings
+    CHECKPOINT_MAX_AGE_HOURS = 6  # an interrupted run older than this starts over instead of resuming
+    
+    # multi-region settings
+    ARTIST_CACHE_TTL_HOURS = 12  # how long a per-artist provider lookup is reused
+    REGION_SEARCH_SIZE = 100  # events requested per artist when searching nationwide
+    BANDSINTOWN_RADIUS_MILES = 25  # default radius for local bandsintown location filtering
     
     # user settings
     DEFAULT_USERS: List[str] = []
     
     # matching settings
     SIMILARITY_THRESHOLD = 0.85  # for fuzzy string matching (increased for stricter matching)
+    SIMILARITY_BACKEND = 'difflib'  # difflib (reference ratio), rapidfuzz, or auto (rapidfuzz if installed)
+    DEDUP_TIME_WINDOW_HOURS = 12  # start times further apart than this are different shows
+    ALIAS_LEARN_THRESHOLD = 0.95  # fuzzy matches at or above this are remembered as aliases
+    BATCH_DELAY_SECONDS = 120  # pause between provider batches that made requests
     MAX_ARTISTS_TO_SEARCH = 30  # maximum number of artists to search for events
     ARTIST_SEARCH_DELAY = 0.1  # delay between artist searches (seconds)
     
+    # provider daily request quotas
+    TICKETMASTER_DAILY_LIMIT = 5000
+    BANDSINTOWN_DAILY_LIMIT = 1000
+    ESTIMATED_REQUEST_SECONDS = 0.5  # typical provider round trip, for dry-run wall time estimates
+    
+    # query scheduling settings
+    QUERY_OVERLAP_WEIGHT = 0.5  # extra priority per additional user sharing an artist
+    QUERY_STALENESS_FLOOR = 0.25  # priority multiplier for artists with freshly cached data
+    
+    # last.fm user fetching settings
+    LASTFM_WORKERS = 4  # concurrent user/period fetches (also the keep-alive pool size)
+    
+    # similar-artist expansion settings
+    SIMILAR_ARTISTS_DEPTH = 0  # hops through artist.getSimilar added to the query set (0 = off)
+    SIMILAR_ARTISTS_WEIGHT = 0.3  # playcount share a similar artist inherits per hop (times the match score)
+    SIMILAR_ARTISTS_SEEDS = 20  # each user's top artists that are expanded
+    SIMILAR_ARTISTS_LIMIT = 5  # similar artists kept per seed
+    SIMILAR_ARTISTS_MIN_MATCH = 0.3  # Last.fm match score below which a similar artist is ignored
+    SIMILAR_ARTISTS_TTL_HOURS = 24 * 14  # similarity changes slowly; graph entries are refetched after this
+    
+    # scrape pipeline settings (fetch -> match -> publish)
+    PIPELINE_FETCH_WORKERS = 1  # more than one multiplies the provider request rate
+    PIPELINE_MATCH_WORKERS = 2
+    PIPELINE_PUBLISH_WORKERS = 1
+    PIPELINE_QUEUE_SIZE = 2  # batches buffered between stages before the upstream stage waits
+    
+    # logging settings
+    LOG_LEVEL = 'info'  # debug adds per-request provider lines
+    LOG_SAMPLE_EVERY = 1  # keep 1 in N per-artist/per-event console lines (the JSON log keeps all)
+    
+    # parallel matching settings
+    MATCH_WORKERS = 1  # processes used for event matching (1 = serial)
+    PARALLEL_MATCH_MIN_EVENTS = 200  # below this many events the pool overhead isn't worth it
+    
     @classmethod
     def get_api_key(cls) -> str:
         """Get last.fm api key from environment"""
@@ -51,6 +108,199 @@ class Config:
         """Get discord guild id from environment"""
         return os.getenv('DISCORD_GUILD_ID', '')
     
+    @classmethod
+    def get_discord_webhook_url(cls) -> str:
+        """Get discord webhook url from environment"""
+        return os.getenv('DISCORD_WEBHOOK_URL', '')
+    
+    @classmethod
+    def get_match_workers(cls) -> int:
+        """Get number of matching worker processes from environment"""
+        try:
+            return max(1, int(os.getenv('GUTTERBOT_MATCH_WORKERS', cls.MATCH_WORKERS)))
+        except ValueError:
+            return cls.MATCH_WORKERS
+    
+    @classmethod
+    def get_daily_limits(cls) -> Dict[str, int]:
+        """Get per-provider daily request limits (overridable from environment)"""
+        limits = {}
+        for provider, default in [('ticketmaster', cls.TICKETMASTER_DAILY_LIMIT), ('bandsintown', cls.BANDSINTOWN_DAILY_LIMIT)]:
+            try:
+                limits[provider] = int(os.getenv(f'GUTTERBOT_{provider.upper()}_DAILY_LIMIT', default))
+            except ValueError:
+                limits[provider] = default
+        return limits
+    
+    @classmethod
+    def get_lastfm_workers(cls) -> int:
+        """Get number of concurrent Last.fm fetches from environment"""
+        try:
+            return max(1, int(os.getenv('GUTTERBOT_LASTFM_WORKERS', cls.LASTFM_WORKERS)))
+        except ValueError:
+            return cls.LASTFM_WORKERS
+    
+    @classmethod
+    def get_similar_artists_depth(cls) -> int:
+        """Get the similar-artist expansion depth from environment"""
+        try:
+            return max(0, int(os.getenv('GUTTERBOT_SIMILAR_DEPTH', cls.SIMILAR_ARTISTS_DEPTH)))
+        except ValueError:
+            return cls.SIMILAR_ARTISTS_DEPTH
+    
+    @classmethod
+    def get_similar_artists_weight(cls) -> float:
+        """Get the per-hop weight of similar artists from environment"""
+        try:
+            return max(0.0, float(os.getenv('GUTTERBOT_SIMILAR_WEIGHT', cls.SIMILAR_ARTISTS_WEIGHT)))
+        except ValueError:
+            return cls.SIMILAR_ARTISTS_WEIGHT
+    
+    @classmethod
+    def get_period_weights(cls) -> Dict[str, float]:
+        """Get Last.fm periods to merge into each profile, e.g. GUTTERBOT_PERIODS=1month:1,6month:0.5"""
+        weights = {}
+        for entry in os.getenv('GUTTERBOT_PERIODS', '').split(','):
+            period, _, weight = entry.strip().partition(':')
+            if not period:
+                continue
+            try:
+                weights[period] = float(weight) if weight else 1.0
+            except ValueError:
+                weights[period] = 1.0
+        return weights
+    
+    @classmethod
+    def get_pipeline_workers(cls) -> Dict[str, int]:
+        """Get workers per scrape pipeline stage, e.g. GUTTERBOT_PIPELINE_WORKERS=fetch:1,match:4,publish:1"""
+        workers = {
+            'fetch': cls.PIPELINE_FETCH_WORKERS,
+            'match': cls.PIPELINE_MATCH_WORKERS,
+            'publish': cls.PIPELINE_PUBLISH_WORKERS
+        }
+        for entry in os.getenv('GUTTERBOT_PIPELINE_WORKERS', '').split(','):
+            stage, _, count = entry.strip().partition(':')
+            if stage in workers:
+                try:
+                    workers[stage] = max(1, int(count))
+                except ValueError:
+                    pass
+        return workers
+    
+    @classmethod
+    def get_pipeline_queue_size(cls) -> int:
+        """Get the bounded queue size between scrape pipeline stages from environment"""
+        try:
+            return max(1, int(os.getenv('GUTTERBOT_PIPELINE_QUEUE_SIZE', cls.PIPELINE_QUEUE_SIZE)))
+        except ValueError:
+            return cls.PIPELINE_QUEUE_SIZE
+    
+    @classmethod
+    def get_log_level(cls) -> str:
+        """Get the log level (debug, info, warning, error) from environment"""
+        return os.getenv('GUTTERBOT_LOG_LEVEL', cls.LOG_LEVEL)
+    
+    @classmethod
+    def get_log_json_path(cls) -> Optional[str]:
+        """Get the JSON-lines log file path from environment (unset = no JSON log)"""
+        return os.getenv('GUTTERBOT_LOG_JSON') or None
+    
+    @classmethod
+    def get_log_sample_every(cls) -> int:
+        """Get console sampling for per-artist lines (keep 1 in N) from environment"""
+        try:
+            return max(1, int(os.getenv('GUTTERBOT_LOG_SAMPLE', cls.LOG_SAMPLE_EVERY)))
+        except ValueError:
+            return cls.LOG_SAMPLE_EVERY
+    
+    @classmethod
+    def get_similarity_backend(cls) -> str:
+        """Get the string similarity backend name from environment"""
+        return os.getenv('GUTTERBOT_SIMILARITY_BACKEND', cls.SIMILARITY_BACKEND)
+    
+    @classmethod
+    def get_state_dir(cls) -> str:
+        """Get directory for local state files from environment"""
+        return os.getenv('GUTTERBOT_STATE_DIR', cls.STATE_DIR)
+    
+    @classmethod
+    def get_http_fixture(cls) -> Tuple[Optional[str], Optional[str]]:
+        """Get (mode, path) for recording or replaying provider traffic, or (None, None)"""
+        for mode in ('replay', 'record'):
+            path = os.getenv(f'GUTTERBOT_HTTP_{mode.upper()}')
+            if path:
+                return mode, path
+        return None, None
+    
+    @classmethod
+    def get_regions(cls) -> List[Region]:
+        """Get regions to discover events for.
+        
+        GUTTERBOT_REGIONS is a semicolon-separated list of
+        `City,ST[,channel_id[,lat,lon]]`, e.g. `Atlanta,GA,123;Nashville,TN,,36.16,-86.78`.
+        lat/lon fix the centre used for radius filtering; without them events are
+        matched by city. Defaults to Atlanta posting to DISCORD_CHANNEL_ID.
+        """
+        regions_env = os.getenv('GUTTERBOT_REGIONS', '')
+        regions = []
+        for entry in regions_env.split(';'):
+            parts = [part.strip() for part in entry.split(',')]
+            if not parts[0]:
+                continue
+            state = parts[1] if len(parts) > 1 and parts[1] else None
+            channel_id = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else None
+            latitude = longitude = None
+            if len(parts) > 4:
+                try:
+                    latitude, longitude = float(parts[3]), float(parts[4])
+                except ValueError:
+                    pass
+            regions.append(Region(city=parts[0], state=state, channel_id=channel_id,
+                                  latitude=latitude, longitude=longitude))
+        
+        if not regions:
+            channel_id = cls.get_discord_channel_id()
+            regions.append(cls.get_local_region(int(channel_id) if channel_id.isdigit() else None))
+        return regions
+    
+    @classmethod
+    def get_local_region(cls, channel_id: int = None) -> Region:
+        """The single-region (Atlanta) mode's region, centred on ATLANTA_LATITUDE/ATLANTA_LONGITUDE"""
+        return Region(
+                city=cls.ATLANTA_CITY,
+                state=cls.ATLANTA_STATE,
+            channel_id=channel_id,
+            latitude=cls.ATLANTA_LATITUDE,
+            longitude=cls.ATLANTA_LONGITUDE
+        )
+    
+    @classmethod
+    def get_guilds(cls) -> List[GuildTarget]:
+        """Get the guilds to publish to.
+        
+        GUTTERBOT_GUILDS is a semicolon-separated list of
+        `guild_id:channel_id:user1,user2`, e.g. `111:222:alice,bob;333:444:carol`.
+        All guilds share one discovery run. Defaults to DISCORD_GUILD_ID /
+        DISCORD_CHANNEL_ID tracking LASTFM_USERS.
+        """
+        guilds = []
+        for entry in os.getenv('GUTTERBOT_GUILDS', '').split(';'):
+            parts = [part.strip() for part in entry.split(':')]
+            if not parts[0].isdigit():
+                continue
+            channel_id = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+            users = [user.strip() for user in parts[2].split(',') if user.strip()] if len(parts) > 2 else []
+            guilds.append(GuildTarget(guild_id=int(parts[0]), channel_id=channel_id, users=users or cls.get_users()))
+        
+        if not guilds:
+            guild_id, channel_id = cls.get_discord_guild_id(), cls.get_discord_channel_id()
+            guilds.append(GuildTarget(
+                guild_id=int(guild_id) if guild_id.isdigit() else 0,
+                channel_id=int(channel_id) if channel_id.isdigit() else None,
+                users=cls.get_users()
+            ))
+        return guilds
+    
     @classmethod
     def validate(cls) -> bool:
         """Validate that required configuration is present"""
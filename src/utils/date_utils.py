@@ -1,5 +1,5 @@
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 
 
 class DateValidator:
@@ -57,8 +57,7 @@ class DateValidator:
         if not parsed_date:
             return False
         
-        now = datetime.now(timezone.utc)
-        cutoff = now.replace(hour=23, minute=59, second=59) + timedelta(days=days_ahead)
+        now, cutoff = DateValidator.future_window(days_ahead)
         
         # Ensure both datetimes are timezone-aware
         if parsed_date.tzinfo is None:
@@ -66,6 +65,12 @@ class DateValidator:
         
         return now <= parsed_date <= cutoff
     
+    @staticmethod
+    def future_window(days_ahead: int = 90) -> Tuple[datetime, datetime]:
+        """The (now, cutoff) range is_future_event accepts, for range queries over many events"""
+        now = datetime.now(timezone.utc)
+        return now, now.replace(hour=23, minute=59, second=59) + timedelta(days=days_ahead)
+    
     @staticmethod
     def format_discord_date(event_date: str) -> str:
         """Format date for discord display"""
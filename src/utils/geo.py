@@ -0,0 +1,66 @@
+import math
+from typing import Dict, List, Optional, Tuple
+
+
+EARTH_RADIUS_MILES = 3958.8
+
+
+def haversine_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two coordinates in miles"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
+def parse_coordinates(location: str) -> Optional[Tuple[float, float]]:
+    """Parse a "lat,lon" string, returning None for anything else (e.g. "Atlanta, GA")"""
+    parts = location.split(',')
+    if len(parts) != 2:
+        return None
+    try:
+        lat, lon = float(parts[0]), float(parts[1])
+    except ValueError:
+        return None
+    if -90 <= lat <= 90 and -180 <= lon <= 180:
+        return lat, lon
+    return None
+
+
+class VenueIndex:
+    """Grid index of venue coordinates for radius lookups.
+    
+    Venues are bucketed into 1-degree cells, so a radius query only scans the
+    cells overlapping the search circle instead of every known venue.
+    """
+    
+    CELL_DEGREES = 1.0
+    
+    def __init__(self):
+        self.venues: Dict[str, Tuple[float, float, str, str]] = {}  # key -> (lat, lon, city, region)
+        self.cells: Dict[Tuple[int, int], set] = {}
+    
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.CELL_DEGREES)), int(math.floor(lon / self.CELL_DEGREES))
+    
+    def add(self, key: str, lat: float, lon: float, city: str = '', region: str = ''):
+        if key in self.venues:
+            return
+        self.venues[key] = (lat, lon, (city or '').lower(), (region or '').lower())
+        self.cells.setdefault(self._cell(lat, lon), set()).add(key)
+    
+    def within(self, lat: float, lon: float, radius_miles: float) -> List[str]:
+        """Get keys of venues within radius_miles of a point"""
+        # 1 degree of latitude is ~69 miles; longitude shrinks with latitude
+        lat_span = radius_miles / 69.0
+        lon_span = radius_miles / max(69.0 * math.cos(math.radians(lat)), 1e-6)
+        min_cell = self._cell(lat - lat_span, lon - lon_span)
+        max_cell = self._cell(lat + lat_span, lon + lon_span)
+        
+        keys = []
+        for cell_lat in range(min_cell[0], max_cell[0] + 1):
+            for cell_lon in range(min_cell[1], max_cell[1] + 1):
+                for key in self.cells.get((cell_lat, cell_lon), ()):
+                    venue_lat, venue_lon = self.venues[key][:2]
+                    if haversine_miles(lat, lon, venue_lat, venue_lon) <= radius_miles:
+                        keys.append(key)
+        return keys
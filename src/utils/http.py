@@ -0,0 +1,28 @@
+from typing import Dict, Optional
+
+import requests
+
+
+VALIDATOR_HEADERS = {
+    'etag': ('ETag', 'If-None-Match'),
+    'last_modified': ('Last-Modified', 'If-Modified-Since'),
+}
+
+
+def conditional_headers(validators: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Request headers that revalidate a cached payload against its stored validators"""
+    headers = {}
+    for name, (_, request_header) in VALIDATOR_HEADERS.items():
+        if validators and validators.get(name):
+            headers[request_header] = validators[name]
+    return headers
+
+
+def response_validators(response: requests.Response) -> Dict[str, str]:
+    """Validators (ETag, Last-Modified) a response offers for later revalidation"""
+    validators = {}
+    for name, (response_header, _) in VALIDATOR_HEADERS.items():
+        value = response.headers.get(response_header)
+        if value:
+            validators[name] = value
+    return validators
@@ -0,0 +1,105 @@
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+# Query params that carry credentials; never written to a fixture or used to match one
+CREDENTIAL_PARAMS = ('api_key', 'apikey', 'app_id')
+
+# Response headers worth keeping (validators for conditional requests, rate-limit hints)
+RECORDED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Retry-After')
+
+
+def exchange_key(method: str, url: str, params: Dict[str, Any] = None) -> Tuple:
+    """Identify a request by method, URL and its non-credential params"""
+    params = {name: str(value) for name, value in (params or {}).items() if name not in CREDENTIAL_PARAMS}
+    return (method.upper(), url, tuple(sorted(params.items())))
+
+
+class RecordingSession(requests.Session):
+    """requests.Session that captures every request/response pair for later replay"""
+    
+    def __init__(self):
+        super().__init__()
+        self.exchanges: List[Dict[str, Any]] = []
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+    
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        sent_at = time.perf_counter()
+        response = super().request(method, url, params=params, headers=headers, **kwargs)
+        elapsed = time.perf_counter() - sent_at
+        
+        method, url, params = exchange_key(method, url, params)
+        with self._lock:
+            self.exchanges.append({
+                'method': method,
+                'url': url,
+                'params': list(params),
+                'request_headers': dict(headers or {}),
+                'status': response.status_code,
+                'headers': {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+                'body': response.text,
+                'offset': sent_at - self._started,
+                'elapsed': elapsed
+            })
+        return response
+    
+    def save(self, path: str):
+        """Write the captured exchanges to a gzip-compressed JSON fixture"""
+        with self._lock:
+            fixture = {'version': 1, 'recorded_at': time.time(), 'exchanges': list(self.exchanges)}
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(fixture, f)
+
+
+class ReplaySession(requests.Session):
+    """requests.Session that serves responses from a fixture instead of the network.
+    
+    Each response is delayed by its recorded latency (scaled by speed; 0 disables
+    the delay) so replayed runs see the same timing as the recorded one. Repeated
+    identical requests are served in recorded order, the last one repeating once
+    the queue runs out. Unrecorded requests fail like a dropped connection.
+    """
+    
+    def __init__(self, path: str, speed: float = 1.0):
+        super().__init__()
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            fixture = json.load(f)
+        
+        self.speed = speed
+        self.served = 0
+        self.missed = 0
+        self._queues: Dict[Tuple, Deque[Dict[str, Any]]] = defaultdict(deque)
+        for exchange in fixture['exchanges']:
+            key = (exchange['method'], exchange['url'], tuple(tuple(item) for item in exchange['params']))
+            self._queues[key].append(exchange)
+        self._lock = threading.Lock()
+    
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        key = exchange_key(method, url, params)
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                self.missed += 1
+                raise requests.exceptions.ConnectionError(f"No recorded response for {method} {url}")
+            exchange = queue.popleft() if len(queue) > 1 else queue[0]
+            self.served += 1
+        
+        if self.speed:
+            time.sleep(exchange['elapsed'] * self.speed)
+        
+        response = requests.Response()
+        response.status_code = exchange['status']
+        response.headers = CaseInsensitiveDict(exchange['headers'])
+        response._content = exchange['body'].encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = url
+        response.request = requests.Request(method, url, params=params, headers=headers).prepare()
+        return response
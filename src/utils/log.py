@@ -0,0 +1,161 @@
+import atexit
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, TextIO
+from .config import Config
+
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVELS = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+
+class ConsoleSink:
+    """Human-readable lines (the emoji messages), formatted only when written.
+    
+    Records logged with sampled=True (per-artist and per-event lines) are
+    thinned to one in every `sample_every` per event name. The sampling
+    counters are shared by every thread that logs, so they are updated under a lock.
+    """
+    
+    def __init__(self, stream: TextIO = None, sample_every: int = 1):
+        self.stream = stream
+        self.sample_every = max(1, sample_every)
+        self.seen = Counter()
+        self.suppressed = Counter()
+        self._lock = threading.Lock()
+    
+    def emit(self, level: int, logger: str, event: str, template: str, fields: Dict[str, Any], sampled: bool):
+        if sampled and self.sample_every > 1:
+            with self._lock:
+                self.seen[event] += 1
+                if (self.seen[event] - 1) % self.sample_every:
+                    self.suppressed[event] += 1
+                    return
+        message = template.format(**fields) if fields else template
+        print(message, file=self.stream or sys.stdout)
+    
+    def close(self):
+        with self._lock:
+            total = sum(self.suppressed.values())
+        if total:
+            print(f"🔇 {total} sampled log lines not shown (1 in {self.sample_every} kept)",
+                  file=self.stream or sys.stdout)
+
+
+class JsonLinesSink:
+    """One JSON object per record with the raw fields; no message formatting, never sampled.
+    
+    Records arriving after close() (e.g. from a worker thread during interpreter exit) are dropped.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8', buffering=1 << 16)
+        self._lock = threading.Lock()
+    
+    def emit(self, level: int, logger: str, event: str, template: str, fields: Dict[str, Any], sampled: bool):
+        record = {'ts': round(time.time(), 3), 'level': LEVEL_NAMES.get(level, level), 'logger': logger, 'event': event}
+        record.update(fields)
+        line = json.dumps(record, default=str, ensure_ascii=False)
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + '\n')
+    
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class _LogState:
+    """Process-wide level and sinks, configured once from the environment"""
+    
+    def __init__(self):
+        self.level = INFO
+        self.sinks: List[Any] = []
+        self.configured = False
+        self._lock = threading.Lock()
+
+
+_state = _LogState()
+
+
+def configure(level: str = None, json_path: str = None, sample_every: int = None, stream: TextIO = None):
+    """
+    (Re)configure logging; unset arguments come from GUTTERBOT_LOG_LEVEL,
+    GUTTERBOT_LOG_JSON and GUTTERBOT_LOG_SAMPLE
+    """
+    with _state._lock:
+        for sink in _state.sinks:
+            sink.close()
+        level = level or Config.get_log_level()
+        json_path = json_path if json_path is not None else Config.get_log_json_path()
+        sample_every = sample_every if sample_every is not None else Config.get_log_sample_every()
+        
+        _state.level = LEVELS.get(level.lower(), INFO)
+        sinks = [ConsoleSink(stream, sample_every)]
+        if json_path:
+            sinks.append(JsonLinesSink(json_path))
+        _state.sinks = sinks
+        _state.configured = True
+
+
+@atexit.register
+def shutdown():
+    """Flush and close the sinks (prints how many sampled lines were dropped)"""
+    with _state._lock:
+        for sink in _state.sinks:
+            sink.close()
+        _state.sinks = []
+        _state.configured = False
+
+
+class Logger:
+    """Structured logger: an event name, a message template and keyword fields.
+    
+    Calls below the configured level return before anything is formatted, and
+    the template is only formatted by sinks that print it, so hot loops pay
+    for a level check and a kwargs dict at most.
+    
+        log.info('artist.events', "  ✓ {artist}: {count} events", artist=artist, count=len(events), sampled=True)
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def is_enabled(self, level: int) -> bool:
+        if not _state.configured:
+            configure()
+        return level >= _state.level
+    
+    def log(self, level: int, event: str, template: str, sampled: bool = False, **fields):
+        if not self.is_enabled(level):
+            return
+        # configure() and shutdown() replace the list rather than mutate it, so iterating
+        # it is safe while another thread shuts down; a closed sink drops the record
+        for sink in _state.sinks:
+            sink.emit(level, self.name, event, template, fields, sampled)
+    
+    def debug(self, event: str, template: str, sampled: bool = False, **fields):
+        self.log(DEBUG, event, template, sampled, **fields)
+    
+    def info(self, event: str, template: str, sampled: bool = False, **fields):
+        self.log(INFO, event, template, sampled, **fields)
+    
+    def warning(self, event: str, template: str, sampled: bool = False, **fields):
+        self.log(WARNING, event, template, sampled, **fields)
+    
+    def error(self, event: str, template: str, sampled: bool = False, **fields):
+        self.log(ERROR, event, template, sampled, **fields)
+
+
+_loggers: Dict[str, Logger] = {}
+
+
+def get_logger(name: str) -> Logger:
+    if name not in _loggers:
+        _loggers[name] = Logger(name)
+    return _loggers[name]
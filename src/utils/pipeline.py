@@ -0,0 +1,143 @@
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, List, Union
+
+
+# Marks the end of a queue's input; each worker of the next stage gets one
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    """Throughput and queue depth of one pipeline stage"""
+    name: str
+    workers: int
+    processed: int = 0
+    busy_seconds: float = 0.0  # summed across workers
+    max_depth: int = 0  # deepest the stage's input queue got
+    depth_total: int = 0
+    depth_samples: int = 0
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    
+    @property
+    def mean_depth(self) -> float:
+        return self.depth_total / self.depth_samples if self.depth_samples else 0.0
+    
+    @property
+    def throughput(self) -> float:
+        """Items per second of wall time the stage was running"""
+        elapsed = self.finished_at - self.started_at
+        return self.processed / elapsed if elapsed > 0 else 0.0
+    
+    @property
+    def utilization(self) -> float:
+        """Fraction of worker time spent processing rather than waiting on the queues"""
+        elapsed = (self.finished_at - self.started_at) * self.workers
+        return self.busy_seconds / elapsed if elapsed > 0 else 0.0
+    
+    def summary(self) -> str:
+        return (f"{self.name}: {self.processed} items, {self.throughput:.2f}/s, "
+                f"{self.utilization:.0%} busy x{self.workers}, queue max {self.max_depth} (avg {self.mean_depth:.1f})")
+
+
+class Stage:
+    """One step of a Pipeline.
+    
+    fn(item) returns the item for the next stage, or None to drop it. Coroutine
+    functions run on the event loop; plain functions run in a worker thread so
+    blocking I/O or CPU work doesn't stall the other stages.
+    """
+    
+    def __init__(self, name: str, fn: Callable[[Any], Union[Any, Awaitable[Any]]], workers: int = 1):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.stats = StageStats(name, self.workers)
+    
+    async def process(self, item: Any) -> Any:
+        if inspect.iscoroutinefunction(self.fn):
+            return await self.fn(item)
+        return await asyncio.to_thread(self.fn, item)
+
+
+class Pipeline:
+    """Stages connected by bounded asyncio queues.
+    
+    A full queue blocks the stage feeding it, so a fast producer waits for the
+    slower stages downstream instead of buffering without limit. The first
+    exception raised by a stage cancels the whole run and is re-raised.
+    """
+    
+    def __init__(self, stages: List[Stage], queue_size: int = 2):
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+    
+    async def run(self, items: Iterable[Any]) -> List[Any]:
+        """Feed items through every stage, returning the last stage's outputs in completion order"""
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results = []
+        
+        async def put(index: int, item: Any):
+            await queues[index].put(item)
+            if item is not _DONE:
+                stats = self.stages[index].stats
+                depth = queues[index].qsize()
+                stats.max_depth = max(stats.max_depth, depth)
+                stats.depth_total += depth
+                stats.depth_samples += 1
+        
+        async def feed():
+            for item in items:
+                await put(0, item)
+            for _ in range(self.stages[0].workers):
+                await put(0, _DONE)
+        
+        remaining = [stage.workers for stage in self.stages]
+        
+        async def work(index: int):
+            stage = self.stages[index]
+            last = index == len(self.stages) - 1
+            while True:
+                item = await queues[index].get()
+                if item is _DONE:
+                    break
+                started = time.perf_counter()
+                output = await stage.process(item)
+                stage.stats.busy_seconds += time.perf_counter() - started
+                stage.stats.processed += 1
+                if output is None:
+                    continue
+                if last:
+                    results.append(output)
+                else:
+                    await put(index + 1, output)
+            
+            # The stage's last worker to finish closes the next stage's input
+            remaining[index] -= 1
+            if remaining[index] == 0:
+                stage.stats.finished_at = time.perf_counter()
+                if not last:
+                    for _ in range(self.stages[index + 1].workers):
+                        await put(index + 1, _DONE)
+        
+        start = time.perf_counter()
+        for stage in self.stages:
+            stage.stats.started_at = start
+        
+        tasks = [asyncio.create_task(feed())]
+        for index, stage in enumerate(self.stages):
+            tasks.extend(asyncio.create_task(work(index)) for _ in range(stage.workers))
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return results
+    
+    def summary(self) -> str:
+        return '; '.join(stage.stats.summary() for stage in self.stages)
@@ -0,0 +1,66 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    """An in-flight call that followers wait on"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls into one.
+    
+    While a call for a key is in flight, other threads asking for the same key
+    wait for it and share its (parsed) result or exception instead of making
+    their own request. Nothing is cached once the call completes.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executed = 0  # calls that actually ran
+        self.saved = 0  # calls that shared another call's result
+    
+    @staticmethod
+    def make_key(endpoint: str, params: Dict[str, Any], ignore: Tuple[str, ...] = ()) -> Tuple:
+        """Build a key from an endpoint and its params, normalizing case and whitespace"""
+        normalized = []
+        for name, value in params.items():
+            if name in ignore or value is None:
+                continue
+            if isinstance(value, str):
+                value = ' '.join(value.casefold().split())
+            normalized.append((name, value))
+        return (endpoint, tuple(sorted(normalized, key=lambda item: item[0])))
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                self.saved += 1
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
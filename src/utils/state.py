@@ -0,0 +1,30 @@
+import json
+import os
+from typing import Any
+from .config import Config
+
+
+def state_path(filename: str) -> str:
+    """Get the path of a file inside the local state directory"""
+    return os.path.join(Config.get_state_dir(), filename)
+
+
+def load_json(path: str, default: Any = None) -> Any:
+    """Load a JSON state file, returning default if it is missing or corrupt"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path: str, data: Any):
+    """Atomically write a JSON state file (write to a temp file, then rename)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
@@ -0,0 +1,67 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator, List, Union
+
+
+Timestamp = Union[datetime, float]
+
+
+class TimeIndex:
+    """Items kept sorted by start time, so window and proximity queries are bisect range scans.
+    
+    Times may be datetimes (naive ones are taken as UTC) or POSIX timestamps.
+    Items with equal times keep insertion order.
+    """
+    
+    def __init__(self):
+        self._times: List[float] = []
+        self._items: List[Any] = []
+    
+    @staticmethod
+    def timestamp(when: Timestamp) -> float:
+        if isinstance(when, datetime):
+            if when.tzinfo is None:
+                when = when.replace(tzinfo=timezone.utc)
+            return when.timestamp()
+        return float(when)
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items)
+    
+    def add(self, when: Timestamp, item: Any):
+        idx = bisect_right(self._times, self.timestamp(when))
+        self._times.insert(idx, self.timestamp(when))
+        self._items.insert(idx, item)
+    
+    def remove(self, when: Timestamp, item: Any) -> bool:
+        """Remove one occurrence of item stored at when"""
+        t = self.timestamp(when)
+        for idx in range(bisect_left(self._times, t), bisect_right(self._times, t)):
+            if self._items[idx] == item:
+                del self._times[idx]
+                del self._items[idx]
+                return True
+        return False
+    
+    def between(self, start: Timestamp, end: Timestamp) -> List[Any]:
+        """Items with start <= time <= end, in time order"""
+        lo = bisect_left(self._times, self.timestamp(start))
+        hi = bisect_right(self._times, self.timestamp(end))
+        return self._items[lo:hi]
+    
+    def near(self, when: Timestamp, delta: timedelta) -> List[Any]:
+        """Items within delta (inclusive) of when"""
+        t = self.timestamp(when)
+        seconds = delta.total_seconds()
+        return self.between(t - seconds, t + seconds)
+    
+    def since(self, when: Timestamp) -> List[Any]:
+        """Items at or after when"""
+        return self._items[bisect_left(self._times, self.timestamp(when)):]
+    
+    def after(self, when: Timestamp) -> List[Any]:
+        """Items strictly after when"""
+        return self._items[bisect_right(self._times, self.timestamp(when)):]
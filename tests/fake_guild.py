@@ -0,0 +1,170 @@
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import discord
+
+
+class RateLimitBucket:
+    """Discord-style rate-limit bucket: `limit` requests per `per` seconds.
+    
+    discord.py sleeps out a 429 and retries, so an exhausted bucket makes the
+    caller wait for the reset rather than fail.
+    """
+    
+    def __init__(self, limit: int, per: float):
+        self.limit = limit
+        self.per = per
+        self.remaining = limit
+        self.reset_at = 0.0
+        self.rate_limited = 0
+        self.waited = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            if now >= self.reset_at:
+                self.remaining = self.limit
+                self.reset_at = now + self.per
+            if self.remaining == 0:
+                delay = self.reset_at - now
+                self.rate_limited += 1
+                self.waited += delay
+                await asyncio.sleep(delay)
+                self.remaining = self.limit
+                self.reset_at = time.monotonic() + self.per
+            self.remaining -= 1
+
+
+class FakeAPI:
+    """Simulated latency and per-route buckets shared by a fake guild and its channels"""
+    
+    def __init__(self, latency: float = 0.0, buckets: Dict[str, Tuple[int, float]] = None):
+        self.latency = latency
+        self.bucket_limits = buckets or {}
+        self.buckets: Dict[str, RateLimitBucket] = {}
+        self.calls = Counter()  # requests per route
+    
+    async def request(self, route: str, bucket_key: str = None):
+        self.calls[route] += 1
+        if route in self.bucket_limits:
+            key = f"{route}:{bucket_key}" if bucket_key else route
+            if key not in self.buckets:
+                self.buckets[key] = RateLimitBucket(*self.bucket_limits[route])
+            await self.buckets[key].acquire()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+    
+    @property
+    def rate_limited(self) -> int:
+        return sum(bucket.rate_limited for bucket in self.buckets.values())
+    
+    @property
+    def waited(self) -> float:
+        return sum(bucket.waited for bucket in self.buckets.values())
+    
+    def summary(self) -> str:
+        calls = ', '.join(f"{route}: {count}" for route, count in sorted(self.calls.items()))
+        return f"{sum(self.calls.values())} requests ({calls}), {self.rate_limited} rate limited, {self.waited:.2f}s waited"
+
+
+class FakeScheduledEvent:
+    """Stand-in for discord.ScheduledEvent with the attributes and calls the bot uses"""
+    
+    def __init__(self, guild: 'FakeGuild', event_id: int, name: str, start_time: datetime,
+                 end_time: datetime = None, description: str = None, location: str = None, **kwargs):
+        self.guild = guild
+        self.id = event_id
+        self.name = name
+        self.start_time = start_time
+        self.end_time = end_time
+        self.description = description
+        self.location = location
+        self.entity_type = kwargs.get('entity_type')
+        self.privacy_level = kwargs.get('privacy_level')
+        self.status = discord.EventStatus.scheduled
+    
+    async def edit(self, **kwargs) -> 'FakeScheduledEvent':
+        await self.guild.api.request('edit_scheduled_event', self.guild.id)
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+        return self
+    
+    async def cancel(self) -> 'FakeScheduledEvent':
+        return await self.edit(status=discord.EventStatus.canceled)
+    
+    async def delete(self):
+        await self.guild.api.request('delete_scheduled_event', self.guild.id)
+        self.guild.scheduled_events.pop(self.id, None)
+
+
+class FakeChannel:
+    """Stand-in for a text channel; sent messages are kept in .messages"""
+    
+    def __init__(self, api: FakeAPI, channel_id: int):
+        self.api = api
+        self.id = channel_id
+        self.messages: List[Dict[str, Any]] = []
+    
+    async def send(self, content: str = None, embed: discord.Embed = None, embeds: List[discord.Embed] = None):
+        await self.api.request('send_message', self.id)
+        embeds = embeds or ([embed] if embed else [])
+        self.messages.append({'content': content, 'embeds': embeds})
+        return SimpleNamespace(id=len(self.messages), content=content, embeds=embeds)
+
+
+class FakeGuild:
+    """In-process stand-in for the discord.Guild scheduled-event API and its channels.
+    
+    Every API call goes through FakeAPI, which adds the configured latency and
+    waits on rate-limit buckets, so publishing throughput and dedup cost can be
+    measured and regression-tested offline. install() points a bot's
+    get_guild/get_channel at the fakes.
+    """
+    
+    def __init__(self, guild_id: int, latency: float = 0.0, buckets: Dict[str, Tuple[int, float]] = None):
+        self.id = guild_id
+        self.api = FakeAPI(latency, buckets)
+        self.scheduled_events: Dict[int, FakeScheduledEvent] = {}
+        self.channels: Dict[int, FakeChannel] = {}
+        self._next_id = 1000  # increasing like snowflakes, so "oldest" is the lowest id
+    
+    def channel(self, channel_id: int) -> FakeChannel:
+        if channel_id not in self.channels:
+            self.channels[channel_id] = FakeChannel(self.api, channel_id)
+        return self.channels[channel_id]
+    
+    def install(self, bot, channel_ids: List[int] = None):
+        """Route a bot's guild and channel lookups to this fake"""
+        for channel_id in channel_ids or []:
+            self.channel(channel_id)
+        bot.get_guild = lambda guild_id: self if guild_id == self.id else None
+        bot.get_channel = self.channels.get
+    
+    def add_scheduled_event(self, name: str, start_time: datetime, location: str = None, **kwargs) -> FakeScheduledEvent:
+        """Seed an existing scheduled event without going through the API"""
+        self._next_id += 1
+        scheduled_event = FakeScheduledEvent(self, self._next_id, name, start_time, location=location, **kwargs)
+        self.scheduled_events[scheduled_event.id] = scheduled_event
+        return scheduled_event
+    
+    def get_scheduled_event(self, event_id: int) -> Optional[FakeScheduledEvent]:
+        return self.scheduled_events.get(event_id)
+    
+    async def fetch_scheduled_event(self, event_id: int) -> FakeScheduledEvent:
+        await self.api.request('fetch_scheduled_event', self.id)
+        if event_id not in self.scheduled_events:
+            raise discord.NotFound(SimpleNamespace(status=404, reason='Not Found'), 'Unknown Guild Scheduled Event')
+        return self.scheduled_events[event_id]
+    
+    async def fetch_scheduled_events(self) -> List[FakeScheduledEvent]:
+        await self.api.request('fetch_scheduled_events', self.id)
+        return list(self.scheduled_events.values())
+    
+    async def create_scheduled_event(self, name: str, start_time: datetime, **kwargs) -> FakeScheduledEvent:
+        await self.api.request('create_scheduled_event', self.id)
+        return self.add_scheduled_event(name, start_time, **kwargs)
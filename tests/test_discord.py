@@ -0,0 +1,414 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+import discord
+from src.discord.ledger import EventLedger
+from src.discord.sync import ScheduledEventSync
+from src.discord.webhook import WebhookPublisher
+from src.discord.bot import GutterBot
+from src.lastfm.dedup import EventDeduplicator
+from src.lastfm.models import Artist, Event, UserListeningData
+from src.lastfm.scraper import EventScraper
+from tests.fake_guild import FakeGuild
+
+
+class TestScheduledEventSync(unittest.TestCase):
+    """Tests for the discord scheduled event ledger and delta sync"""
+    
+    def setUp(self):
+        self.state_dir = tempfile.TemporaryDirectory()
+        self.ledger = EventLedger(1, path=os.path.join(self.state_dir.name, 'ledger.json'))
+        self.deduplicator = EventDeduplicator()
+    
+    def tearDown(self):
+        self.state_dir.cleanup()
+    
+    def _event(self, artist: str, date: str, venue: str = "The Earl", url: str = None) -> Event:
+        return Event(title=f"{artist} Live", venue=venue, city="Atlanta", country="US",
+                     date=date, url=url, artists=[artist])
+    
+    def _record(self, event: Event, discord_id: int):
+        start_time = datetime.fromisoformat(event.date).replace(tzinfo=timezone.utc)
+        self.ledger.record(self.deduplicator.ledger_key(event), discord_id, f"🎵 {event.title}",
+                           start_time, event.venue, artist=event.artists[0], url=event.url)
+    
+    def test_plan_creates_updates_and_cancels(self):
+        """Test the sync plan only touches events that changed"""
+        unchanged = self._event("Deftones", "2030-05-01T20:00:00")
+        rescheduled = self._event("Radiohead", "2030-05-02T20:00:00")
+        cancelled = self._event("Bladee", "2030-05-03T20:00:00")
+        not_queried = self._event("Samia", "2030-05-04T20:00:00")
+        for discord_id, event in enumerate([unchanged, rescheduled, cancelled, not_queried]):
+            self._record(event, discord_id)
+        
+        new_date = self._event("Radiohead", "2030-05-09T20:00:00")
+        new_show = self._event("Beach Fossils", "2030-05-05T20:00:00")
+        matches = {"user1": [(unchanged, "Deftones", 1.0), (new_date, "Radiohead", 1.0), (new_show, "Beach Fossils", 1.0)]}
+        
+        plan = ScheduledEventSync(self.ledger, self.deduplicator).plan(
+            matches, queried_artists=["Deftones", "Radiohead", "Bladee", "Beach Fossils"])
+        
+        self.assertEqual(plan.unchanged, [self.deduplicator.ledger_key(unchanged)])
+        self.assertEqual([key for key, _, _, _ in plan.creates], [self.deduplicator.ledger_key(new_show)])
+        self.assertEqual(len(plan.updates), 1)
+        old_key, new_key, _, _, changes = plan.updates[0]
+        self.assertEqual(old_key, self.deduplicator.ledger_key(rescheduled))
+        self.assertEqual(new_key, self.deduplicator.ledger_key(new_date))
+        self.assertIn('start_time', changes)
+        self.assertEqual(plan.cancels, [self.deduplicator.ledger_key(cancelled)])
+    
+    def test_return_visit_is_not_a_reschedule_of_a_past_show(self):
+        """Test a finished show at the same venue isn't edited into the artist's next one"""
+        last_visit = self._event("Deftones", "2020-05-01T20:00:00")
+        self._record(last_visit, 1)
+        next_visit = self._event("Deftones", "2030-05-01T20:00:00")
+        
+        plan = ScheduledEventSync(self.ledger, self.deduplicator).plan(
+            {"user1": [(next_visit, "Deftones", 1.0)]}, queried_artists=["Deftones"])
+        
+        self.assertEqual([key for key, _, _, _ in plan.creates], [self.deduplicator.ledger_key(next_visit)])
+        self.assertEqual((plan.updates, plan.cancels), ([], []))
+    
+    def test_failed_lookup_does_not_cancel_events(self):
+        """Test an artist whose provider lookup failed isn't treated as queried, so its events survive sync"""
+        show_date = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%dT20:00:00')
+        rate_limited = self._event("Radiohead", show_date)
+        gone = self._event("Deftones", show_date, venue="Masquerade")
+        self._record(rate_limited, 1)
+        self._record(gone, 2)
+        
+        def search_events_conditional(keyword, validators=None, **kwargs):
+            if keyword == "Radiohead":
+                raise Exception("Request failed: 429 Too Many Requests")
+            return [], {}
+        
+        os.environ['GUTTERBOT_STATE_DIR'] = self.state_dir.name
+        try:
+            scraper = EventScraper("test_key", "test_key")
+            scraper.batch_delay = 0
+            artists = [Artist("Radiohead", playcount=10), Artist("Deftones", playcount=5)]
+            scraper.get_user_artists = lambda usernames, period='1month': {
+                'alice': UserListeningData('alice', artists, len(artists), '1month')}
+            scraper.ticketmaster_client.search_events_conditional = search_events_conditional
+            asyncio.run(scraper.scrape_and_match(['alice']))
+        finally:
+            os.environ.pop('GUTTERBOT_STATE_DIR', None)
+        
+        self.assertEqual(scraper.queried_artists, {"Deftones"})
+        plan = ScheduledEventSync(self.ledger, self.deduplicator).plan({}, scraper.queried_artists)
+        self.assertEqual(plan.cancels, [self.deduplicator.ledger_key(gone)])
+    
+    def test_ledger_persists_and_reconciles(self):
+        """Test the ledger round-trips and drops events deleted from the guild"""
+        self._record(self._event("Deftones", "2030-05-01T20:00:00"), 11)
+        self._record(self._event("Radiohead", "2030-05-02T20:00:00"), 12)
+        self.ledger.save()
+        
+        ledger = EventLedger(1, path=self.ledger.path)
+        self.assertEqual(len(ledger), 2)
+        
+        class ScheduledEvent:
+            def __init__(self, event_id):
+                self.id = event_id
+                self.name = f"Event {event_id}"
+                self.start_time = datetime(2030, 5, 1, 20, tzinfo=timezone.utc)
+        
+        untracked = ledger.reconcile([ScheduledEvent(11), ScheduledEvent(99)])
+        self.assertEqual([scheduled_event.id for scheduled_event in untracked], [99])
+        self.assertEqual(len(ledger), 1)
+        self.assertFalse(ledger.needs_reconcile())
+    
+    def test_ledger_time_queries(self):
+        """Test upcoming and changed-since queries follow records, edits and removals"""
+        past = self._event("Deftones", "2020-05-01T20:00:00")
+        later = self._event("Radiohead", "2030-05-09T20:00:00")
+        sooner = self._event("Bladee", "2030-05-02T20:00:00")
+        self._record(past, 1)
+        self._record(later, 2)
+        checkpoint = time.time()
+        self._record(sooner, 3)
+    
+        now = datetime.now(timezone.utc)
+        keys = [self.deduplicator.ledger_key(event) for event in (past, later, sooner)]
+        self.assertEqual(self.ledger.upcoming(now), [keys[2], keys[1]])
+        self.assertEqual(self.ledger.changed_since(checkpoint), [keys[2]])
+    
+        self.ledger.remove(3)
+        self.assertEqual(self.ledger.upcoming(now), [keys[1]])
+        self.assertEqual(self.ledger.changed_since(checkpoint), [])
+    
+        # Re-recording a key (an in-place edit) moves it in both indexes
+        self._record(later, 2)
+        self.assertEqual(self.ledger.changed_since(checkpoint), [keys[1]])
+        self.assertEqual(EventLedger(1, path=self.ledger.path).upcoming(now), [])
+        self.ledger.save()
+        self.assertEqual(EventLedger(1, path=self.ledger.path).upcoming(now), [keys[1]])
+    
+    def test_ledger_round_trip_reconcile_and_external_events(self):
+        """Test record/remove/save round-trip, reconcile age and persisted events created elsewhere"""
+        deftones = self._event("Deftones", "2030-05-01T20:00:00")
+        radiohead = self._event("Radiohead", "2030-05-02T20:00:00")
+        self.assertTrue(self.ledger.needs_reconcile())
+        self._record(deftones, 11)
+        self._record(radiohead, 12)
+        self.assertEqual(self.ledger.remove(12)['name'], "🎵 Radiohead Live")
+        self.assertIsNone(self.ledger.remove(12))
+        self.ledger.save()
+        
+        ledger = EventLedger(1, path=self.ledger.path)
+        key = self.deduplicator.ledger_key(deftones)
+        self.assertEqual((len(ledger), key in ledger, ledger.key_for_id(11)), (1, True, key))
+        self.assertEqual(ledger.get(key)['start_time'], "2030-05-01T20:00:00+00:00")
+        self.assertTrue(ledger.needs_reconcile())  # never reconciled
+        
+        start = datetime(2030, 5, 3, 20, tzinfo=timezone.utc)
+        ours = SimpleNamespace(id=11, name="🎵 Deftones Live", start_time=start, location="The Earl")
+        theirs = SimpleNamespace(id=99, name="Open Mic", start_time=start, location="Eddie's Attic")
+        self.assertEqual(ledger.reconcile([ours, theirs]), [theirs])
+        self.assertFalse(ledger.needs_reconcile())
+        self.assertTrue(ledger.needs_reconcile(max_age_hours=0))
+        ledger.save()
+        
+        reloaded = EventLedger(1, path=self.ledger.path)
+        self.assertFalse(reloaded.needs_reconcile())
+        self.assertEqual(reloaded.external, {'99': {'name': "Open Mic", 'start_time': start.isoformat(),
+                                                    'location': "Eddie's Attic"}})
+        reloaded.remove(99)
+        self.assertEqual((reloaded.external, len(reloaded)), ({}, 1))
+
+
+
+class TestWebhookPublisher(unittest.TestCase):
+    """Tests for batched, rate-limit aware webhook posting"""
+    
+    class FakeResponse:
+        def __init__(self, status_code, headers=None, body=None):
+            self.status_code = status_code
+            self.headers = headers or {}
+            self.text = ''
+            self._body = body or {}
+        
+        def json(self):
+            return self._body
+    
+    class FakeSession:
+        def __init__(self, responses):
+            self.responses = list(responses)
+            self.posts = []
+        
+        def post(self, url, json=None):
+            self.posts.append(json)
+            return self.responses.pop(0)
+    
+    def test_batches_embeds_and_retries_rate_limits(self):
+        session = self.FakeSession([
+            self.FakeResponse(429, body={'retry_after': 0.05}),
+            self.FakeResponse(204, headers={'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset-After': '0.05'}),
+            self.FakeResponse(204),
+        ])
+        publisher = WebhookPublisher('https://discord.example/webhook', session=session)
+        event = Event(title="Deftones", venue="Masquerade", city="Atlanta", country="US",
+                      date="2030-05-01T20:00:00", artists=["Deftones"])
+        publisher.add_matches({f"user{i}": [(event, "Deftones", 1.0)] for i in range(12)})
+        publisher.add_matches({"nobody": []})
+        
+        self.assertEqual(publisher.flush(), 12)
+        self.assertEqual([len(post['embeds']) for post in session.posts], [10, 10, 2])
+        self.assertEqual((publisher.messages_sent, publisher.rate_limited), (2, 1))
+        self.assertEqual(publisher.pending, [])
+
+
+
+class TestMultiGuildFanOut(unittest.TestCase):
+    """Tests for publishing one discovery run to several guilds"""
+    
+    def setUp(self):
+        self.state_dir = tempfile.TemporaryDirectory()
+        os.environ['GUTTERBOT_STATE_DIR'] = self.state_dir.name
+        os.environ['GUTTERBOT_GUILDS'] = '111:222:alice,bob;333:444:carol'
+    
+    def tearDown(self):
+        os.environ.pop('GUTTERBOT_STATE_DIR', None)
+        os.environ.pop('GUTTERBOT_GUILDS', None)
+        self.state_dir.cleanup()
+    
+    def test_each_guild_gets_its_own_users_channel_and_ledger(self):
+        class FakeChannel:
+            def __init__(self):
+                self.embeds = []
+            
+            async def send(self, content=None, embed=None):
+                self.embeds.append(embed.title if embed else content)
+        
+        async def run():
+            bot = GutterBot()
+            channels = {222: FakeChannel(), 444: FakeChannel()}
+            synced_guilds = []
+            
+            async def fake_sync(matches, queried_artists=None):
+                await asyncio.sleep(0.01)  # let the other guild's task interleave
+                synced_guilds.append((bot.guild_id, bot.ledger.guild_id, sorted(matches)))
+                return {}
+            
+            bot.get_channel = channels.get
+            bot.sync_scheduled_events = fake_sync
+            event = Event(title="Deftones", venue="Masquerade", city="Atlanta", country="US",
+                          date="2030-05-01T20:00:00", artists=["Deftones"])
+            matches = {user: [(event, "Deftones", 1.0)] for user in ("alice", "bob", "carol")}
+            await bot.for_each_guild(bot._publish_guild_matches, matches)
+            await bot.close()
+            return channels, synced_guilds
+        
+        channels, synced_guilds = asyncio.run(run())
+        self.assertEqual(sorted(synced_guilds), [(111, 111, ["alice", "bob"]), (333, 333, ["carol"])])
+        self.assertEqual(len(channels[222].embeds), 2)
+        self.assertEqual(channels[444].embeds, ["🎵 Event Recommendations for carol"])
+
+
+class TestFakeGuild(unittest.TestCase):
+    """Tests for GutterBot's discord paths against the in-process fake guild"""
+    
+    def setUp(self):
+        self.state_dir = tempfile.TemporaryDirectory()
+        os.environ['GUTTERBOT_STATE_DIR'] = self.state_dir.name
+        os.environ['GUTTERBOT_GUILDS'] = '1:2:alice'
+    
+    def tearDown(self):
+        os.environ.pop('GUTTERBOT_STATE_DIR', None)
+        os.environ.pop('GUTTERBOT_GUILDS', None)
+        self.state_dir.cleanup()
+    
+    def test_publish_dedup_and_clean_against_fake_guild(self):
+        start = datetime(2030, 5, 1, 20, tzinfo=timezone.utc)
+        
+        async def run():
+            bot = GutterBot()
+            guild = FakeGuild(1, buckets={'create_scheduled_event': (1, 0.05)})
+            guild.install(bot, [2])
+            guild.add_scheduled_event("🎵 Deftones Live", start, location="Masquerade")
+            guild.add_scheduled_event("🎵 Deftones Live!", start + timedelta(minutes=5), location="Masquerade")
+            guild.add_scheduled_event("🎵 Radiohead Live", start + timedelta(days=3), location="State Farm Arena")
+            
+            await bot.load_existing_events()
+            new_shows = [Event(title=f"{artist} Live", venue="The Earl", city="Atlanta", country="US",
+                               date=(start + timedelta(days=days)).isoformat(), artists=[artist])
+                         for artist, days in (("Deftones", 0), ("Bladee", 1), ("Samia", 2))]
+            await bot._publish_matches(guild.channel(2), {"alice": [(e, e.artists[0], 1.0) for e in new_shows]})
+            deleted = await bot.clean_scheduled_events()
+            await bot.close()
+            return guild, deleted
+        
+        guild, deleted = asyncio.run(run())
+        
+        # Deftones is a fuzzy duplicate of an existing event; the other two are created under the bucket
+        self.assertEqual(guild.api.calls['create_scheduled_event'], 2)
+        self.assertEqual(guild.api.rate_limited, 1)
+        self.assertEqual(deleted, 1)
+        self.assertEqual(sorted(event.name for event in guild.scheduled_events.values()),
+                         ["🎵 Bladee Live", "🎵 Deftones Live", "🎵 Radiohead Live", "🎵 Samia Live"])
+        self.assertEqual(len(guild.channel(2).messages), 1)
+    
+    def test_rescheduled_show_is_edited_through_batch_publishing(self):
+        """Test a show moved by a week is edited in place when a run publishes batches as it goes"""
+        first_date = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=13)
+        original = Event(title="Deftones", venue="Masquerade", city="Atlanta", country="US",
+                         date=first_date.isoformat(), artists=["Deftones"])
+        moved = Event(title="Deftones", venue="Masquerade", city="Atlanta", country="US",
+                      date=(first_date + timedelta(days=7)).isoformat(), artists=["Deftones"])
+        artists = [Artist("Deftones", playcount=10)]
+        
+        async def run():
+            guild = FakeGuild(1)
+            first = GutterBot()
+            guild.install(first, [2])
+            await first.sync_scheduled_events({"alice": [(original, "Deftones", 1.0)]}, {"Deftones"})
+            await first.close()
+            
+            bot = GutterBot()
+            guild.install(bot, [2])
+            bot.scraper.batch_delay = 0
+            bot.scraper.bandsintown_client = None
+            bot.scraper.get_user_artists = lambda usernames, period='1month': {
+                'alice': UserListeningData('alice', list(artists), len(artists), '1month')}
+            bot.scraper.get_events_for_artists_batch = lambda batch_artists, plan=None: [moved]
+            await bot.load_existing_events()
+            await bot.post_event_recommendations()
+            await bot.close()
+            return guild
+        
+        guild = asyncio.run(run())
+        self.assertEqual(guild.api.calls['create_scheduled_event'], 1)  # only the original
+        self.assertEqual(guild.api.calls['edit_scheduled_event'], 1)
+        (scheduled_event,) = guild.scheduled_events.values()
+        self.assertEqual(scheduled_event.start_time, datetime.fromisoformat(moved.date))
+        self.assertEqual(scheduled_event.status, discord.EventStatus.scheduled)
+        self.assertEqual(len(guild.channel(2).messages), 2)  # the batch's embed, then the final one
+    
+    def test_learned_identity_keeps_the_ledger_key(self):
+        """Test a show keeps its scheduled event when its headliner's MBID becomes known"""
+        start = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=30)
+        show = Event(title="Deftones Live", venue="Masquerade", city="Atlanta", country="US",
+                     date=start.isoformat(), artists=["Deftones"])
+        with_mbid = Event(title="Deftones Live", venue="Masquerade", city="Atlanta", country="US",
+                          date=start.isoformat(), artists=["Deftones"], artist_mbids={"Deftones": "abc-123"})
+        legacy = Event(title="Samia Live", venue="The Earl", city="Atlanta", country="US",
+                       date=(start + timedelta(days=1)).isoformat(), artists=["Samia"])
+        
+        async def run():
+            bot = GutterBot()
+            guild = FakeGuild(1)
+            guild.install(bot, [2])
+            await bot.sync_scheduled_events({"alice": [(show, "Deftones", 1.0)]}, {"Deftones"})
+            bot.scraper.identity.register("Deftones", "abc-123")
+            
+            # An entry an older version recorded under the identity-based key is rekeyed, not recreated
+            bot.scraper.identity.register("Samia", "def-456")
+            legacy_event = guild.add_scheduled_event("🎵 Samia Live", start + timedelta(days=1), location="The Earl")
+            bot.ledger.record(bot.scraper.deduplicator.canonical_key(legacy), legacy_event.id, legacy_event.name,
+                              legacy_event.start_time, "The Earl", artist="Samia")
+            
+            await bot.sync_scheduled_events({"alice": [(with_mbid, "Deftones", 1.0), (legacy, "Samia", 1.0)]},
+                                            {"Deftones", "Samia"})
+            await bot.close()
+            return bot, guild
+        
+        bot, guild = asyncio.run(run())
+        deduplicator = bot.scraper.deduplicator
+        self.assertTrue(deduplicator.canonical_key(with_mbid).endswith('|mbid:abc-123'))  # was name:deftones
+        self.assertEqual(guild.api.calls['create_scheduled_event'], 1)
+        self.assertEqual(guild.api.calls['edit_scheduled_event'], 0)  # no cancel, no edit
+        self.assertEqual(sorted(bot.ledger.entries), sorted(deduplicator.ledger_key(event) for event in (show, legacy)))
+    
+    def test_events_created_elsewhere_block_duplicates_between_reconciles(self):
+        start = datetime(2030, 5, 1, 20, tzinfo=timezone.utc)
+        show = Event(title="Deftones Live", venue="Masquerade", city="Atlanta", country="US",
+                     date=start.isoformat(), artists=["Deftones"])
+        
+        async def run():
+            guild = FakeGuild(1)
+            guild.add_scheduled_event("🎵 Deftones Live", start, location="Masquerade")  # posted by hand
+            first = GutterBot()
+            guild.install(first, [2])
+            await first.load_existing_events()  # reconciles and remembers the hand-made event
+            await first.close()
+            
+            # The next run trusts the freshly reconciled ledger and doesn't fetch the guild's events
+            second = GutterBot()
+            guild.install(second, [2])
+            await second.load_existing_events()
+            created = await second.create_discord_event(show, "Deftones", 1.0)
+            await second.close()
+            return guild, created
+        
+        guild, created = asyncio.run(run())
+        self.assertIsNone(created)
+        self.assertEqual(guild.api.calls['fetch_scheduled_events'], 1)
+        self.assertEqual(guild.api.calls['create_scheduled_event'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
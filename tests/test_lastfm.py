@@ -1,7 +1,30 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+import threading
+import time
 import unittest
+from datetime import datetime, timedelta
+import requests
 from src.lastfm.client import LastFMClient
 from src.lastfm.scraper import EventScraper
-from src.lastfm.models import Artist, Event
+from src.lastfm.models import Artist, Event, UserListeningData, Region
+from src.lastfm.parallel_matcher import ParallelMatcher
+from src.lastfm.bandsintown_client import BandsintownClient
+from src.lastfm.identity import ArtistIdentityResolver
+from src.lastfm.dedup import EventDeduplicator
+from src.lastfm.event_cache import ArtistEventCache
+from src.lastfm.checkpoint import ScrapeCheckpoint
+from src.lastfm.query_scheduler import QueryScheduler
+from src.lastfm.budget import QueryBudgetPlanner, QueryUsage
+from src.lastfm.similar_artists import SimilarArtistGraph
+from src.lastfm.ticketmaster_client import TicketmasterClient
+from src.utils.http_fixtures import RecordingSession, ReplaySession
+from src.lastfm.similarity import DifflibBackend, RapidFuzzBackend, get_backend
+from src.utils.config import Config
+from src.utils.log import configure, get_logger, shutdown
 
 
 class TestLastFMIntegration(unittest.TestCase):
@@ -10,6 +33,14 @@ class TestLastFMIntegration(unittest.TestCase):
     def setUp(self):
         # You'll need to set LASTFM_API_KEY in your environment for these tests
         self.api_key = "test_key"  # Replace with actual key for real testing
+        
+        # Keep caches and alias tables out of the working tree
+        self.state_dir = tempfile.TemporaryDirectory()
+        os.environ['GUTTERBOT_STATE_DIR'] = self.state_dir.name
+    
+    def tearDown(self):
+        os.environ.pop('GUTTERBOT_STATE_DIR', None)
+        self.state_dir.cleanup()
     
     def test_artist_model(self):
         """Test Artist model creation"""
@@ -44,7 +75,627 @@ class TestLastFMIntegration(unittest.TestCase):
         # Test different names
         similarity = scraper.calculate_similarity("Radiohead", "Coldplay")
         self.assertLess(similarity, 0.5)
-
+    
+    
+    def test_parallel_matching_matches_serial(self):
+        """Test process-pool matching returns the same output as the serial path"""
+        scraper = EventScraper(self.api_key, self.api_key)
+        user_data = {
+            "user1": UserListeningData("user1", [Artist(name="Radiohead"), Artist(name="Deftones")], 2, "1month"),
+            "user2": UserListeningData("user2", [Artist(name="Beach Fossils")], 1, "1month"),
+        }
+        events = [
+            Event(title=f"Show {i}", venue="529", city="Atlanta", country="US",
+                  date=f"2030-01-{i % 28 + 1:02d}", artists=[name])
+            for i, name in enumerate(["Radiohead", "Deftones Band", "Beach Fossils", "Coldplay"] * 5)
+        ]
+        
+        serial = scraper.find_matching_events(user_data, events)
+        parallel = ParallelMatcher(scraper, max_workers=2).find_matching_events(user_data, events, min_events=0)
+        self.assertEqual(serial, parallel)
+        self.assertTrue(serial["user1"])
+    
+    
+    def test_region_filtering(self):
+        """Test that nationwide events are filtered locally per region"""
+        atlanta = Region(city="Atlanta", state="GA")
+        nashville = Region(city="Nashville", state="TN")
+        event = Event(title="Test Concert", venue="529", city="Atlanta", country="US",
+                      date="2030-01-01", state="GA")
+        self.assertTrue(atlanta.contains(event))
+        self.assertFalse(nashville.contains(event))
+        self.assertFalse(Region(city="Atlanta", state="TX").contains(event))
+    
+    
+    def test_bandsintown_tour_filtered_locally(self):
+        """Test one tour fetch serves different locations and radii"""
+        client = BandsintownClient(self.api_key)
+        requests_made = []
+        
+        def fake_request(endpoint, params, validators=None):
+            requests_made.append(endpoint)
+            venues = [("Masquerade", "Atlanta", "GA", 33.75, -84.39),
+                      ("Eddie's Attic", "Decatur", "GA", 33.77, -84.29),
+                      ("Ryman", "Nashville", "TN", 36.16, -86.78)]
+            return [{'datetime': '2030-05-01T20:00:00', 'title': name,
+                     'venue': {'name': name, 'city': city, 'region': region,
+                               'latitude': str(lat), 'longitude': str(lon)}}
+                    for name, city, region, lat, lon in venues], {}
+        
+        client._send_conditional_request = fake_request
+        atlanta = Region(city="Atlanta", state="GA", latitude=33.749, longitude=-84.388)
+        self.assertEqual(len(client.get_artist_events("Deftones", atlanta.location)), 2)
+        self.assertEqual(len(client.get_artist_events("Deftones", atlanta.location, radius=1)), 1)
+        # Without a configured centre only the city matches, however many venues are indexed there
+        self.assertEqual(len(client.get_artist_events("Deftones", "Atlanta, GA")), 1)
+        self.assertEqual(len(client.get_artist_events("Deftones", "Nashville, TN", radius=10)), 1)
+        self.assertEqual(len(client.search_events_by_location("33.75,-84.39", radius=25)), 2)
+        self.assertEqual(len(requests_made), 1)
+    
+    
+    def test_identity_resolution(self):
+        """Test MBID and alias resolution to canonical artist IDs"""
+        resolver = ArtistIdentityResolver()
+        canonical = resolver.register("Radiohead", "a74b1b7f")
+        self.assertEqual(resolver.resolve("radiohead"), canonical)
+        self.assertEqual(resolver.resolve("Radiohead (UK)", "a74b1b7f"), canonical)
+        # Same name with a different MBID is a namesake
+        self.assertIsNone(resolver.resolve("Radiohead", "ffffffff"))
+        
+        resolver.learn_alias("Radiohead UK", canonical)
+        resolver.save()
+        self.assertEqual(ArtistIdentityResolver().resolve("radiohead uk"), canonical)
+    
+    def test_mbid_match_skips_fuzzy_scoring(self):
+        """Test that an event artist with a known MBID matches exactly"""
+        scraper = EventScraper(self.api_key, self.api_key)
+        user_data = {"user1": UserListeningData("user1", [Artist(name="Sigur Rós", mbid="f6f2326f")], 1, "1month")}
+        event = Event(title="Sigur Ros Live", venue="Fox Theatre", city="Atlanta", country="US",
+                      date="2030-01-01", artists=["Sigur Ros"], artist_mbids={"Sigur Ros": "f6f2326f"})
+        
+        matches = scraper.find_matching_events(user_data, [event])
+        self.assertEqual(matches["user1"], [(event, "Sigur Rós", 1.0)])
+    
+    
+    def test_cross_source_dedup(self):
+        """Test the same show from two sources collapses despite title and timestamp differences"""
+        ticketmaster = Event(title="Deftones: Summer Tour", venue="The Masquerade - Hell", city="Atlanta",
+                             country="US", date="2030-05-02T00:00:00Z", artists=["Deftones"])
+        bandsintown = Event(title="Deftones @ Masquerade", venue="Masquerade (Hell)", city="Atlanta",
+                            country="US", date="2030-05-01T20:00:00", artists=["Deftones"])
+        other_night = Event(title="Deftones: Summer Tour", venue="The Masquerade - Hell", city="Atlanta",
+                            country="US", date="2030-05-03T00:00:00Z", artists=["Deftones"])
+        
+        deduplicator = EventDeduplicator()
+        self.assertEqual(deduplicator.dedupe([ticketmaster, bandsintown, other_night]), [ticketmaster, other_night])
+        self.assertEqual(deduplicator.canonical_key(ticketmaster), deduplicator.canonical_key(bandsintown))
+    
+    
+    def test_query_scheduler_priority(self):
+        """Test artists are ordered by playcount, user overlap and cache staleness"""
+        user_data = {
+            "user1": UserListeningData("user1", [Artist(name="Deftones", playcount=100), Artist(name="Bladee", playcount=90),
+                                                 Artist(name="Samia", playcount=10)], 3, "1month"),
+            "user2": UserListeningData("user2", [Artist(name="Samia", playcount=50)], 1, "1month"),
+        }
+        cache = ArtistEventCache()
+        cache.put('ticketmaster', "Deftones", [])
+        
+        order = QueryScheduler(cache, ['ticketmaster']).prioritize(user_data)
+        # Samia is shared by both users; Deftones was just fetched
+        self.assertEqual(order, ["Samia", "Bladee", "Deftones"])
+        
+        # Spellings differing only in case are one artist: one lookup, scored as shared
+        user_data = {
+            "user1": UserListeningData("user1", [Artist(name="The xx", playcount=10), Artist(name="Zed", playcount=10)], 2, "1month"),
+            "user2": UserListeningData("user2", [Artist(name="the xx", playcount=10)], 1, "1month"),
+        }
+        artists = EventScraper(self.api_key, self.api_key)._collect_artists(user_data)
+        self.assertEqual(artists, ["The xx", "Zed"])
+        self.assertEqual(QueryScheduler().prioritize(user_data, ["Zed", "the xx"]), ["the xx", "Zed"])
+    
+    
+    def test_budget_planner_respects_quota_and_cache(self):
+        """Test the plan stays under quota, caps searched artists and keeps cached lookups free"""
+        cache = ArtistEventCache()
+        cache.put('ticketmaster', "Deftones", [])
+        cache.put('bandsintown', "Deftones", [])
+        usage = QueryUsage()
+        usage.record('bandsintown', 9)
+        planner = QueryBudgetPlanner(cache, usage, daily_limits={'ticketmaster': 100, 'bandsintown': 10}, max_artists=2)
+        
+        plan = planner.plan(["Deftones", "Radiohead", "Bladee", "Samia"],
+                            {'ticketmaster': 'ticketmaster', 'bandsintown': 'bandsintown'})
+        
+        self.assertEqual(plan.artists(), ["Deftones", "Radiohead", "Bladee"])
+        self.assertEqual(plan.skipped, ["Samia"])
+        self.assertEqual(plan.requests_for('ticketmaster'), 2)
+        self.assertEqual(plan.requests_for('bandsintown'), 1)
+        self.assertTrue(plan.allows("Deftones", 'ticketmaster'))
+        self.assertFalse(plan.allows("Bladee", 'bandsintown'))
+    
+    
+    def test_identical_requests_are_coalesced(self):
+        """Test concurrent identical requests share one in-flight call"""
+        client = TicketmasterClient(self.api_key)
+        sent = []
+        
+        def fake_send(endpoint, params):
+            sent.append(endpoint)
+            time.sleep(0.2)
+            return {'_embedded': {'events': []}}
+        
+        client._send_request = fake_send
+        keywords = ["Deftones", "deftones ", "DEFTONES", "Radiohead"]
+        threads = [threading.Thread(target=client.search_events, args=(keyword, "Atlanta", "GA"))
+                   for keyword in keywords]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len(sent), 2)
+        self.assertEqual(client.single_flight.saved, 2)
+        
+        # Nothing is cached once the call completes
+        client.search_events("Deftones", "Atlanta", "GA")
+        self.assertEqual(len(sent), 3)
+    
+    
+    def test_not_modified_refreshes_cache_without_parsing(self):
+        """Test a 304 revalidation reuses the cached tour and its validators"""
+        scraper = EventScraper(self.api_key, self.api_key, self.api_key)
+        client = scraper.bandsintown_client
+        sent_validators = []
+        
+        def fake_request(endpoint, params, validators=None):
+            sent_validators.append(validators)
+            if validators:
+                return None, validators
+            return [{'datetime': '2030-05-01T20:00:00', 'title': "Deftones",
+                     'venue': {'name': "Masquerade", 'city': "Atlanta", 'region': "GA"}}], {'etag': '"v1"'}
+        
+        client._send_conditional_request = fake_request
+        first = scraper.get_bandsintown_events_batch(["Deftones"])
+        scraper.artist_cache.entries['bandsintown:deftones']['fetched_at'] -= scraper.artist_cache.ttl_seconds + 1
+        client._tours.clear()
+        second = scraper.get_bandsintown_events_batch(["Deftones"])
+        
+        self.assertEqual(sent_validators, [{}, {'etag': '"v1"'}])
+        self.assertEqual([e.title for e in second], [e.title for e in first])
+        self.assertEqual(scraper.artist_cache.revalidated, 1)
+        self.assertTrue(scraper.artist_cache.is_fresh('bandsintown', "Deftones"))
+    
+    
+    def test_ticketmaster_enrichment_is_deferred(self):
+        """Test parsing skips images/descriptions until enrich_event is called"""
+        client = TicketmasterClient(self.api_key)
+        events = client._convert_events_data([{
+            'name': "Deftones", 'url': 'https://tm.example/1', 'info': "All ages",
+            'dates': {'start': {'dateTime': '2030-05-02T00:00:00Z', 'localDate': '2030-05-01'}},
+            'images': [{'url': 'small.jpg', 'width': 100}, {'url': 'large.jpg', 'width': 2048}],
+            '_embedded': {'venues': [{'name': "Masquerade", 'city': {'name': "Atlanta"}, 'state': {'stateCode': "GA"}}],
+                          'attractions': [{'name': "Deftones"}]}
+        }], city="Atlanta")
+        
+        event = events[0]
+        self.assertEqual((event.venue, event.city, event.state, event.artists),
+                         ("Masquerade", "Atlanta", "GA", ["Deftones"]))
+        self.assertIsNone(event.image_url)
+        self.assertIsNone(event.description)
+        
+        client.enrich_event(event)
+        self.assertEqual(event.image_url, 'large.jpg')
+        self.assertEqual(event.description, "All ages")
+        self.assertIsNone(event.raw)
+    
+    def test_persisted_events_keep_only_display_fields_of_raw(self):
+        """Test the artist cache and checkpoint store the chosen image URL and info, not the raw payload"""
+        images = [{'url': f'{width}.jpg', 'width': width, 'ratio': '16_9', 'fallback': False} for width in (100, 2048, 640)]
+        event = Event(title="Deftones", venue="Masquerade", city="Atlanta", country="US", date="2030-05-01T20:00:00",
+                      artists=["Deftones"], source='ticketmaster', raw={'images': images, 'info': "All ages"})
+        self.assertEqual(event.to_state()['raw'], {'image_url': '2048.jpg', 'info': "All ages"})
+        
+        cache = ArtistEventCache()
+        cache.put('ticketmaster', "Deftones", [event])
+        cache.save()
+        checkpoint = ScrapeCheckpoint()
+        checkpoint.resume('local|alice|1month')
+        checkpoint.complete_batch('ticketmaster', 0, [event])
+        
+        cached = ArtistEventCache().get('ticketmaster', "Deftones")[0]
+        resumed = ScrapeCheckpoint()
+        resumed.resume('local|alice|1month')
+        for restored in (cached, resumed.events('ticketmaster')[0]):
+            self.assertEqual(restored.raw, {'image_url': '2048.jpg', 'info': "All ages"})
+            TicketmasterClient(self.api_key).enrich_event(restored)
+            self.assertEqual((restored.image_url, restored.description, restored.raw), ('2048.jpg', "All ages", None))
+    
+    
+    def test_http_fixture_record_and_replay(self):
+        """Test recorded traffic replays to the same parsed result, without credentials"""
+        class CannedAdapter(requests.adapters.BaseAdapter):
+            def send(self, request, **kwargs):
+                response = requests.Response()
+                response.status_code = 200
+                response.headers['ETag'] = '"v1"'
+                response._content = b'{"_embedded": {"events": [{"name": "Deftones", "url": "https://tm.example/1"}]}}'
+                response.url = request.url
+                response.request = request
+                return response
+        
+        recorder = RecordingSession()
+        recorder.mount('https://', CannedAdapter())
+        client = TicketmasterClient("secret-key")
+        client.session = recorder
+        recorded = client.search_events("Deftones", "Atlanta", "GA")
+        
+        path = os.path.join(self.state_dir.name, 'fixture.json.gz')
+        recorder.save(path)
+        with open(path, 'rb') as f:
+            self.assertNotIn(b"secret-key", f.read())
+        
+        replay = ReplaySession(path, speed=0)
+        client = TicketmasterClient("other-key")
+        client.session = replay
+        self.assertEqual(client.search_events("Deftones", "Atlanta", "GA"), recorded)
+        self.assertEqual(client.search_events_conditional("Deftones", "Atlanta", "GA")[1], {'etag': '"v1"'})
+        with self.assertRaises(Exception):
+            client.search_events("Radiohead", "Atlanta", "GA")
+        self.assertEqual((replay.served, replay.missed), (2, 1))
+    
+    
+    def test_pruned_scoring_matches_full_scoring(self):
+        """Test the tiered scorer picks exactly what scoring every pair would"""
+        scraper = EventScraper(self.api_key, self.api_key)
+        user_names = ["Radiohead", "Radio Head", "Deftones", "The National", "Bon Iver", "Boniver", "MF DOOM"]
+        scorers = scraper.similarity.prepare([name.lower() for name in user_names])
+        
+        for event_artist in ["Radiohead", "radiohed", "Deftones Band", "National", "Bon Iver", "DOOM", "Mitski"]:
+            expected = (0.0, "")
+            for user_artist in user_names:
+                similarity = scraper.calculate_similarity(event_artist, user_artist)
+                if similarity > expected[0] and scraper.is_valid_match(event_artist, user_artist, similarity):
+                    expected = (similarity, user_artist)
+            self.assertEqual(scraper._best_fuzzy_match(event_artist, user_names, scorers), expected)
+        
+        stats = scraper.match_stats
+        self.assertGreater(stats['length_pruned'] + stats['quick_pruned'], 0)
+        self.assertGreater(stats['perfect_stop'], 0)
+    
+    
+    def test_similarity_backends_agree_with_pairwise_scoring(self):
+        """Test each available backend's batch best_match equals scoring pairs with its own ratio"""
+        self.assertIsInstance(get_backend('difflib'), DifflibBackend)
+        backends = [get_backend('difflib')]
+        try:
+            backends.append(RapidFuzzBackend())  # optional dependency
+        except ImportError:
+            pass
+        
+        choices = ["radiohead", "radio head", "deftones", "the national", "bon iver", "boniver"]
+        for backend in backends:
+            prepared = backend.prepare(choices)
+            for query in ["radiohead", "radiohed", "deftone", "national", "mitski"]:
+                expected = (0.0, -1)
+                for idx, choice in enumerate(choices):
+                    score = backend.ratio(query, choice)
+                    if score >= 0.85 and score > expected[0]:
+                        expected = (score, idx)
+                self.assertEqual(backend.best_match(query, prepared, 0.85, lambda idx, score: True), expected,
+                                 f"{backend.name}: {query}")
+    
+    
+    def test_concurrent_multi_period_user_fetch(self):
+        """Test users load concurrently, failures stay per user and periods merge by weight"""
+        scraper = EventScraper(self.api_key, self.api_key)
+        top_artists = {
+            ('alice', '1month'): [Artist("Deftones", playcount=10), Artist("Bladee", playcount=30)],
+            ('alice', '6month'): [Artist("Deftones", playcount=100), Artist("Samia", playcount=20)],
+            ('bob', '1month'): [Artist("Radiohead", playcount=5)],
+        }
+        
+        def fake_top_artists(username, period, limit=50):
+            time.sleep(0.1)
+            if (username, period) not in top_artists:
+                raise Exception("user not found")
+            artists = [Artist(a.name, playcount=a.playcount) for a in top_artists[(username, period)]]
+            return UserListeningData(username, artists, len(artists), period)
+        
+        scraper.lastfm_client.get_user_top_artists = fake_top_artists
+        start = time.perf_counter()
+        user_data = scraper.get_user_artists(["alice", "bob", "carol"], periods={'1month': 1.0, '6month': 0.5},
+                                             max_workers=6)
+        self.assertLess(time.perf_counter() - start, 0.4)
+        
+        self.assertEqual(list(user_data), ["alice", "bob"])
+        self.assertEqual([(a.name, a.playcount) for a in user_data['alice'].artists],
+                         [("Deftones", 60), ("Bladee", 30), ("Samia", 10)])
+        self.assertEqual(user_data['alice'].period, '1month+6month')
+        self.assertEqual([a.name for a in user_data['bob'].artists], ["Radiohead"])
+        
+        # GUTTERBOT_PERIODS applies only when the caller doesn't pick a period
+        os.environ['GUTTERBOT_PERIODS'] = '1month:1,6month:0.5'
+        try:
+            self.assertEqual(scraper.get_user_artists(["alice"])['alice'].period, '1month+6month')
+            self.assertEqual(scraper.get_user_artists(["alice"], '6month')['alice'].period, '6month')
+        finally:
+            os.environ.pop('GUTTERBOT_PERIODS', None)
+    
+    
+    def test_interrupted_scrape_resumes_from_checkpoint(self):
+        """Test a restarted run skips batches the interrupted run completed"""
+        names = ["Deftones", "Radiohead", "Bladee", "Samia", "Beach Fossils", "Alvvays", "Slowdive", "Mitski",
+                 "Wednesday", "Duster", "Hum", "Failure", "Nothing", "Title Fight", "Turnover"]
+        artists = [Artist(name, playcount=100 - i) for i, name in enumerate(names)]
+        user_data = {'alice': UserListeningData('alice', artists, len(artists), '1month')}
+        fetched = []
+        show_date = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%dT20:00:00')
+        
+        def make_scraper(fail_on_batch=None):
+            scraper = EventScraper(self.api_key, self.api_key)
+            scraper.batch_delay = 0
+            scraper.get_user_artists = lambda usernames, period='1month': user_data
+            
+            def fake_batch(batch_artists, plan=None):
+                if fail_on_batch is not None and len(fetched) == fail_on_batch:
+                    raise RuntimeError("runner timed out")
+                fetched.append(list(batch_artists))
+                return [Event(title=name, venue="The Earl", city="Atlanta", country="US",
+                              date=show_date, artists=[name]) for name in batch_artists[:1]]
+            
+            scraper.get_events_for_artists_batch = fake_batch
+            return scraper
+        
+        with self.assertRaises(RuntimeError):
+            asyncio.run(make_scraper(fail_on_batch=1).scrape_and_match(['alice']))
+        self.assertEqual(len(fetched), 1)
+        
+        scraper = make_scraper()
+        matches = asyncio.run(scraper.scrape_and_match(['alice']))
+        
+        self.assertEqual(len(fetched), 2)
+        self.assertEqual(len(fetched[0]) + len(fetched[1]), 15)
+        self.assertEqual(sorted(event.title for event, _, _ in matches['alice']), ["Deftones", "Hum"])
+        self.assertFalse(os.path.exists(scraper.checkpoint.path))
+        
+        # A plan built for other period weights or exclusions is never resumed
+        signature = ScrapeCheckpoint.signature('local', ['alice'], {'1month': 1.0})
+        self.assertEqual(signature, ScrapeCheckpoint.signature('local', ['alice'], {'1month': 1}, []))
+        self.assertNotEqual(signature, ScrapeCheckpoint.signature('local', ['alice'], {'1month': 1.0, '6month': 0.5}))
+        self.assertNotEqual(signature, ScrapeCheckpoint.signature('local', ['alice'], {'1month': 1.0}, ["Deftones"]))
+    
+    
+    def test_batch_pipeline_overlaps_fetching_and_publishing(self):
+        """Test batches are fetched while earlier ones publish, within the queue bound"""
+        names = ["Deftones", "Radiohead", "Bladee", "Samia", "Beach Fossils", "Alvvays", "Slowdive", "Mitski",
+                 "Wednesday", "Duster", "Hum", "Failure", "Nothing", "Title Fight", "Turnover", "Cursive",
+                 "Pinegrove", "Ovlov", "Hop Along", "Narrow Head", "Fiddlehead", "Basement", "Citizen", "Drug Church"]
+        artists = [Artist(name, playcount=100 - i) for i, name in enumerate(names)]
+        user_data = {'alice': UserListeningData('alice', artists, len(artists), '1month')}
+        show_date = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%dT20:00:00')
+        
+        scraper = EventScraper(self.api_key, self.api_key)
+        scraper.batch_delay = 0
+        scraper.get_user_artists = lambda usernames, period='1month': user_data
+        
+        def slow_fetch(batch_artists, plan=None):
+            time.sleep(0.1)
+            return [Event(title=name, venue="The Earl", city="Atlanta", country="US",
+                          date=show_date, artists=[name]) for name in batch_artists[:1]]
+        
+        published = []
+        
+        async def slow_publish(matches, batch_num, total_batches):
+            await asyncio.sleep(0.1)
+            published.append((batch_num, total_batches, [event.title for event, _, _ in matches['alice']]))
+        
+        scraper.get_events_for_artists_batch = slow_fetch
+        start = time.perf_counter()
+        matches = asyncio.run(scraper.scrape_and_match(['alice'], publish_callback=slow_publish))
+        elapsed = time.perf_counter() - start
+        
+        self.assertEqual(sorted(published), [(1, 3, ["Deftones"]), (2, 3, ["Hum"]), (3, 3, ["Fiddlehead"])])
+        self.assertEqual(len(matches['alice']), 3)
+        self.assertLess(elapsed, 0.55)  # 0.6s if fetching and publishing took turns
+        self.assertEqual([(stats.name, stats.processed) for stats in scraper.pipeline_stats],
+                         [('fetch', 3), ('match', 3), ('publish', 3)])
+        self.assertTrue(all(stats.max_depth <= 2 for stats in scraper.pipeline_stats))
+    
+    
+    def test_batch_pipeline_publishes_what_final_matching_keeps(self):
+        """Test each published batch goes through identity matching, the future window and dedup"""
+        artists = [Artist("Deftones", playcount=10)]
+        user_data = {'alice': UserListeningData('alice', artists, len(artists), '1month')}
+        show_date = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%dT20:00:00')
+        shows = [Event(title="An Evening with Deftones", venue="Masquerade", city="Atlanta", country="US",
+                       date=show_date, artists=["Deftones"], source='ticketmaster'),
+                 Event(title="Deftones", venue="Masquerade", city="Atlanta", country="US",
+                       date=show_date, artists=["Deftones"], source='bandsintown'),
+                 Event(title="Deftones", venue="Masquerade", city="Atlanta", country="US",
+                       date="2020-05-01T20:00:00", artists=["Deftones"])]
+        
+        scraper = EventScraper(self.api_key, self.api_key)
+        scraper.batch_delay = 0
+        scraper.get_user_artists = lambda usernames, period='1month': user_data
+        scraper.get_events_for_artists_batch = lambda batch_artists, plan=None: shows
+        published = []
+        
+        async def publish(matches, batch_num, total_batches):
+            published.extend(event.title for event, _, _ in matches['alice'])
+        
+        matches = asyncio.run(scraper.scrape_and_match(['alice'], publish_callback=publish))
+        self.assertEqual(published, ["An Evening with Deftones"])
+        self.assertEqual([event.title for event, _, _ in matches['alice']], published)
+    
+    
+    def test_dry_run_plan_estimates_requests_and_wall_time(self):
+        """Test the planner forecasts requests, coverage and batch delays without calling providers"""
+        names = ["Deftones", "Radiohead", "Bladee", "Samia", "Beach Fossils", "Alvvays", "Slowdive", "Mitski",
+                 "Wednesday", "Duster", "Hum", "Failure"]
+        artists = [Artist(name, playcount=100 - i) for i, name in enumerate(names)]
+        user_data = {'alice': UserListeningData('alice', artists, len(artists), '1month')}
+        
+        scraper = EventScraper(self.api_key, self.api_key, self.api_key)
+        scraper.get_user_artists = lambda usernames, period='1month': user_data
+        
+        def no_network(*args, **kwargs):
+            raise AssertionError("dry run made a provider request")
+        
+        scraper.ticketmaster_client._send_conditional_request = no_network
+        scraper.bandsintown_client._send_conditional_request = no_network
+        scraper.artist_cache.put(scraper.local_cache_provider('ticketmaster'), "Deftones", [])
+        scraper.artist_cache.put('bandsintown', "Radiohead", [], {'etag': '"v1"'})
+        scraper.artist_cache.entries['bandsintown:radiohead']['fetched_at'] -= scraper.artist_cache.ttl_seconds + 1
+        
+        estimate = scraper.plan_run(['alice'], regions=[])
+        
+        self.assertEqual((estimate.batches, estimate.pending_batches), (4, 4))
+        self.assertEqual(estimate.requests, {'ticketmaster': 11, 'bandsintown': 12})
+        self.assertEqual(estimate.cached, {'ticketmaster': 1})
+        self.assertEqual(estimate.revalidatable, {'bandsintown': 1})
+        self.assertAlmostEqual(estimate.coverage('ticketmaster'), 1 / 12)
+        # Two batches per provider, one 120s pause after each provider's first batch
+        self.assertAlmostEqual(estimate.wall_seconds, 23 * Config.ESTIMATED_REQUEST_SECONDS + 2 * 120)
+        self.assertIn("quota left", estimate.report())
+        self.assertFalse(os.path.exists(scraper.checkpoint.path))
+    
+    
+    def test_structured_logging_gates_samples_and_writes_json(self):
+        """Test level gating skips formatting, sampling thins console lines and the JSON log keeps everything"""
+        class Unformattable:
+            def __format__(self, spec):
+                raise AssertionError("debug record was formatted")
+        
+        stream = io.StringIO()
+        with tempfile.TemporaryDirectory() as state_dir:
+            json_path = os.path.join(state_dir, 'run.jsonl')
+            configure(level='info', json_path=json_path, sample_every=3, stream=stream)
+            try:
+                log = get_logger('test')
+                log.debug('http.request', "{value}", value=Unformattable())
+                for i in range(7):
+                    log.info('lookup.events', "  ✓ {artist}: {events} events", sampled=True, artist=f"Artist {i}", events=i)
+                log.warning('lookup.failed', "  ✗ {artist}: error - {error}", artist="Deftones", error="timeout")
+                shutdown()
+                
+                with open(json_path) as f:
+                    records = [json.loads(line) for line in f]
+            finally:
+                configure()
+        
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(lines[:4], ["  ✓ Artist 0: 0 events", "  ✓ Artist 3: 3 events", "  ✓ Artist 6: 6 events",
+                                     "  ✗ Deftones: error - timeout"])
+        self.assertIn("4 sampled log lines not shown", lines[4])
+        self.assertEqual([record['event'] for record in records], ['lookup.events'] * 7 + ['lookup.failed'])
+        self.assertEqual((records[5]['artist'], records[5]['events'], records[-1]['level']), ("Artist 5", 5, 'warning'))
+    
+    def test_logging_from_threads_during_shutdown(self):
+        """Test sampling counts stay exact across threads and records logged after shutdown are dropped"""
+        log = get_logger('test')
+        errors = []
+        
+        def worker(worker_num, records=300):
+            try:
+                for i in range(records):
+                    log.info('lookup.events', "  ✓ {artist}", sampled=True, artist=f"Artist {worker_num}.{i}")
+            except Exception as e:
+                errors.append(e)
+        
+        def run_workers(workers, records=300):
+            threads = [threading.Thread(target=worker, args=(n, records)) for n in range(workers)]
+            for thread in threads:
+                thread.start()
+            return threads
+        
+        stream = io.StringIO()
+        with tempfile.TemporaryDirectory() as state_dir:
+            json_path = os.path.join(state_dir, 'run.jsonl')
+            try:
+                configure(level='info', json_path=json_path, sample_every=3, stream=stream)
+                for thread in run_workers(8):
+                    thread.join()
+                shutdown()
+                
+                # Workers still logging while the sinks are closed
+                configure(level='info', json_path=json_path, sample_every=3, stream=io.StringIO())
+                threads = run_workers(4, 3000)
+                shutdown()
+                for thread in threads:
+                    thread.join()
+            finally:
+                configure()
+        
+        self.assertEqual(errors, [])
+        self.assertIn("1600 sampled log lines not shown", stream.getvalue().splitlines()[-1])
+    
+    def test_similar_artist_expansion_is_cached_and_weighted(self):
+        """Test similar artists join the query set below the user's own, and the graph is only fetched once per TTL"""
+        graph_edges = {
+            "deftones": [(Artist("Hum"), 0.9), (Artist("Failure"), 0.5), (Artist("Radiohead"), 0.8), (Artist("Nu Metal Band"), 0.1)],
+            "radiohead": [(Artist("Hum"), 0.5)],
+            "hum": [(Artist("Duster"), 1.0)],
+        }
+        calls = []
+        
+        def get_similar_artists(artist_name, limit=10):
+            calls.append(artist_name)
+            return graph_edges.get(artist_name.lower(), [])
+        
+        def profile():
+            artists = [Artist("Deftones", playcount=100), Artist("Radiohead", playcount=50)]
+            return {'alice': UserListeningData('alice', artists, len(artists), '1month')}
+        
+        scraper = EventScraper(self.api_key, self.api_key)
+        scraper.lastfm_client.get_similar_artists = get_similar_artists
+        user_data = profile()
+        self.assertEqual(scraper.expand_similar_artists(user_data, depth=2, weight=0.5), 3)
+        
+        # Hum is reached from both seeds; Duster is two hops out; Radiohead is already the user's own
+        playcounts = {artist.name: artist.playcount for artist in user_data['alice'].artists}
+        self.assertEqual(playcounts, {"Deftones": 100, "Radiohead": 50, "Hum": 58, "Failure": 25, "Duster": 29})
+        self.assertEqual(sorted(calls), ["Deftones", "Failure", "Hum", "Radiohead"])
+        
+        # A new scraper reuses the persisted graph without calling Last.fm
+        scraper = EventScraper(self.api_key, self.api_key)
+        scraper.lastfm_client.get_similar_artists = get_similar_artists
+        self.assertEqual(scraper.expand_similar_artists(profile(), depth=2, weight=0.5), 3)
+        self.assertEqual(len(calls), 4)
+        
+        # Expired entries are refetched
+        graph = SimilarArtistGraph(ttl_hours=0)
+        graph.refresh(["Deftones"], get_similar_artists)
+        self.assertEqual((graph.fetched, len(calls)), (1, 5))
+        self.assertEqual(scraper.expand_similar_artists(profile(), depth=0), 0)
+    
+    def test_concurrent_region_matching_shares_identity_safely(self):
+        """Test regions matched in threads learn aliases into one resolver that is saved once"""
+        cities = ["Atlanta", "Nashville", "Austin", "Chicago", "Denver", "Portland"]
+        regions = [Region(city) for city in cities]
+        show_date = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%dT20:00:00')
+        names = ["Beach Fossil", "Deftone", "Radiohead", "Alvvay", "Slowdiv"]
+        events = [Event(title=f"{name} Live", venue=f"{city} Hall {i}", city=city, country="US", date=show_date, artists=[name])
+                  for city in cities for i, name in enumerate(names)]
+        artists = [Artist(name, playcount=10) for name in ["Beach Fossils", "Deftones", "Radiohead", "Alvvays", "Slowdive"]]
+        
+        scraper = EventScraper(self.api_key, self.api_key)
+        scraper.batch_delay = 0
+        scraper.get_user_artists = lambda usernames, period='1month': {
+            'alice': UserListeningData('alice', artists, len(artists), '1month')}
+        scraper.get_artist_events_nationwide = lambda artist, plan=None: (
+            [event for event in events if event.artists[0][:5] == artist[:5]], 0)
+        saves = []
+        save = scraper.identity.save
+        scraper.identity.save = lambda: saves.append(threading.get_ident()) or save()
+        
+        region_matches = asyncio.run(scraper.scrape_and_match_regions(['alice'], regions=regions))
+        
+        self.assertEqual({region: len(matches['alice']) for region, matches in region_matches.items()},
+                         {city: 5 for city in cities})
+        self.assertEqual(len(saves), 1)
+        self.assertEqual(scraper.identity.resolve("Beach Fossil"), scraper.identity.resolve("Beach Fossils"))
+        self.assertEqual(ArtistIdentityResolver().resolve("Beach Fossil"), "name:beach fossils")
 
 if __name__ == '__main__':
     unittest.main()